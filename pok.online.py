@@ -1,155 +1,589 @@
-import io
-import re
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import numpy as np
 import streamlit as st
 import pandas as pd
-import openpyxl
-from openpyxl.styles import PatternFill, Alignment, Font
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_RIGHT
-from reportlab.lib.units import mm
-from reportlab.lib import colors
-from reportlab.pdfgen import canvas as pdfcanvas
+
+from pok.data import wajib, sheet_names, total_akun, memory_footprint, UnitIndex
+from pok.rekap import CUBE_LEVELS, build_rekap_cube, generate_rekap_excel, generate_rekap_pdf
+from pok.excel import generate_excel
+from pok.table import table_html
+from pok.pdf import generate_pdf
+from pok.pdfpage import DEFAULT_SIGNATURE, PageContent
+from pok.batch import EXPORT_FORMATS, export_unit, file_stem, unit_export_args, zip_unit_exports
+from pok.consolidate import iter_sheet_loads, rekap_sheets
+from pok.diff import STATUS_COL, STATUS_ADDED, STATUS_REMOVED, STATUS_CHANGED, diff_sheets, diff_rekap, diff_export_frame
+from pok.search import SearchIndex
+from pok.numfmt import NumberStrings, format_ribuan
+from pok.stages import StageRecorder, configure_logging, memory_tracing
+from pok.store import DatasetStore
+from pok.diskcache import HAS_PYARROW, SheetDiskCache
+from pok.jobs import JOB_WAITING, JOB_RUNNING, JOB_DONE, ExportQueue, ExportQueueFull
+from pok.ingest import BudgetExceeded, IngestBudget, check_size, fit_budget, load_sheet_within, rekap_streamed
 
 st.set_page_config(page_title="Dashboard Anggaran", layout="wide")
 
 st.title("📊 Dashboard Data Anggaran TA 2025")
 
+# =========================== CACHE WORKBOOK ====================================
+# Setiap interaksi widget menjalankan ulang script dari atas. Hasil parse dan
+# pembersihan sheet disimpan di DatasetStore milik proses (dibagi semua sesi)
+# dengan kunci hash isi file + nama sheet, sehingga rerun maupun pengguna lain
+# yang membuka file yang sama tidak parse ulang. Store dibatasi total ukuran;
+# dataset yang sedang dipakai sebuah sesi tetap dibagi walau sudah keluar LRU.
+DATASET_STORE_MAX_MB = 512
+
+
+@st.cache_resource
+def dataset_store():
+    return DatasetStore(DATASET_STORE_MAX_MB * 2**20)
+
+
+# Sheet bersih juga disimpan di disk (Arrow IPC, dibaca dengan memory-map;
+# lihat pok.diskcache) agar restart server tidak parse ulang workbook yang
+# sudah dikenal. Folder dan batas ukuran lewat env POK_CACHE_DIR dan
+# POK_CACHE_MAX_MB (0 = nonaktif); tanpa pyarrow cache disk tidak dipakai.
+# Folder default per pengguna di temp; folder yang bukan milik pengguna
+# proses ditolak (cache disk nonaktif).
+DISK_CACHE_DIR = os.environ.get("POK_CACHE_DIR") or os.path.join(
+    tempfile.gettempdir(), f"pok-cache-{os.getuid()}" if hasattr(os, "getuid") else "pok-cache")
+DISK_CACHE_MAX_MB = float(os.environ.get("POK_CACHE_MAX_MB", "1024"))
+
+
+# Ekspor rincian Excel/PDF berjalan sebagai job latar belakang di process
+# pool (pok.jobs) yang dibagi semua sesi. Jumlah proses dan panjang antrian
+# lewat env POK_EXPORT_WORKERS / POK_EXPORT_QUEUE.
+EXPORT_WORKERS = int(os.environ.get("POK_EXPORT_WORKERS", "2"))
+EXPORT_QUEUE_MAX = int(os.environ.get("POK_EXPORT_QUEUE", "8"))
+EXPORT_JOB_POLL_SECONDS = 1
+EXPORT_JOBS_SHOWN = 6
+
+# Mode "Gabungkan semua sheet" memuat sheet paralel di process pool berisi
+# paling banyak POK_LOAD_WORKERS proses (default = POK_EXPORT_WORKERS).
+# Hanya satu sesi memuat dalam satu waktu, jadi batas ini berlaku untuk
+# seluruh server; sesi lain menunggu giliran.
+LOAD_WORKERS = int(os.environ.get("POK_LOAD_WORKERS", EXPORT_WORKERS))
+
+# Batas ingest per upload (pok.ingest), 0 = tanpa batas: ukuran file
+# (POK_MAX_UPLOAD_MB; di atasnya hanya rekap ringkas), baris per sheet
+# (POK_MAX_ROWS) dan memori frame per sheet (POK_MAX_SHEET_MB). Sheet yang
+# melewati batas baris/memori dimuat sebagian (baris pertama) dengan
+# peringatan. Batas upload Streamlit sendiri: server.maxUploadSize.
+INGEST_BUDGET = IngestBudget(
+    max_bytes=int(float(os.environ.get("POK_MAX_UPLOAD_MB", "100")) * 2**20),
+    max_rows=int(os.environ.get("POK_MAX_ROWS", "500000")),
+    max_memory=int(float(os.environ.get("POK_MAX_SHEET_MB", "256")) * 2**20),
+)
+
+
+@st.cache_resource
+def export_queue():
+    return ExportQueue(EXPORT_WORKERS, EXPORT_QUEUE_MAX)
+
+
+@st.cache_resource
+def sheet_load_lock():
+    return threading.Lock()
+
+
+@st.cache_resource
+def sheet_disk_cache():
+    if not HAS_PYARROW or DISK_CACHE_MAX_MB <= 0:
+        return None
+    try:
+        return SheetDiskCache(DISK_CACHE_DIR, int(DISK_CACHE_MAX_MB * 2**20))
+    except OSError:
+        # Folder cache tidak bisa dibuat: jalan tanpa cache disk
+        return None
+
+
+# ========================= INSTRUMENTASI TAHAP ================================
+# Waktu (dan memori puncak bila POK_TRACEMALLOC=1) tiap tahap dicatat per
+# sesi dan ditulis sebagai log JSON (logger pok.stages); panel debug di
+# sidebar menampilkan record terbaru.
+configure_logging()
+if "_pok_stages" not in st.session_state:
+    st.session_state["_pok_stages"] = StageRecorder()
+stages = st.session_state["_pok_stages"]
+
+
+def show_stage_panel(dataset):
+    # dataset: frame sheet aktif, atau {sheet: frame} pada mode gabungan
+    with st.sidebar.expander("🛠 Debug: waktu & memori per tahap"):
+        # tracemalloc memperlambat seluruh proses: hanya dinyalakan admin
+        # lewat env POK_TRACEMALLOC=1, tidak dari sesi
+        if memory_tracing():
+            st.caption("peak_kb = puncak memori seluruh proses selama tahap (tracemalloc); tahap sesi lain "
+                       "yang berjalan bersamaan ikut terukur dan dapat mereset puncak, jadi angkanya perkiraan.")
+        else:
+            st.caption("Memori puncak tidak diukur (aktifkan dengan env POK_TRACEMALLOC=1).")
+        exports = export_queue().stats()["nbytes"]
+        st.caption(f"Memori: {memory_footprint(dataset) / 2**20:.1f} MB data aktif (dibagi antar sesi), "
+                   f"{exports / 2**20:.1f} MB hasil ekspor di antrian (semua sesi)")
+        records = stages.last(50)
+        if records:
+            st.caption(f"Rerun #{stages.run}; waktu bangun ekspor dijalankan di worker dan tidak tercatat di sini.")
+            st.dataframe(pd.DataFrame(records), use_container_width=True, hide_index=True)
+        else:
+            st.caption("Belum ada tahap yang tercatat.")
+
+
 # =========================== UPLOAD FILE =======================================
 uploaded = st.sidebar.file_uploader("Upload File Excel", type=["xlsx"])
 if not uploaded:
     st.stop()
 
+file_bytes = uploaded.getvalue()
+file_hash = hashlib.sha256(file_bytes).hexdigest()
+stages.new_run(file=file_hash[:12])
+
+
+disk_cache = sheet_disk_cache()
+
+
+def load_cached_sheet(sheet, source=file_bytes, source_hash=file_hash):
+    # Sheet dari cache disk (atau None). Cache menyimpan sheet utuh, jadi
+    # batas ingest tetap diterapkan; laporannya disimpan seperti ingest biasa
+    # dengan waktu baca cache + pemotongan, tanpa baris/dtk
+    with stages.stage("disk_cache_load", sheet=sheet) as fields:
+        start = time.perf_counter()
+        cached = disk_cache.load(source_hash, sheet)
+        if cached is None:
+            return None
+        cached, report = fit_budget(cached, sheet, INGEST_BUDGET, len(source))
+        report.seconds = time.perf_counter() - start
+        report.cached = True
+        fields.update(rows=report.rows, truncated=report.truncated)
+    store.get_or_build((source_hash, sheet, "ingest"), lambda: report)
+    return cached
+
+
+def load_selected_sheet(sheet, source=file_bytes, source_hash=file_hash):
+    if disk_cache is not None:
+        cached = load_cached_sheet(sheet, source, source_hash)
+        if cached is not None:
+            return cached
+    with stages.stage("ingest", sheet=sheet) as fields:
+        cleaned, report = load_sheet_within(source, sheet, INGEST_BUDGET)
+        fields.update(rows=report.rows, rows_per_s=round(report.rows_per_s or 0), truncated=report.truncated)
+    # Laporan ingest (baris, baris/dtk, terpotong?) disimpan di samping dataset
+    store.get_or_build((source_hash, sheet, "ingest"), lambda: report)
+    if disk_cache is not None and report.truncated is None:
+        # Sheet terpotong tidak disimpan: batas bisa dinaikkan kemudian
+        with stages.stage("disk_cache_save", sheet=sheet, rows=len(cleaned)):
+            disk_cache.save(source_hash, sheet, cleaned)
+    return cleaned
+
+
+def show_summary_rekap(sheet):
+    # Mode ringkas: rekap per UNIT seluruh sheet dihitung sambil membaca per
+    # potongan; baris rincian tidak pernah disimpan
+    def build():
+        with stages.stage("rekap_streamed", sheet=sheet) as fields:
+            grp, report = rekap_streamed(file_bytes, sheet)
+            fields.update(rows=report.rows, rows_per_s=round(report.rows_per_s or 0))
+        return grp, report
+
+    grp, report = store.get_or_build((file_hash, sheet, "rekap_streamed"), build)
+    st.subheader("Rekap Per Unit (mode ringkas)")
+    st.dataframe(grp[["UNIT", "Total_JUMLAH_fmt"]].rename(columns={"Total_JUMLAH_fmt": "Total JUMLAH"}),
+                 use_container_width=True)
+    st.caption(f"Dibaca per potongan: {report.summary()}")
+    st.download_button("⬇ Download Rekap Excel", generate_rekap_excel(grp), file_name="Rekap_Per_Unit.xlsx",
+                       mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                       key="_pok_summary_rekap_xlsx")
+    return grp
+
+
+def read_sheet_names():
+    with stages.stage("sheet_names"):
+        return sheet_names(file_bytes)
+
+
 # Baca workbook untuk dapat memilih sheet
-xls = pd.ExcelFile(uploaded)
-sheets = xls.sheet_names
+store = dataset_store()
+sheets = store.get_or_build((file_hash, None), read_sheet_names)
 sheet_selected = st.sidebar.selectbox("Pilih Sheet", sheets)
 
-# Muat sheet yang dipilih
-df = pd.read_excel(xls, sheet_name=sheet_selected, dtype=str)
-
-# ======================== PERBAIKAN DATA DASAR ================================
-# Kolom wajib
-wajib = ["UNIT","MAK","KODE","URAIAN","VOL","SAT","HARGA","JUMLAH","RO","SD"]
-df = df.reindex(columns=wajib)
+# ========================= BATAS INGEST =======================================
+# File di atas batas ukuran tidak dimuat sebagai rincian; yang ditampilkan
+# hanya rekap per UNIT yang dihitung per potongan (memori ~ satu potongan).
+try:
+    check_size(file_bytes, INGEST_BUDGET)
+except BudgetExceeded as exc:
+    st.warning(f"{exc}. Rincian tidak dimuat; hanya rekap per unit yang ditampilkan.")
+    show_stage_panel(show_summary_rekap(sheet_selected))
+    st.stop()
 
-# Bersihkan None dan NaN
-df = df.replace(["None", "none", "NONE"], "")
-df = df.fillna("")
+# ========================= GABUNGAN SEMUA SHEET ================================
+# Sheet yang belum ada di store dimuat paralel (LOAD_WORKERS proses) lalu
+# disimpan per (hash file, sheet), jadi pindah sheet sesudahnya tidak parse ulang.
+def load_all_sheets():
+    missing = [sheet for sheet in sheets if store.get((file_hash, sheet)) is None]
+    if disk_cache is not None:
+        for sheet in list(missing):
+            cached = load_cached_sheet(sheet)
+            if cached is not None:
+                store.get_or_build((file_hash, sheet), lambda cached=cached: cached)
+                missing.remove(sheet)
+    if missing:
+        bar = st.progress(0.0, text=f"Menunggu giliran memuat {len(missing)} sheet...")
+        with sheet_load_lock():
+            # Sesi lain bisa saja sudah memuat file yang sama selama menunggu
+            missing = [sheet for sheet in missing if store.get((file_hash, sheet)) is None]
+            with stages.stage("load_sheets", sheets=len(missing)):
+                loads = iter_sheet_loads(file_bytes, missing, LOAD_WORKERS, INGEST_BUDGET)
+                for sheet, frame, report, done, total in loads:
+                    store.get_or_build((file_hash, sheet), lambda frame=frame: frame)
+                    store.get_or_build((file_hash, sheet, "ingest"), lambda report=report: report)
+                    if disk_cache is not None and report.truncated is None:
+                        disk_cache.save(file_hash, sheet, frame)
+                    bar.progress(done / total, text=f"{done}/{total} sheet selesai ({sheet}: {report.summary()})")
+        bar.empty()
+    return {sheet: store.get_or_build((file_hash, sheet), lambda sheet=sheet: load_selected_sheet(sheet))
+            for sheet in sheets}
+
+
+if len(sheets) > 1 and st.sidebar.checkbox("Gabungkan semua sheet"):
+    st.subheader("Rekap Per Unit Semua Sheet")
+    try:
+        frames = load_all_sheets()
+    except BudgetExceeded as exc:
+        # Batas memori lebih kecil dari satu baris sheet
+        st.warning(f"{exc}. Gabungan semua sheet tidak dapat dihitung.")
+        st.stop()
+    st.session_state["_pok_sheets"] = frames
+
+    def build_rekap_sheets():
+        with stages.stage("rekap_sheets", sheets=len(frames)):
+            return rekap_sheets(frames)
+
+    combined = store.get_or_build((file_hash, None, "rekap_sheets"), build_rekap_sheets)
+    combined_display = combined.copy()
+    for col in combined_display.columns[1:]:
+        combined_display[col] = format_ribuan(combined_display[col], blank_zero=False)
+    st.dataframe(combined_display, use_container_width=True, hide_index=True)
+    st.caption("Kolom Selisih = total sheet itu dikurangi sheet sebelumnya.")
+    truncated = [sheet for sheet in sheets
+                 if getattr(store.get((file_hash, sheet, "ingest")), "truncated", None)]
+    if truncated:
+        st.warning(f"Sheet {', '.join(truncated)} melewati batas ingest dan hanya dimuat sebagian; "
+                   "totalnya belum mencakup seluruh baris.")
+    show_stage_panel(frames)
+    st.stop()
 
-# Konversi angka
-for col in ["VOL","HARGA","JUMLAH"]:
-    df[col] = pd.to_numeric(df[col], errors="coerce")
+# Muat sheet yang dipilih (sudah dibersihkan). Rujukan di session_state
+# menjaga dataset tetap hidup (dan dibagi) selama sesi ini memakainya.
+try:
+    df = store.get_or_build((file_hash, sheet_selected), lambda: load_selected_sheet(sheet_selected))
+except BudgetExceeded as exc:
+    st.warning(f"{exc}. Rincian tidak dimuat; hanya rekap per unit yang ditampilkan.")
+    show_stage_panel(show_summary_rekap(sheet_selected))
+    st.stop()
+st.session_state["_pok_dataset"] = df
+ingest_report = store.get((file_hash, sheet_selected, "ingest"))
+st.session_state["_pok_ingest_report"] = ingest_report
+if ingest_report is not None:
+    # Throughput ingest (baris/dtk) untuk menakar kapasitas server
+    st.sidebar.caption(f"Ingest {sheet_selected}: {ingest_report.summary()}")
+    if ingest_report.truncated:
+        loaded_rows = f"{ingest_report.rows:,}".replace(",", ".")
+        st.warning(f"Sheet {sheet_selected} melewati {ingest_report.truncated}: hanya {loaded_rows} baris "
+                   "pertama yang dimuat. Rincian, rekap dan ekspor hanya mencakup baris tersebut.")
+        if st.checkbox("Tampilkan rekap per unit seluruh sheet (mode ringkas)", key="_pok_summary_rekap"):
+            show_summary_rekap(sheet_selected)
+
+
+def build_unit_index():
+    with stages.stage("unit_index", rows=len(df)):
+        return UnitIndex(df)
+
+
+# Posisi baris dan total akun per UNIT, dibangun sekali per dataset
+unit_index = store.get_or_build((file_hash, sheet_selected, "unit_index"), build_unit_index)
+st.session_state["_pok_unit_index"] = unit_index
+
+store_stats = store.stats()
+st.sidebar.caption(f"Dataset bersama: {store_stats['entries']} entri, {store_stats['nbytes'] / 2**20:.1f} MB "
+                   f"({store_stats['hits']} hit / {store_stats['misses']} miss)")
+if disk_cache is not None:
+    disk_stats = disk_cache.stats()
+    st.sidebar.caption(f"Cache disk: {disk_stats['files']} sheet, {disk_stats['nbytes'] / 2**20:.1f} MB "
+                       f"({disk_stats['hits']} hit / {disk_stats['misses']} miss)")
 
 # ========================= FILTER / NAV ======================================
 st.sidebar.header("Filter")
-units = df["UNIT"].replace("", pd.NA).dropna().unique().tolist()
+units = unit_index.units
 # Default view: show summary (rekap) per unit. User can then pick a unit to
 # view rincian. Provide choices: 'Rekap Per Unit', 'Semua', plus individual units.
 unit_selected = st.sidebar.selectbox("Pilih Unit", ["Rekap Per Unit", "Semua"] + units)
 
 # If the user chose Rekap, we will show the grouped summary and let them pick
 # a unit from the main area to see details. Otherwise, filter immediately.
-df_filtered = df.copy()
+# Frame tidak disalin: copy-on-write pandas membuat df_filtered/df_display
+# berbagi data dengan frame di cache sampai ada yang diubah.
+df_filtered = df
 detail_unit = None
 if unit_selected == "Rekap Per Unit":
     # keep df_filtered as full dataset for the rekap view
     pass
 elif unit_selected == "Semua":
-    df_filtered = df.copy()
+    pass
 else:
     # specific unit chosen in sidebar -> show details for that unit
-    df_filtered = df[df["UNIT"] == unit_selected]
+    with stages.stage("filter_unit", unit=unit_selected):
+        df_filtered = unit_index.rows(df, unit_selected)
     detail_unit = unit_selected
 
+# Pencarian URAIAN/KODE/MAK lewat indeks token (pok.search), dibangun sekali
+# per dataset saat pertama dipakai. Hasilnya menggantikan df_filtered sehingga
+# tabel, total dan ekspor mengikuti hasil pencarian.
+search_query = st.sidebar.text_input("Cari URAIAN / KODE / MAK", key="_pok_search").strip()
+search_hits = None
+if search_query:
+    def build_search_index():
+        with stages.stage("search_index", rows=len(df)):
+            return SearchIndex(df)
+
+    search_index = store.get_or_build((file_hash, sheet_selected, "search_index"), build_search_index)
+    st.session_state["_pok_search_index"] = search_index
+    with stages.stage("search", query=search_query):
+        search_hits = search_index.search(search_query)
+        if search_hits is not None:
+            if detail_unit is not None:
+                unit_rows = unit_index.positions.get(detail_unit, search_hits[:0])
+                search_hits = np.intersect1d(search_hits, unit_rows, assume_unique=True)
+            df_filtered = df.iloc[search_hits]
+if search_hits is None:
+    search_query = ""
+
+# PDF generation controlled by sidebar checkbox (include signature)
+include_signature = st.sidebar.checkbox("Sertakan tanda tangan pada PDF", value=True)
+# Teks tanda tangan satu baris per baris ("^" = paraf, digambar menjorok)
+signature_text = st.sidebar.text_area("Teks tanda tangan PDF", "\n".join(DEFAULT_SIGNATURE),
+                                      disabled=not include_signature, key="_pok_signature")
+pdf_page = PageContent(signature=tuple(signature_text.splitlines()))
+
+# ========================= ANTRIAN EKSPOR =====================================
+# Semua ekspor berat (rincian Excel/PDF, selisih revisi, ZIP semua unit)
+# dikirim ke antrian ekspor lalu script lanjut, jadi pengguna tetap bisa
+# menjelajah selagi file dibangun dan jumlah proses pembangun dibatasi untuk
+# seluruh server. Status job (posisi antrian / progres) diperbarui oleh
+# fragment di sidebar yang berjalan ulang tiap detik selama masih ada job
+# aktif; file yang selesai langsung jadi tombol download. Kunci job (jenis,
+# hash file, sheet, ...) membuat permintaan yang sama dari sesi mana pun
+# hanya dibangun sekali.
+EXPORT_MIME = {"xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+               "pdf": "application/pdf", "zip": "application/zip"}
+jobs = export_queue()
+session_jobs = st.session_state.setdefault("_pok_export_jobs", [])
+
+
+def submit_export(key, file_name, kind, func, *args, rows=0):
+    submit_export_parts(key, file_name, kind, [(func, args)], rows=rows)
+
+
+def submit_export_parts(key, file_name, kind, calls, combine=None, rows=0):
+    # Job berbagian (lihat ExportQueue.submit_parts) dicatat di sesi seperti job biasa
+    try:
+        with stages.stage("export_submit", kind=kind, rows=rows, parts=len(calls)):
+            jobs.submit_parts(key, file_name, calls, combine, kind=kind, rows=rows)
+    except ExportQueueFull as exc:
+        st.sidebar.warning(str(exc))
+        return
+    entry = {"key": key, "file_name": file_name, "kind": kind}
+    if entry in session_jobs:
+        session_jobs.remove(entry)
+    session_jobs.insert(0, entry)
+    del session_jobs[EXPORT_JOBS_SHOWN:]
+
+
+def job_file(job):
+    # Job ZIP menghasilkan (bytes, waktu per unit); jenis lain langsung bytes
+    return job.result[0] if job.kind == "zip" else job.result
+
+
+def active_export_jobs():
+    session_job_list = [jobs.get(entry["key"]) for entry in session_jobs]
+    return any(job is not None and job.status in (JOB_WAITING, JOB_RUNNING) for job in session_job_list)
+
+
+def show_export_jobs():
+    for entry in session_jobs:
+        job = jobs.get(entry["key"])
+        if job is None:
+            # Hasil sudah keluar dari antrian (dibatasi jumlahnya): siapkan ulang
+            continue
+        if job.status == JOB_WAITING:
+            st.caption(f"⏳ {job.label}: antrian ke-{jobs.position(job)}")
+        elif job.status == JOB_RUNNING:
+            progress = jobs.progress(job)
+            estimate = "" if progress is None else f", ~{progress:.0%}"
+            if job.parts_total > 1:
+                estimate = f", {job.parts_done}/{job.parts_total} bagian"
+            st.progress(progress or 0.0, text=f"{job.label}: {job.seconds:.0f} dtk{estimate}")
+        elif job.status == JOB_DONE:
+            st.download_button(f"⬇ {job.label}", job_file(job), file_name=job.label, mime=EXPORT_MIME[entry["kind"]],
+                               key=f"_pok_job_{job.id}", on_click="ignore")
+        else:
+            st.error(f"{job.label} gagal: {job.error}")
+    active = active_export_jobs()
+    if st.session_state.get("_pok_export_jobs_active") and not active:
+        # Job terakhir selesai: rerun penuh sekali agar polling fragment berhenti
+        st.session_state["_pok_export_jobs_active"] = False
+        st.rerun()
+    st.session_state["_pok_export_jobs_active"] = active
+
+
+def show_export_panel():
+    # Status job ekspor sesi ini di sidebar; dipanggil oleh setiap tampilan sebelum st.stop
+    export_jobs_active = active_export_jobs()
+    st.session_state["_pok_export_jobs_active"] = export_jobs_active
+    with st.sidebar:
+        st.fragment(show_export_jobs, run_every=EXPORT_JOB_POLL_SECONDS if export_jobs_active else None)()
+    job_stats = jobs.stats()
+    st.sidebar.caption(f"Antrian ekspor: {job_stats['running']}/{jobs.max_workers} berjalan, "
+                       f"{job_stats['waiting']} menunggu")
+
+
+# ========================= BANDINGKAN REVISI ==================================
+# Upload kedua (revisi) dibandingkan dengan sheet aktif. Baris dipasangkan
+# lewat hash (UNIT, MAK, KODE, URAIAN), lihat pok.diff; hasilnya disimpan di
+# store per pasangan (file, sheet) dan dapat diekspor lewat generator rincian.
+revision = st.sidebar.file_uploader("Bandingkan dengan revisi (opsional)", type=["xlsx"], key="_pok_revision")
+if revision:
+    try:
+        check_size(revision.getvalue(), INGEST_BUDGET)
+    except BudgetExceeded as exc:
+        st.sidebar.warning(f"Revisi tidak dibandingkan: {exc}")
+        revision = None
+if revision:
+    rev_bytes = revision.getvalue()
+    rev_hash = hashlib.sha256(rev_bytes).hexdigest()
+
+    def read_revision_sheet_names():
+        with stages.stage("sheet_names", file="revisi"):
+            return sheet_names(rev_bytes)
+
+    rev_sheets = store.get_or_build((rev_hash, None), read_revision_sheet_names)
+    rev_sheet = st.sidebar.selectbox("Sheet revisi", rev_sheets,
+                                     index=rev_sheets.index(sheet_selected) if sheet_selected in rev_sheets else 0)
+    try:
+        df_rev = store.get_or_build((rev_hash, rev_sheet),
+                                    lambda: load_selected_sheet(rev_sheet, rev_bytes, rev_hash))
+    except BudgetExceeded as exc:
+        st.sidebar.warning(f"Revisi tidak dibandingkan: {exc}")
+        revision = None
+if revision:
+    st.session_state["_pok_revision_dataset"] = df_rev
+    diff_key = (file_hash, sheet_selected, rev_hash, rev_sheet)
+
+    def build_diff():
+        with stages.stage("diff", rows=len(df) + len(df_rev)):
+            return diff_sheets(df, df_rev), diff_rekap(df, df_rev)
+
+    lines, rekap_delta = store.get_or_build(diff_key + ("diff",), build_diff)
+    if detail_unit is not None:
+        lines = lines[lines["UNIT"] == detail_unit]
+        rekap_delta = rekap_delta[rekap_delta["UNIT"] == detail_unit]
+
+    st.subheader(f"Perbandingan Revisi: {sheet_selected} → {revision.name} ({rev_sheet})")
+    status_counts = lines[STATUS_COL].value_counts()
+    total_old, total_new = rekap_delta["LAMA"].sum(), rekap_delta["BARU"].sum()
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Baris ditambah", int(status_counts.get(STATUS_ADDED, 0)))
+    metric_cols[1].metric("Baris dihapus", int(status_counts.get(STATUS_REMOVED, 0)))
+    metric_cols[2].metric("Baris diubah", int(status_counts.get(STATUS_CHANGED, 0)))
+    metric_cols[3].metric("Total Anggaran Revisi", f"{total_new:,.0f}".replace(",", "."),
+                          delta=f"{total_new - total_old:,.0f}".replace(",", "."))
+
+    st.markdown("**Selisih total per UNIT**")
+    rekap_display = rekap_delta.copy()
+    for col in ["LAMA", "BARU", "SELISIH"]:
+        rekap_display[col] = format_ribuan(rekap_display[col], blank_zero=False)
+    st.dataframe(rekap_display, use_container_width=True, hide_index=True)
+
+    st.markdown("**Baris yang berubah**")
+    st.dataframe(lines, use_container_width=True, hide_index=True)
+
+    diff_unit = detail_unit or "Semua"
+    diff_title = f"{sheet_selected} → {rev_sheet} revisi"
+    diff_name = f"Selisih_Revisi_{file_stem(diff_unit)}"
+
+    # File selisih dibangun sebagai job di antrian ekspor (tombol download di sidebar)
+    diff_cols = st.columns(2)
+    if diff_cols[0].button("Siapkan Selisih Excel"):
+        submit_export(("diff_xlsx",) + diff_key + (diff_unit,), f"{diff_name}.xlsx", "xlsx",
+                      generate_excel, diff_export_frame(lines), rows=len(lines))
+    if diff_cols[1].button("Siapkan Selisih PDF"):
+        submit_export(("diff_pdf",) + diff_key + (diff_unit, include_signature, pdf_page), f"{diff_name}.pdf", "pdf",
+                      generate_pdf, diff_export_frame(lines, ["JUMLAH"]), diff_title, diff_unit, total_new - total_old,
+                      include_signature, pdf_page, rows=len(lines))
+    show_export_panel()
+    show_stage_panel(df)
+    st.stop()
+
 # ========================= HITUNG TOTAL AKUN (6 DIGIT) ========================
-mask_akun = df_filtered["KODE"].astype(str).str.match(r"^\d{6}$")
-total_anggaran = df_filtered.loc[mask_akun, "JUMLAH"].sum()
+if search_query:
+    total_anggaran = total_akun(df_filtered)
+else:
+    total_anggaran = unit_index.total_akun(detail_unit)
 
 total_fmt = f"{total_anggaran:,.0f}".replace(",", ".")
 
 st.metric("Total Anggaran (Kode Akun 6 Digit)", total_fmt)
+if search_query:
+    st.caption(f"{len(df_filtered)} baris cocok dengan pencarian \"{search_query}\"")
 
 # ========================= TAMPILKAN TABEL ====================================
-df_display = df_filtered.copy()
+# VOL/HARGA/JUMLAH sudah numerik sejak load (lihat pok.data.clean_sheet)
+df_display = df_filtered
 
-# Pastikan kolom VOL/HARGA/JUMLAH tetap sebagai numeric sehingga Streamlit
-# akan merendernya rata kanan. Gunakan Styler.format untuk menampilkan
-# angka dengan pemisah ribuan (titik) tetapi pertahankan tipe aslinya.
-df_display["VOL"] = pd.to_numeric(df_display["VOL"], errors="coerce")
-df_display["HARGA"] = pd.to_numeric(df_display["HARGA"], errors="coerce")
-df_display["JUMLAH"] = pd.to_numeric(df_display["JUMLAH"], errors="coerce")
+
+def build_number_strings():
+    with stages.stage("format_numbers", rows=len(df)):
+        return NumberStrings(df)
+
+
+# String tampilan VOL/HARGA/JUMLAH diformat sekali per dataset; tabel dan
+# ekspor PDF mengambil baris yang dibutuhkan saja (pok.numfmt)
+number_strings = store.get_or_build((file_hash, sheet_selected, "numbers"), build_number_strings)
+st.session_state["_pok_number_strings"] = number_strings
 
 # If we're in Rekap view, show summary per `UNIT` first; allow user to
 # pick a unit to view rincian. Otherwise show the detail table for the
 # currently-filtered dataset.
-if unit_selected == "Rekap Per Unit" and detail_unit is None:
+if unit_selected == "Rekap Per Unit" and detail_unit is None and not search_query:
     st.subheader("Rekap Per Unit")
-    # Compute summary: total JUMLAH (for 6-digit kode?) and count rows
-    # We'll show total anggaran (all JUMLAH) and count of records for each UNIT.
-    summary = df.copy()
-    summary["JUMLAH"] = pd.to_numeric(summary["JUMLAH"], errors="coerce").fillna(0)
-    # Mark rows where KODE is exactly 6 digits
-    summary["is6"] = summary["KODE"].astype(str).str.fullmatch(r"\d{6}")
-
-    # Group only rows with is6==True to compute counts and totals per UNIT
-    grp6 = summary[summary["is6"]].groupby("UNIT", dropna=False).agg(Count=("KODE", "count"), Total_JUMLAH=("JUMLAH", "sum")).reset_index()
 
-    # Ensure all units appear in the rekap (even those with zero matching KODE)
-    all_units = summary["UNIT"].fillna("").unique().tolist()
-    grp = pd.DataFrame({"UNIT": all_units}).merge(grp6, on="UNIT", how="left").fillna({"Count": 0, "Total_JUMLAH": 0})
-    grp["Count"] = grp["Count"].astype(int)
-    grp = grp.reset_index(drop=True)
+    def build_cube():
+        # Agregat per UNIT dicache di store dengan kunci hash isi barisnya:
+        # unggahan ulang yang hanya mengubah sebagian unit cukup mengagregasi
+        # ulang unit-unit itu saja
+        with stages.stage("rekap", rows=len(df)):
+            return build_rekap_cube(df, store)
 
-    grp["Total_JUMLAH_fmt"] = grp["Total_JUMLAH"].apply(lambda x: "" if x == 0 else f"{x:,.0f}".replace(",", "."))
+    cube = store.get_or_build((file_hash, sheet_selected, "rekap"), build_cube)
+    st.session_state["_pok_rekap_cube"] = cube
+    grp = cube.per_unit()
 
     # Display only UNIT and Total JUMLAH (no percent)
     st.dataframe(grp[["UNIT", "Total_JUMLAH_fmt"]].rename(columns={"Total_JUMLAH_fmt":"Total JUMLAH"}), use_container_width=True)
 
     # Provide download for the rekap as Excel (UNIT and Total JUMLAH)
     try:
-        buf = io.BytesIO()
-        with pd.ExcelWriter(buf, engine="openpyxl") as writer:
-            export_df = grp[["UNIT", "Total_JUMLAH"]].copy()
-            export_df.rename(columns={"Total_JUMLAH":"Total JUMLAH"}, inplace=True)
-            export_df.to_excel(writer, index=False, sheet_name="Rekap Per Unit")
-        buf.seek(0)
-        st.download_button("⬇ Download Rekap Excel", buf.getvalue(), file_name="Rekap_Per_Unit.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+        with stages.stage("rekap_excel"):
+            rekap_xlsx = generate_rekap_excel(grp)
+        st.download_button("⬇ Download Rekap Excel", rekap_xlsx, file_name="Rekap_Per_Unit.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
 
         # Also prepare PDF version of the rekap (landscape, centered title)
         try:
-            pdf_buf = io.BytesIO()
-            from reportlab.lib.pagesizes import A4
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-            from reportlab.lib import colors
-            from reportlab.lib.styles import getSampleStyleSheet
-
-            doc = SimpleDocTemplate(pdf_buf, pagesize=landscape(A4), leftMargin=12*mm, rightMargin=12*mm, topMargin=12*mm, bottomMargin=12*mm)
-            styles = getSampleStyleSheet()
-            elems = []
-            title_text = f"RINCIAN KERTAS KERJA SATKER T.A. 2025 ({sheet_selected})"
-            title_style = ParagraphStyle(name='rekap_title', parent=styles['Heading2'], alignment=1)
-            elems.append(Paragraph(title_text, title_style))
-            elems.append(Spacer(1, 6))
-
-            # Build table data with UNIT and Total JUMLAH only
-            pdf_rows = [["UNIT", "Total JUMLAH"]]
-            for _, r in grp.iterrows():
-                totalj = "" if r['Total_JUMLAH'] == 0 else f"{int(r['Total_JUMLAH']):,}".replace(",", ".")
-                pdf_rows.append([r['UNIT'], totalj])
-
-            # Wider columns for landscape layout
-            t = Table(pdf_rows, colWidths=[160*mm, 50*mm])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
-                ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
-                ('ALIGN', (1,1), (1,-1), 'RIGHT'),
-            ]))
-            elems.append(t)
-            doc.build(elems)
-            pdf_buf.seek(0)
-            st.download_button("⬇ Download Rekap PDF", pdf_buf.getvalue(), file_name="Rekap_Per_Unit.pdf", mime="application/pdf")
+            with stages.stage("rekap_pdf"):
+                rekap_pdf = generate_rekap_pdf(grp, sheet_selected)
+            st.download_button("⬇ Download Rekap PDF", rekap_pdf, file_name="Rekap_Per_Unit.pdf", mime="application/pdf")
         except Exception:
             pass
 
@@ -158,445 +592,96 @@ if unit_selected == "Rekap Per Unit" and detail_unit is None:
         csv_buf = grp[["UNIT", "Total_JUMLAH"]].to_csv(index=False).encode("utf-8")
         st.download_button("⬇ Download Rekap CSV", csv_buf, file_name="Rekap_Per_Unit.csv", mime="text/csv")
 
+    # Drill-down UNIT -> RO -> MAK -> KODE dari cube yang sama (tanpa membaca ulang df)
+    with st.expander("Drill-down UNIT → RO → MAK → Kode Akun"):
+        filters = {}
+        for level in CUBE_LEVELS[:-1]:
+            choice = st.selectbox(level, ["(semua)"] + cube.values(level, **filters), key=f"_pok_drill_{level}")
+            if choice == "(semua)":
+                break
+            filters[level] = choice
+        depth = len(filters) + 1
+        drill = cube.level(depth, **filters)
+        drill["Total JUMLAH"] = format_ribuan(drill["Total_JUMLAH"], blank_zero=False)
+        st.dataframe(drill[[CUBE_LEVELS[depth - 1], "Count", "Total JUMLAH"]].rename(columns={"Count": "Jumlah Akun"}),
+                     use_container_width=True, hide_index=True)
+
+    # Ekspor rincian semua unit sekaligus (Excel + PDF per unit dalam satu ZIP)
+    # sebagai satu job berbagian di antrian ekspor: tiap unit satu bagian,
+    # dibangun paralel di worker yang kosong (paling banyak POK_EXPORT_WORKERS
+    # proses); progres di panel ekspor = unit selesai / jumlah unit.
+    st.subheader("Ekspor Semua Unit")
+    zip_key = ("zip", file_hash, sheet_selected, include_signature, pdf_page)
+    if st.button("📦 Siapkan ZIP rincian semua unit"):
+        unit_calls = [(export_unit, args)
+                      for args in unit_export_args(df, sheet_selected, include_signature, EXPORT_FORMATS, pdf_page)]
+        submit_export_parts(zip_key, f"Rincian_Semua_Unit_{file_stem(sheet_selected)}.zip", "zip",
+                            unit_calls, zip_unit_exports, rows=len(df))
+    zip_job = jobs.get(zip_key)
+    if zip_job is not None and zip_job.status == JOB_DONE:
+        st.caption("ZIP siap diunduh dari panel ekspor di sidebar.")
+        timing_df = pd.DataFrame(zip_job.result[1], columns=["UNIT", "Detik", "Ukuran (KB)"])
+        timing_df["Ukuran (KB)"] = (timing_df["Ukuran (KB)"] / 1024).round(1)
+        timing_df["Detik"] = timing_df["Detik"].round(2)
+        with st.expander("Waktu ekspor per unit"):
+            st.dataframe(timing_df, use_container_width=True, hide_index=True)
+
     # Inform user to pick a unit from the sidebar to view rincian
     st.info("Pilih unit dari sidebar untuk melihat rincian")
+    show_export_panel()
+    show_stage_panel(df)
     st.stop()
 
 st.subheader("Tabel Data")
+# Tabel dirender per halaman: hanya potongan baris yang terlihat yang
+# diformat dan dikirim sebagai HTML, sehingga ukuran payload mengikuti
+# jumlah baris per halaman, bukan ukuran sheet.
+PAGE_SIZES = [50, 100, 250, 500, 1000]
+n_rows = len(df_display)
+nav_cols = st.columns([1, 1, 3])
+page_size = nav_cols[0].selectbox("Baris per halaman", PAGE_SIZES, index=1)
+n_pages = max(1, -(-n_rows // page_size))
+page = nav_cols[1].number_input("Halaman", min_value=1, max_value=n_pages, value=1, step=1,
+                                key=f"page_{sheet_selected}_{unit_selected}_{search_query}_{page_size}")
+start = (int(page) - 1) * page_size
+stop = min(start + page_size, n_rows)
+nav_cols[2].caption(f"Baris {start + 1 if n_rows else 0}–{stop} dari {n_rows} (halaman {int(page)}/{n_pages})")
+
 # Render tabel sebagai HTML dengan CSS untuk memastikan kolom VOL/HARGA/JUMLAH
 # diratakan ke kanan (beberapa versi Streamlit tidak merender Styler CSS).
 try:
-    df_html = df_display.copy()
-    # Format angka menjadi string tampilan (titik sebagai pemisah ribuan)
-    df_html["VOL"] = df_html["VOL"].apply(lambda x: "" if pd.isna(x) or x == 0 else f"{int(x):,}".replace(",", "."))
-    df_html["HARGA"] = df_html["HARGA"].apply(lambda x: "" if pd.isna(x) or x == 0 else f"{x:,.0f}".replace(",", "."))
-    df_html["JUMLAH"] = df_html["JUMLAH"].apply(lambda x: "" if pd.isna(x) or x == 0 else f"{x:,.0f}".replace(",", "."))
-
-    cols = list(df_html.columns)
-    # Build CSS: sticky header, spacing, alignment for numeric columns, and our conditional classes
-    css_parts = [
-        "<style>",
-        "table.dataframe{border-collapse:collapse;width:100%;font-family:Arial,Helvetica,sans-serif}",
-        "table.dataframe td, table.dataframe th{padding:2px 6px;font-size:11px;line-height:1.1}",
-        "table.dataframe thead th{position:sticky;top:0;background:#E0E0E0;z-index:3;text-align:center}",
-        # classes for rows where KODE is text, numeric, or 6-digit
-        ".kode-text td{background:#CCE5FF}",
-        ".kode-numeric td.numeric{font-weight:700;font-style:italic}",
-        ".kode-6digit td{font-weight:700;font-style:italic}",
-    ]
-
-    # Add right alignment for VOL/HARGA/JUMLAH if present
-    for colname in ("VOL", "HARGA", "JUMLAH"):
-        if colname in cols:
-            idx = cols.index(colname) + 1
-            css_parts.append(f"table.dataframe td:nth-child({idx}){{text-align:right}}")
-
-    css_parts.append("</style>")
-    css = "".join(css_parts)
-
-    # Build HTML table manually so we can add row classes based on KODE value
-    header_cells = "".join([f"<th>{c}</th>" for c in cols])
-    rows_html = []
-    for _, row in df_html.iterrows():
-        kode_val = "" if pd.isna(row.get("KODE", "")) else str(row.get("KODE", "")).strip()
-        # Determine class based on KODE only
-        if kode_val == "":
-            row_class = ""
-        elif re.search(r"[A-Za-z]", kode_val):
-            row_class = "kode-text"
-        elif re.fullmatch(r"\d{6}", kode_val):
-            # KODE consists of exactly 6 digits -> bold + italic entire row
-            row_class = "kode-6digit"
-        elif re.fullmatch(r"\d+", kode_val):
-            # other numeric KODE values (not 6 digits)
-            row_class = "kode-numeric"
-        else:
-            row_class = "kode-text"
-
-        # Build cells; mark numeric columns with class 'numeric' so CSS can target them
-        cell_html = []
-        for c in cols:
-            v = row.get(c, "")
-            cell_value = "" if pd.isna(v) else str(v)
-            td_class = "numeric" if c in {"VOL", "HARGA", "JUMLAH"} else ""
-            if td_class:
-                cell_html.append(f"<td class='{td_class}'>{cell_value}</td>")
-            else:
-                cell_html.append(f"<td>{cell_value}</td>")
-
-        tr = f"<tr class='{row_class}'>" + "".join(cell_html) + "</tr>"
-        rows_html.append(tr)
-
-    table_html = f"<table class='dataframe'><thead><tr>{header_cells}</tr></thead><tbody>{''.join(rows_html)}</tbody></table>"
-    container_html = f'<div style="max-height:400px;overflow:auto">{table_html}</div>'
-    st.markdown(css + container_html, unsafe_allow_html=True)
+    with stages.stage("table_html", rows=stop - start):
+        df_page = df_display.iloc[start:stop]
+        page_html = table_html(df_page, number_strings.rows(df_page))
+    st.markdown(page_html, unsafe_allow_html=True)
 except Exception:
     # Fallback: tampilkan DataFrame biasa
-    st.dataframe(df_display, use_container_width=True, hide_index=True)
-
-# ========================== EXPORT EXCEL ======================================
-def generate_excel(dataframe):
-    buffer = io.BytesIO()
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "Rincian"
-
-    # Header
-    header_fill = PatternFill(start_color="E0E0E0", fill_type="solid")
-    for i, col in enumerate(dataframe.columns, start=1):
-        c = ws.cell(row=1, column=i, value=col)
-        c.font = Font(bold=True)
-        c.alignment = Alignment(horizontal="center", vertical="center")
-        c.fill = header_fill
-
-
-    # Data with conditional formatting rules based ONLY on the KODE column:
-    # - If KODE contains alphabetic characters (text) -> fill entire row light blue.
-    # - If KODE is numeric (digits) -> for that row, numeric cells are bold+italic.
-    # - If KODE is empty -> leave row normal.
-    row_text_fill = PatternFill(start_color="CCE5FF", fill_type="solid")
-
-    # find index of KODE column (0-based)
-    try:
-        kode_idx = list(dataframe.columns).index("KODE")
-    except ValueError:
-        kode_idx = None
-
-    for r, row in enumerate(dataframe.itertuples(index=False), start=2):
-        # Determine KODE value for this row
-        kode_val = None
-        if kode_idx is not None:
-            try:
-                kode_val = row[kode_idx]
-            except Exception:
-                kode_val = None
-
-        kode_str = "" if kode_val is None else str(kode_val).strip()
-
-        row_is_text = False
-        row_is_numeric = False
-        if kode_str == "":
-            # empty -> normal
-            pass
-        elif re.search(r"[A-Za-z]", kode_str):
-            row_is_text = True
-        elif re.fullmatch(r"\d+", kode_str):
-            row_is_numeric = True
-        else:
-            # fallback: if it isn't purely digits but also not alphabetic, treat as text
-            row_is_text = True
-
-        for c, val in enumerate(row, start=1):
-            cell = ws.cell(row=r, column=c, value=val)
-            cell.alignment = Alignment(wrap_text=True, vertical="top")
-
-            # If KODE indicates text, fill entire row
-            if row_is_text:
-                cell.fill = row_text_fill
-
-            # If KODE indicates numeric, style numeric cells bold+italic
-            if row_is_numeric:
-                is_numeric = False
-                if isinstance(val, (int, float)):
-                    is_numeric = True
-                elif isinstance(val, str):
-                    s = val.strip()
-                    if re.fullmatch(r"-?\d+(?:\.\d+)?", s):
-                        is_numeric = True
-                if is_numeric:
-                    cell.font = Font(bold=True, italic=True)
-
-            # Preserve / add KODE 6-digit highlight (overrides other fills on that cell)
-            if dataframe.columns[c-1] == "KODE":
-                if isinstance(kode_val, str) and re.fullmatch(r"\d{6}", kode_val):
-                    cell.fill = PatternFill(start_color="CCE5FF", fill_type="solid")
-
-        # Adjust row height (openpyxl uses points)
-        try:
-            ws.row_dimensions[r].height = 13
-        except Exception:
-            pass
+    st.dataframe(df_display[wajib].iloc[start:stop], use_container_width=True, hide_index=True)
 
-    wb.save(buffer)
-    return buffer.getvalue()
+# ========================= BUTTON DOWNLOAD ====================================
+# Tombol "Siapkan" mengirim job ke antrian ekspor (lihat ANTRIAN EKSPOR).
+# Kunci job (hash file, sheet, unit, pencarian[, tanda tangan]) membuat
+# permintaan yang sama dari sesi mana pun hanya dibangun sekali.
+export_unit = detail_unit or ("Semua" if search_query else unit_selected)
+export_label = f"{export_unit} (cari: {search_query})" if search_query else export_unit
+export_name = f"{export_unit}_cari_{file_stem(search_query)}" if search_query else export_unit
 
-if detail_unit is not None or unit_selected != "Rekap Per Unit":
-    xlsx = generate_excel(df_display)
-else:
-    xlsx = None
-
-# =========================== EXPORT PDF ========================================
-def generate_pdf(dataframe, sheet_name, unit_name, total_anggaran, include_signature=True):
-
-    # Buat PDF landscape A4 dengan margin; tambahkan bottom margin lebih besar
-    # agar blok tanda tangan tidak tertimpa tabel.
-    buffer = io.BytesIO()
-    left_margin = right_margin = top_margin = 12 * mm
-    # Reduce bottom margin to allow more table rows per page while still
-    # leaving space for the signature block. 18 mm is a reasonable compromise.
-    bottom_margin = 18 * mm
-    doc = SimpleDocTemplate(buffer, pagesize=landscape(A4),
-                            leftMargin=left_margin, rightMargin=right_margin,
-                            topMargin=top_margin, bottomMargin=bottom_margin)
-
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading2']
-    title_style.alignment = 1  # center
-    title_style.fontSize = 11
-    title_style.spaceAfter = 6
-
-    info_style = styles['Normal']
-    info_style.fontSize = 9
-
-    title_text = f"RINCIAN KERTAS KERJA SATKER T.A. 2025 ({sheet_name})"
-    total_fmt = f"{total_anggaran:,.0f}".replace(",", ".")
-    unit_text = f"Unit: {unit_name}                                        Total: {total_fmt}"
-
-    elems = []
-    elems.append(Paragraph(title_text, title_style))
-    elems.append(Spacer(1, 4))
-    elems.append(Paragraph(unit_text, info_style))
-    elems.append(Spacer(1, 6))
-
-    # Siapkan data tabel dengan lebar kolom tetap (dalam mm). Jika total melebihi
-    # lebar tersedia, ukurannya akan diskalakan secara proporsional.
-    page_width, page_height = landscape(A4)
-    avail_width = page_width - left_margin - right_margin
-
-    # Default lebar tiap kolom dalam mm (sesuaikan bila perlu)
-    fixed_widths_mm = {
-        'UNIT': 33,
-        'MAK': 35,
-        'KODE': 19,
-        'URAIAN': 150,
-        'VOL': 15,
-        'SAT': 15,
-        'HARGA': 27,
-        'JUMLAH': 30,
-        'RO': 7,
-        'SD': 10,
-    }
-
-    # Bangun list lebar (dalam points)
-    fixed_points = []
-    cols = list(dataframe.columns)
-    for col in cols:
-        mm_val = fixed_widths_mm.get(str(col).upper(), 25)
-        fixed_points.append(mm_val * mm)
-
-    total_fixed = sum(fixed_points)
-    if total_fixed > avail_width and total_fixed > 0:
-        scale = avail_width / total_fixed
-        col_widths = [w * scale for w in fixed_points]
-    else:
-        col_widths = fixed_points
-
-    # Siapkan style untuk sel tabel (pakai Paragraph untuk kolom URAIAN agar wrapping bekerja)
-    styles = getSampleStyleSheet()
-    cell_style = styles['BodyText']
-    # Slightly larger font and leading so rows are not too cramped
-    cell_style.fontSize = 8
-    cell_style.leading = 10
-    cell_style.alignment = 0  # left
-
-    # Header + data: create Paragraphs for every data cell so we can reliably
-    # control font per-row. Also compute KODE classification for each row.
-    header = cols
-    rows = []
-    kode_row_classes = []
-    for row in dataframe.values.tolist():
-        # Determine KODE for this row first
-        try:
-            kode_val = row[cols.index('KODE')]
-        except Exception:
-            kode_val = ''
-        kode_str = '' if pd.isna(kode_val) else str(kode_val).strip()
-        if kode_str == '':
-            kode_class = 'empty'
-        elif re.search(r'[A-Za-z]', kode_str):
-            kode_class = 'text'
-        elif re.fullmatch(r'\d{6}', kode_str):
-            kode_class = 'six'
-        elif re.fullmatch(r'\d+', kode_str):
-            kode_class = 'numeric'
-        else:
-            kode_class = 'text'
-        kode_row_classes.append(kode_class)
-
-        # Build a per-row ParagraphStyle derived from cell_style
-        # base style
-        base_font = 'Helvetica'
-        bold_italic_font = 'Helvetica-BoldOblique'
-        if kode_class == 'six':
-            row_font = bold_italic_font
-        else:
-            row_font = base_font
-
-        new_row = []
-        for i, val in enumerate(row):
-            colname = cols[i]
-            cname = str(colname).upper()
-            if cname == 'VOL':
-                s = '' if pd.isna(val) or val == 0 else f"{int(val):,}".replace(',', '.')
-            elif cname in {'HARGA', 'JUMLAH'}:
-                s = '' if pd.isna(val) or val == 0 else f"{val:,.0f}".replace(',', '.')
-            else:
-                s = '' if pd.isna(val) else str(val)
-
-            # create style per cell so alignment can be adjusted for numeric columns
-            if cname in {'VOL', 'HARGA', 'JUMLAH'}:
-                pstyle = ParagraphStyle(name=f'ps_{kode_class}_{cname}', parent=cell_style,
-                                        fontName=row_font, alignment=TA_RIGHT)
-            else:
-                pstyle = ParagraphStyle(name=f'ps_{kode_class}_{cname}', parent=cell_style,
-                                        fontName=row_font, alignment=0)
-
-            new_row.append(Paragraph(s, pstyle))
-
-        rows.append(new_row)
-
-    data_table = [header] + rows
-
-    # Let ReportLab compute row heights automatically so text wrapping is
-    # accommodated. This prevents truncation or overly tight rows when URAIAN
-    # wraps across lines.
-    table = Table(data_table, colWidths=col_widths, repeatRows=1)
-
-    # Styling: header, font size, alignment per kolom, vertical middle for URAIAN
-    ts = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
-        # Use slightly larger padding so wrapped text has room
-        ('LEFTPADDING', (0, 0), (-1, -1), 4),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-    ])
-
-    # Right align numeric-like columns
-    numeric_cols = [i for i, c in enumerate(cols) if str(c).upper() in {"VOL", "HARGA", "JUMLAH"}]
-    for ci in numeric_cols:
-        ts.add('ALIGN', (ci, 1), (ci, -1), 'RIGHT')
-
-    # Apply per-row styling based on KODE classification
-    # data rows in the ReportLab table start at row index 1 (header is row 0)
-    for i, cls in enumerate(kode_row_classes):
-        table_row = i + 1
-        if cls == 'text':
-            # light blue background across the entire row
-            try:
-                ts.add('BACKGROUND', (0, table_row), (-1, table_row), colors.HexColor('#CCE5FF'))
-            except Exception:
-                # fallback to lightblue constant
-                ts.add('BACKGROUND', (0, table_row), (-1, table_row), colors.lightblue)
-        elif cls == 'six':
-            # entire row bold + italic
-            # use Helvetica-BoldOblique if available
-            ts.add('FONTNAME', (0, table_row), (-1, table_row), 'Helvetica-BoldOblique')
-
-    # URAIAN column: ensure left align and vertical middle
-    try:
-        ur_idx = cols.index('URAIAN')
-        ts.add('ALIGN', (ur_idx, 1), (ur_idx, -1), 'LEFT')
-        ts.add('VALIGN', (ur_idx, 0), (ur_idx, -1), 'MIDDLE')
-    except ValueError:
-        pass
-
-    table.setStyle(ts)
-
-    elems.append(table)
-
-    # Custom canvas to add page numbers and signature block on the last page
-    class NumberedCanvas(pdfcanvas.Canvas):
-        pass
-
-    def _make_numbered_canvas(left_margin, right_margin, top_margin, bottom_margin, include_signature):
-        class NC(pdfcanvas.Canvas):
-            def __init__(self, *args, **kwargs):
-                pdfcanvas.Canvas.__init__(self, *args, **kwargs)
-                self._saved_page_states = []
-
-            def showPage(self):
-                self._saved_page_states.append(dict(self.__dict__))
-                self._startPage()
-
-            def save(self):
-                num_pages = len(self._saved_page_states)
-                for i, state in enumerate(self._saved_page_states):
-                    self.__dict__.update(state)
-                    # draw page number centered at bottom
-                    page_num = i + 1
-                    page_text = f"{page_num} / {num_pages}"
-                    pw, ph = self._pagesize
-                    x_center = pw / 2.0
-                    y_page = bottom_margin * 0.3
-                    self.setFont('Helvetica', 8)
-                    self.drawCentredString(x_center, y_page, page_text)
-
-                    # If last page, optionally draw signature block at bottom-right
-                    if page_num == num_pages and include_signature:
-                        # signature lines (right-aligned)
-                        sig_lines = [
-                            "Lhokseumawe, 03 Oktober 2025",
-                            "Wakil Rektor II",
-                            "Bidang Administrasi Umum, Perencanaan, dan Keuangan",
-                            "",
-                            "",
-                            "^",
-                            "",
-                            "",
-                            "SAID ALWI",
-                        ]
-                        self.setFont('Helvetica', 9)
-                        x_left = left_margin
-                        leading = 12
-                        # Position so the last signature line is about 3 lines above bottom margin
-                        last_line_y = bottom_margin + (leading * 3)
-                        first_line_y = last_line_y + leading * (len(sig_lines) - 1)
-                        # ensure not beyond top margin
-                        max_top = ph - top_margin - 6
-                        if first_line_y > max_top:
-                            first_line_y = max_top
-                        # draw lines top-down, left-aligned
-                        for idx, line in enumerate(sig_lines):
-                            y = first_line_y - idx * leading
-                            if line.strip() == "^":
-                                # draw caret slightly indented
-                                self.drawString(x_left + 6 * mm, y, line)
-                            else:
-                                self.drawString(x_left, y, line)
-
-                    pdfcanvas.Canvas.showPage(self)
-                pdfcanvas.Canvas.save(self)
-
-        return NC
-
-    CanvasMaker = _make_numbered_canvas(left_margin, right_margin, top_margin, bottom_margin, include_signature)
-    doc.build(elems, canvasmaker=CanvasMaker)
-    return buffer.getvalue()
 
-# PDF generation controlled by sidebar checkbox (include signature)
-include_signature = st.sidebar.checkbox("Sertakan tanda tangan pada PDF", value=True)
-if xlsx is not None:
-    pdf = generate_pdf(df_display, sheet_selected, unit_selected if detail_unit is None else detail_unit, total_anggaran, include_signature)
-else:
-    pdf = None
+def submit_rincian(kind, func, *args):
+    key = (kind, file_hash, sheet_selected, export_unit, search_query) + ((include_signature, pdf_page) if kind == "pdf" else ())
+    submit_export(key, f"Rincian_{export_name}.{kind}", kind, func, *args, rows=len(df_display))
+
 
-# ========================= BUTTON DOWNLOAD ====================================
 st.sidebar.header("Export")
-if xlsx is not None:
-    st.sidebar.download_button("⬇ Download Excel", xlsx,
-        file_name=f"Rincian_{detail_unit or unit_selected}.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
-
-if pdf is not None:
-    st.sidebar.download_button("⬇ Download PDF (Landscape)", pdf,
-        file_name=f"Rincian_{detail_unit or unit_selected}.pdf",
-        mime="application/pdf")
+export_cols = st.sidebar.columns(2)
+if export_cols[0].button("Siapkan Excel"):
+    submit_rincian("xlsx", generate_excel, df_display)
+if export_cols[1].button("Siapkan PDF"):
+    submit_rincian("pdf", generate_pdf, df_display, sheet_selected, export_label, total_anggaran, include_signature, pdf_page,
+                   number_strings.rows(df_display))
+
+show_export_panel()
+show_stage_panel(df)
 
 # Sidebar contact pinned to bottom
 contact_html = '''
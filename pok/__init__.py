@@ -0,0 +1,22 @@
+"""Pengolahan data POK: muat sheet, klasifikasi KODE, rekap, dan ekspor Excel/PDF.
+
+Semua tahap dapat dipakai tanpa Streamlit (lihat ``python -m pok --help``).
+"""
+from .data import (wajib, KELAS_COL, KODE_KELAS, classify_kode, kelas_kode, sheet_names, read_sheet,
+                   iter_sheet_chunks, clean_sheet, load_sheet, list_units, filter_unit, total_akun, memory_footprint,
+                   UnitIndex)
+from .rekap import (rekap_per_unit, rekap_chunks, generate_rekap_excel, generate_rekap_pdf, CUBE_LEVELS, RekapCube,
+                    build_rekap_cube)
+from .excel import generate_excel
+from .numfmt import format_ribuan, format_numbers, NumberStrings
+from .pdf import generate_pdf
+from .pdfpage import DEFAULT_SIGNATURE, PageContent, PageTemplate, page_template
+from .batch import export_unit, unit_export_args, iter_unit_exports, zip_unit_exports, export_all_units
+from .ingest import (IngestBudget, IngestReport, BudgetExceeded, check_size, read_sheet_within,
+                     load_sheet_within, fit_budget, rekap_streamed)
+from .consolidate import iter_sheet_loads, load_sheets, tag_sheets, rekap_sheets
+from .diff import DIFF_KEYS, diff_sheets, diff_rekap, diff_export_frame
+from .search import SEARCH_COLS, SearchIndex, tokenize
+from .store import DatasetStore
+from .diskcache import SheetDiskCache
+from .jobs import ExportQueue, ExportQueueFull
@@ -0,0 +1,170 @@
+"""Ekspor rincian Excel/PDF untuk setiap UNIT sekaligus ke dalam satu ZIP."""
+import io
+import multiprocessing
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+from multiprocessing import spawn
+
+from .data import total_akun
+from .excel import generate_excel
+from .pdf import generate_pdf
+from .pdfpage import PageContent
+
+EXPORT_FORMATS = ("xlsx", "pdf")
+
+
+def file_stem(unit, used=None):
+    # Nama file: tanpa spasi di tepi / pemisah path, dan unik di dalam used
+    if used is None:
+        used = set()
+    stem = re.sub(r'[\\/:*?"<>|]+', "-", str(unit).strip()) or "UNIT"
+    name, n = stem, 2
+    while name.lower() in used:
+        name = f"{stem}_{n}"
+        n += 1
+    used.add(name.lower())
+    return name
+
+
+# Worker pool memakai forkserver (spawn di Windows), bukan fork: fork dari
+# server Streamlit yang multi-thread menyalin lock yang sedang dipegang
+# thread lain (bisa deadlock; Python 3.12+ memberi peringatan). Kedua start
+# method itu biasanya menjalankan ulang __main__ induk di setiap worker, dan
+# selama rerun Streamlit __main__ adalah script dashboard. Worker pok tidak
+# butuh __main__ (fungsi yang dikirim ada di paket pok), jadi data persiapan
+# proses yang diluncurkan _WorkerProcess tidak membawa __main__ induk, dan
+# server fork memuat WORKER_PRELOAD, bukan __main__.
+#
+# Keduanya state global multiprocessing (spawn.get_preparation_data bahkan
+# fungsi privat), jadi hanya diganti selama _WorkerProcess.start lalu
+# dipulihkan: mengimpor pok tidak mengubah Process lain. Satu efek tersisa:
+# bila server fork bersama belum berjalan, ia dimulai oleh worker pok dengan
+# preload WORKER_PRELOAD (tanpa __main__) untuk seterusnya.
+WORKER_PRELOAD = ["pok.batch"]
+
+_launching = threading.local()
+_launch_lock = threading.Lock()
+
+
+def _preparation_data(get_preparation_data, name):
+    data = get_preparation_data(name)
+    # Thread lain yang meluncurkan Process pada saat yang sama tidak terpengaruh
+    if getattr(_launching, "active", False):
+        data.pop("init_main_from_path", None)
+        data.pop("init_main_from_name", None)
+    return data
+
+
+_BASE_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+
+class _WorkerProcess(_BASE_CONTEXT.Process):
+    def start(self):
+        with _launch_lock:
+            get_preparation_data = spawn.get_preparation_data
+            spawn.get_preparation_data = partial(_preparation_data, get_preparation_data)
+            if self._start_method == "forkserver":
+                # Server fork dimulai (bila belum) di dalam start()
+                from multiprocessing import forkserver
+                preload = forkserver._forkserver._preload_modules
+                forkserver.set_forkserver_preload(WORKER_PRELOAD)
+            _launching.active = True
+            try:
+                super().start()
+            finally:
+                _launching.active = False
+                spawn.get_preparation_data = get_preparation_data
+                if self._start_method == "forkserver":
+                    forkserver.set_forkserver_preload(preload)
+
+
+class _WorkerContext(type(_BASE_CONTEXT)):
+    Process = _WorkerProcess
+
+
+_WORKER_CONTEXT = _WorkerContext()
+
+
+def process_pool(max_workers=None, max_tasks_per_child=None):
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=_WORKER_CONTEXT,
+                               max_tasks_per_child=max_tasks_per_child)
+
+
+def export_unit(dataframe, sheet_name, unit_name, file_stem, include_signature=True, formats=EXPORT_FORMATS,
+                page=PageContent()):
+    """Bangun file ekspor satu unit -> (unit, {nama file: bytes}, detik)."""
+    start = time.perf_counter()
+    files = {}
+    if "xlsx" in formats:
+        files[f"Rincian_{file_stem}.xlsx"] = generate_excel(dataframe)
+    if "pdf" in formats:
+        files[f"Rincian_{file_stem}.pdf"] = generate_pdf(
+            dataframe, sheet_name, unit_name, total_akun(dataframe), include_signature, page)
+    return unit_name, files, time.perf_counter() - start
+
+
+def unit_export_args(dataframe, sheet_name, include_signature=True, formats=EXPORT_FORMATS, page=PageContent()):
+    """Argumen export_unit untuk setiap UNIT, urut kemunculan di sheet.
+
+    DataFrame dikelompokkan per UNIT sekali; UNIT kosong dilewati.
+    """
+    used = set()
+    return [(part, sheet_name, unit, file_stem(unit, used), include_signature, formats, page)
+            for unit, part in dataframe.groupby("UNIT", sort=False, observed=True)
+            if str(unit).strip()]
+
+
+def iter_unit_exports(dataframe, sheet_name, include_signature=True, formats=EXPORT_FORMATS,
+                      max_workers=None, page=PageContent()):
+    """Bangun ekspor setiap UNIT secara paralel (process pool).
+
+    Tiap unit (lihat unit_export_args) dibangun di proses terpisah.
+    Menghasilkan (unit, {nama file: bytes}, detik, selesai, total) begitu
+    sebuah unit selesai. max_workers=1: berurutan di proses ini, tanpa pool.
+    """
+    calls = unit_export_args(dataframe, sheet_name, include_signature, formats, page)
+
+    if max_workers == 1:
+        for done, args in enumerate(calls, start=1):
+            yield export_unit(*args) + (done, len(calls))
+        return
+    with process_pool(max_workers) as pool:
+        futures = [pool.submit(export_unit, *args) for args in calls]
+        for done, future in enumerate(as_completed(futures), start=1):
+            unit, files, seconds = future.result()
+            yield unit, files, seconds, done, len(calls)
+
+
+def zip_unit_exports(exports):
+    """(bytes ZIP, list (unit, detik, ukuran byte)) dari hasil export_unit berurutan."""
+    timings = []
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as zf:
+        for unit, files, seconds in exports:
+            for name, data in files.items():
+                zf.writestr(name, data)
+            timings.append((unit, seconds, sum(len(d) for d in files.values())))
+    return buffer.getvalue(), timings
+
+
+def export_all_units(dataframe, sheet_name, include_signature=True, formats=EXPORT_FORMATS,
+                     max_workers=None, progress=None, page=PageContent()):
+    """Ekspor setiap UNIT ke dalam satu ZIP (lihat iter_unit_exports).
+
+    File ditulis ke ZIP begitu unitnya selesai.
+    ``progress(selesai, total, unit, detik)`` dipanggil per unit selesai.
+    Mengembalikan (bytes ZIP, list (unit, detik, ukuran byte)).
+    """
+    def exported():
+        exports = iter_unit_exports(dataframe, sheet_name, include_signature, formats, max_workers, page)
+        for unit, files, seconds, done, total in exports:
+            yield unit, files, seconds
+            if progress is not None:
+                progress(done, total, unit, seconds)
+
+    return zip_unit_exports(exported())
@@ -0,0 +1,146 @@
+"""Benchmark tahap-tahap pipeline POK pada workbook sintetis.
+
+    python -m pok.bench --sizes 1000 10000 100000 -o bench.json
+    python -m pok.bench --sizes 10000 --compare bench.json
+
+Tiap tahap diukur terpisah (detik, terbaik dari --repeat kali) dan hasilnya
+ditulis sebagai JSON. Dengan --compare, hasil dibandingkan dengan file JSON
+sebelumnya dan exit code 1 bila ada tahap yang lebih lambat dari toleransi.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from importlib.metadata import version, PackageNotFoundError
+
+from .data import sheet_names, read_sheet, clean_sheet, total_akun, memory_footprint
+from .excel import generate_excel
+from .numfmt import format_numbers
+from .pdf import generate_pdf
+from .rekap import rekap_per_unit
+from .synth import synthetic_workbook
+from .table import table_html
+
+STAGES = ["read_excel", "clean", "rekap", "format_numbers", "table_html_page", "table_html_full", "generate_excel", "generate_pdf"]
+PAGE_ROWS = 100
+# Selisih absolut di bawah ini dianggap noise, bukan regresi
+MIN_DELTA_S = 0.01
+
+
+def _timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def run_size(n_rows, n_sheets=2, stages=STAGES, repeat=1, seed=0, extra_cols=0):
+    """Ukur semua tahap untuk satu ukuran workbook -> dict hasil."""
+    start = time.perf_counter()
+    source = synthetic_workbook(n_rows, n_sheets, seed, extra_cols)
+    result = {"rows": n_rows, "sheets": n_sheets, "extra_cols": extra_cols, "workbook_bytes": len(source),
+              "generate_workbook_s": round(time.perf_counter() - start, 4), "stages": {}}
+    sheet = sheet_names(source)[0]
+
+    # read dan clean selalu dijalankan karena tahap lain butuh hasilnya
+    raw, read_t = _timed(lambda: read_sheet(source, sheet), repeat)
+    df, clean_t = _timed(lambda: clean_sheet(raw), repeat)
+    measured = {"read_excel": read_t, "clean": clean_t}
+    result["frame_bytes"] = memory_footprint(df)
+
+    jobs = {
+        "rekap": lambda: rekap_per_unit(df),
+        "format_numbers": lambda: format_numbers(df),
+        "table_html_page": lambda: table_html(df.iloc[:PAGE_ROWS]),
+        "table_html_full": lambda: table_html(df),
+        "generate_excel": lambda: generate_excel(df),
+        "generate_pdf": lambda: generate_pdf(df, sheet, "Semua", total_akun(df), True),
+    }
+    for name, fn in jobs.items():
+        if name in stages:
+            _, measured[name] = _timed(fn, repeat)
+
+    for name in STAGES:
+        if name in stages:
+            times = measured[name]
+            result["stages"][name] = {"best_s": round(min(times), 4), "runs_s": [round(t, 4) for t in times],
+                                      "rows_per_s": round(n_rows / min(times)) if min(times) else None}
+    return result
+
+
+def _versions():
+    out = {"python": platform.python_version(), "platform": platform.platform()}
+    for pkg in ("pandas", "numpy", "openpyxl", "reportlab"):
+        try:
+            out[pkg] = version(pkg)
+        except PackageNotFoundError:
+            out[pkg] = None
+    return out
+
+
+def compare(current, baseline, tolerance):
+    """Daftar (rows, stage, baseline_s, current_s, rasio) yang melambat > tolerance."""
+    base = {(r["rows"], s): v["best_s"] for r in baseline["results"] for s, v in r["stages"].items()}
+    regressions = []
+    for r in current["results"]:
+        for stage, v in r["stages"].items():
+            old = base.get((r["rows"], stage))
+            if not old:
+                continue
+            ratio = v["best_s"] / old
+            print(f"  {r['rows']:>7} {stage:<16} {old:8.3f}s -> {v['best_s']:8.3f}s  x{ratio:.2f}", file=sys.stderr)
+            if ratio > 1 + tolerance and v["best_s"] - old > MIN_DELTA_S:
+                regressions.append((r["rows"], stage, old, v["best_s"], ratio))
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m pok.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="jumlah baris per sheet (default: 1000 10000 100000)")
+    parser.add_argument("--sheets", type=int, default=2, help="jumlah sheet per workbook (default: 2)")
+    parser.add_argument("--extra-cols", type=int, default=0, help="kolom tambahan di luar kolom wajib (sheet lebar)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=1, help="ulangi tiap tahap n kali, ambil yang terbaik")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="tulis hasil JSON ke file (default: stdout)")
+    parser.add_argument("--compare", help="file JSON hasil sebelumnya sebagai pembanding")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="batas perlambatan relatif sebelum dianggap regresi (default: 0.2)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    report = {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+              "versions": _versions(), "seed": args.seed, "results": []}
+    for n_rows in args.sizes:
+        result = run_size(n_rows, args.sheets, args.stages, args.repeat, args.seed, args.extra_cols)
+        report["results"].append(result)
+        summary = ", ".join(f"{k} {v['best_s']:.3f}s" for k, v in result["stages"].items())
+        print(f"{n_rows} baris: {summary}", file=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Perbandingan dengan {args.compare}:", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance)
+        for rows, stage, old, new, ratio in regressions:
+            print(f"REGRESI {rows} baris {stage}: {old:.3f}s -> {new:.3f}s (x{ratio:.2f})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
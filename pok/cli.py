@@ -0,0 +1,119 @@
+"""Jalankan pipeline POK tanpa Streamlit.
+
+Contoh::
+
+    python -m pok "POK contoh.xlsx" --unit all --format pdf -o hasil/
+    python -m pok "POK contoh.xlsx" --sheet "DIPA 8" --unit FTIK --rekap
+"""
+import argparse
+import os
+import sys
+import time
+
+from .data import sheet_names, load_sheet, list_units, filter_unit, total_akun
+from .excel import generate_excel
+from .pdf import generate_pdf
+from .pdfpage import DEFAULT_FOOTER, PageContent
+from .rekap import rekap_per_unit, generate_rekap_excel, generate_rekap_pdf
+from .batch import EXPORT_FORMATS, file_stem, iter_unit_exports
+
+SEMUA = "Semua"
+ALL_UNITS = "all"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m pok",
+        description="Ekspor rincian/rekap POK dari file Excel tanpa membuka dashboard.")
+    parser.add_argument("xlsx", help="path file workbook POK (.xlsx)")
+    parser.add_argument("-s", "--sheet", help="nama sheet (default: sheet pertama)")
+    parser.add_argument("-u", "--unit", default=SEMUA,
+                        help=f"nama UNIT, '{SEMUA}' untuk seluruh sheet (default), "
+                             f"atau '{ALL_UNITS}' untuk satu file per UNIT")
+    parser.add_argument("-f", "--format", nargs="+", choices=EXPORT_FORMATS, default=list(EXPORT_FORMATS),
+                        help="format keluaran (default: xlsx pdf)")
+    parser.add_argument("--rekap", action="store_true", help="tulis juga Rekap_Per_Unit")
+    parser.add_argument("-o", "--output-dir", default=".", help="folder keluaran (default: folder kerja)")
+    parser.add_argument("--no-signature", action="store_true", help="PDF tanpa blok tanda tangan")
+    parser.add_argument("--signature-file",
+                        help="file teks tanda tangan PDF, satu baris per baris ('^' = paraf)")
+    parser.add_argument("--header", help="teks header tiap halaman PDF ({page} = nomor halaman)")
+    parser.add_argument("--footer", default=DEFAULT_FOOTER,
+                        help="teks footer PDF ({page}, {total}; default: '%(default)s')")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help=f"jumlah proses untuk --unit {ALL_UNITS} (default: jumlah CPU)")
+    parser.add_argument("--list", action="store_true", help="tampilkan daftar sheet dan UNIT lalu keluar")
+    return parser
+
+
+def _write(output_dir, name, data):
+    path = os.path.join(output_dir, name)
+    with open(path, "wb") as f:
+        f.write(data)
+    print(f"  {path} ({len(data) / 1024:.1f} KB)")
+
+
+def _resolve_unit(parser, df, unit):
+    # Nama UNIT di sheet sering berakhiran spasi; cocokkan setelah strip
+    for candidate in list_units(df):
+        if candidate == unit or str(candidate).strip() == unit.strip():
+            return candidate
+    parser.error(f"UNIT {unit!r} tidak ditemukan; pilihan: "
+                 + ", ".join(str(u).strip() for u in list_units(df)))
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    sheets = sheet_names(args.xlsx)
+    sheet = args.sheet or sheets[0]
+    if sheet not in sheets:
+        parser.error(f"sheet {sheet!r} tidak ada; pilihan: {', '.join(sheets)}")
+
+    start = time.perf_counter()
+    df = load_sheet(args.xlsx, sheet)
+    print(f"{sheet}: {len(df)} baris dimuat ({time.perf_counter() - start:.2f} dtk)")
+
+    if args.list:
+        print("Sheet:", ", ".join(sheets))
+        print("UNIT :", ", ".join(str(u).strip() for u in list_units(df)))
+        return 0
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    include_signature = not args.no_signature
+    page = PageContent(header=args.header, footer=args.footer)
+    if args.signature_file:
+        with open(args.signature_file, encoding="utf-8") as f:
+            page = page._replace(signature=tuple(f.read().splitlines()))
+
+    if args.unit.lower() == ALL_UNITS:
+        exports = iter_unit_exports(df, sheet, include_signature, args.format, args.jobs, page)
+        for unit, files, seconds, done, total in exports:
+            print(f"[{done}/{total}] {str(unit).strip()} ({seconds:.2f} dtk)")
+            for name, data in files.items():
+                _write(args.output_dir, name, data)
+    else:
+        unit = None if args.unit == SEMUA else _resolve_unit(parser, df, args.unit)
+        unit_name = SEMUA if unit is None else unit
+        part = filter_unit(df, unit)
+        stem = file_stem(unit_name)
+        start = time.perf_counter()
+        if "xlsx" in args.format:
+            _write(args.output_dir, f"Rincian_{stem}.xlsx", generate_excel(part))
+        if "pdf" in args.format:
+            _write(args.output_dir, f"Rincian_{stem}.pdf",
+                   generate_pdf(part, sheet, unit_name, total_akun(part), include_signature, page))
+        print(f"{str(unit_name).strip()}: {len(part)} baris ({time.perf_counter() - start:.2f} dtk)")
+
+    if args.rekap:
+        grp = rekap_per_unit(df)
+        if "xlsx" in args.format:
+            _write(args.output_dir, "Rekap_Per_Unit.xlsx", generate_rekap_excel(grp))
+        if "pdf" in args.format:
+            _write(args.output_dir, "Rekap_Per_Unit.pdf", generate_rekap_pdf(grp, sheet))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
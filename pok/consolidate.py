@@ -0,0 +1,77 @@
+"""Gabungan semua sheet workbook: dimuat paralel, rekap per UNIT berdampingan."""
+import os
+from concurrent.futures import as_completed
+
+import pandas as pd
+
+from .batch import process_pool
+from .data import KELAS_COL
+from .ingest import IngestBudget, load_sheet_within
+
+SHEET_COL = "SHEET"
+
+
+def _load_timed(source, sheet_name, budget):
+    frame, report = load_sheet_within(source, sheet_name, budget)
+    return sheet_name, frame, report
+
+
+def iter_sheet_loads(source, sheets, max_workers=None, budget=IngestBudget()):
+    """Muat beberapa sheet sekaligus, satu sheet per proses (process pool).
+
+    Parse sheet terikat CPU (GIL), jadi dipakai proses, bukan thread; waktu
+    total mendekati sheet paling lambat. source: path atau bytes file.
+    Menghasilkan (sheet, DataFrame bersih, IngestReport, selesai, total)
+    begitu sebuah sheet selesai; tiap sheet dibatasi budget (pok.ingest).
+    Jumlah proses = max_workers (default jumlah CPU), tidak lebih dari
+    jumlah sheet; tiap proses menerima salinan source.
+    """
+    sheets = list(sheets)
+    workers = min(len(sheets), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        for done, sheet in enumerate(sheets, start=1):
+            yield _load_timed(source, sheet, budget) + (done, len(sheets))
+        return
+    with process_pool(workers) as pool:
+        futures = [pool.submit(_load_timed, source, sheet, budget) for sheet in sheets]
+        for done, future in enumerate(as_completed(futures), start=1):
+            yield future.result() + (done, len(sheets))
+
+
+def load_sheets(source, sheets, max_workers=None, budget=IngestBudget()):
+    """{sheet: DataFrame} dalam urutan sheets (lihat iter_sheet_loads)."""
+    frames = {sheet: frame for sheet, frame, *_ in iter_sheet_loads(source, sheets, max_workers, budget)}
+    return {sheet: frames[sheet] for sheet in sheets}
+
+
+def tag_sheets(frames, columns=None):
+    """Satukan {sheet: DataFrame} jadi satu frame dengan kolom SHEET (categorical, urut sheet)."""
+    parts = []
+    for sheet, frame in frames.items():
+        part = frame if columns is None else frame[columns]
+        parts.append(part.assign(**{SHEET_COL: sheet}))
+    tagged = pd.concat(parts, ignore_index=True)
+    tagged[SHEET_COL] = pd.Categorical(tagged[SHEET_COL], categories=list(frames))
+    return tagged
+
+
+def rekap_sheets(frames):
+    """Total akun 6 digit per UNIT (baris) untuk setiap sheet (kolom).
+
+    Kolom "Selisih <sheet>" = total sheet itu dikurangi sheet sebelumnya.
+    UNIT urut kemunculan pertama di sheet-sheet; unit yang tidak punya baris
+    akun di suatu sheet bernilai 0.
+    """
+    tagged = tag_sheets(frames, ["UNIT", "JUMLAH", KELAS_COL])
+    tagged["UNIT"] = tagged["UNIT"].astype(str)
+    tagged["JUMLAH"] = pd.to_numeric(tagged["JUMLAH"], errors="coerce").fillna(0)
+    six = tagged[tagged[KELAS_COL] == "six"]
+    totals = six.groupby(["UNIT", SHEET_COL], sort=False, observed=False)["JUMLAH"].sum().unstack(SHEET_COL)
+
+    sheets = list(frames)
+    table = totals.reindex(index=tagged["UNIT"].unique(), columns=sheets).fillna(0)
+    table.index.name = "UNIT"
+    table.columns = list(table.columns)
+    for prev, sheet in zip(sheets, sheets[1:]):
+        table[f"Selisih {sheet}"] = table[sheet] - table[prev]
+    return table.reset_index()
@@ -0,0 +1,285 @@
+"""Muat dan bersihkan sheet POK, serta klasifikasi baris menurut KODE."""
+import io
+import zipfile
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from .xlsx import XlsxReader
+
+# Kolom wajib
+wajib = ["UNIT","MAK","KODE","URAIAN","VOL","SAT","HARGA","JUMLAH","RO","SD"]
+
+# Kolom bantu (bukan untuk ditampilkan/diekspor) berisi kelas baris menurut KODE:
+# - empty   : KODE kosong
+# - text    : KODE mengandung huruf (atau bukan angka murni)
+# - six     : KODE tepat 6 digit (kode akun)
+# - numeric : KODE angka lainnya
+KELAS_COL = "_KELAS_KODE"
+KODE_KELAS = ["empty", "text", "six", "numeric"]
+
+NUMERIC_COLS = ["VOL", "HARGA", "JUMLAH"]
+TEXT_COLS = [c for c in wajib if c not in NUMERIC_COLS]
+# Kolom teks berkardinalitas rendah disimpan sebagai categorical (satu kode
+# int8/int16 per baris + daftar nilai unik); URAIAN tetap string
+CATEGORY_COLS = ["UNIT", "MAK", "KODE", "SAT", "RO", "SD"]
+
+# Header dicari di beberapa baris teratas (sheet kadang diawali judul)
+HEADER_SCAN_ROWS = 20
+# Jumlah baris per potongan saat membangun frame dari baris sheet
+READ_CHUNK_ROWS = 10000
+# Nilai yang dianggap kosong, sama dengan default na_values pd.read_excel.
+# Sel error (#DIV/0!, ...) kosong lewat XlsxReader(errors_as_none=True); teks
+# yang kebetulan berbunyi kode error tetap teks, seperti pd.read_excel
+NA_STRINGS = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+])
+
+
+def classify_kode(kode):
+    """Klasifikasi KODE sekali jalan (vektor) -> Series categorical KODE_KELAS."""
+    if isinstance(kode.dtype, pd.CategoricalDtype):
+        # Cukup klasifikasi nilai unik, lalu petakan lewat kode kategori (NaN -> empty)
+        per_value = classify_kode(pd.Series(kode.cat.categories, dtype=object)).cat.codes.to_numpy()
+        codes = kode.cat.codes.to_numpy()
+        kelas = np.where(codes >= 0, per_value[codes], KODE_KELAS.index("empty"))
+        return pd.Series(pd.Categorical.from_codes(kelas, categories=KODE_KELAS), index=kode.index, name=KELAS_COL)
+    kode = kode.fillna("").astype(str).str.strip()
+    is_digit = kode.str.fullmatch(r"\d+").fillna(False).to_numpy(dtype=bool)
+    kelas = np.select(
+        [
+            (kode == "").to_numpy(dtype=bool),
+            kode.str.contains(r"[A-Za-z]", regex=True).fillna(False).to_numpy(dtype=bool),
+            is_digit & (kode.str.len() == 6).to_numpy(dtype=bool),
+            is_digit,
+        ],
+        ["empty", "text", "six", "numeric"],
+        default="text",
+    )
+    return pd.Series(pd.Categorical(kelas, categories=KODE_KELAS), index=kode.index, name=KELAS_COL)
+
+
+def kelas_kode(dataframe):
+    # Pakai kolom hasil load bila ada; hitung ulang hanya untuk frame lain
+    if KELAS_COL in dataframe.columns:
+        return dataframe[KELAS_COL]
+    return classify_kode(dataframe["KODE"])
+
+
+def _excel_source(source):
+    # Sumber workbook: bytes hasil upload atau path file di disk
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    return source
+
+
+def _is_xlsx(source):
+    return zipfile.is_zipfile(_excel_source(source))
+
+
+def sheet_names(source):
+    # Nama sheet cukup dari workbook.xml, tanpa memuat style/isi sheet
+    if _is_xlsx(source):
+        with XlsxReader(_excel_source(source)) as reader:
+            return reader.sheet_names
+    return pd.ExcelFile(_excel_source(source)).sheet_names
+
+
+def _text_value(value):
+    # Nilai sel -> string seperti pd.read_excel(dtype=str); kosong -> ""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    value = str(value)
+    return "" if value in NA_STRINGS else value
+
+
+def _numeric_value(value):
+    # Angka dipakai langsung; teks diserahkan ke pd.to_numeric
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value in NA_STRINGS:
+        return None
+    return value
+
+
+def _find_header(rows):
+    # Baris pertama yang memuat sebagian besar nama kolom wajib; default baris pertama
+    for i, row in enumerate(rows):
+        names = {str(v).strip() for v in row if v is not None}
+        if len(names.intersection(wajib)) * 2 >= len(wajib):
+            return i
+    return 0
+
+
+def read_sheet(source, sheet_name):
+    """Baca hanya kolom wajib dari sheet; VOL/HARGA/JUMLAH langsung numerik.
+
+    Baris dialirkan dari XML sheet (lihat pok.xlsx) dan sel di luar kolom
+    wajib tidak pernah diurai. File non-xlsx memakai pd.read_excel.
+    """
+    chunks = list(iter_sheet_chunks(source, sheet_name))
+    if len(chunks) == 1:
+        return chunks[0]
+    return pd.concat(chunks, ignore_index=True)
+
+
+def iter_sheet_chunks(source, sheet_name, chunk_rows=READ_CHUNK_ROWS):
+    """Frame mentah sheet per potongan chunk_rows baris (minimal satu frame).
+
+    Pemanggil boleh berhenti kapan saja (mis. batas baris/memori, lihat
+    pok.ingest); sisa sheet tidak diurai. File non-xlsx = satu potongan.
+    """
+    if not _is_xlsx(source):
+        yield pd.read_excel(_excel_source(source), sheet_name=sheet_name, dtype=str)
+        return
+
+    with XlsxReader(_excel_source(source), errors_as_none=True) as reader:
+        head = list(islice(reader.iter_rows(sheet_name), HEADER_SCAN_ROWS))
+        header_at = _find_header(head)
+        header = [None if v is None else str(v).strip() for v in head[header_at]] if head else []
+
+        # Posisi kolom wajib (kemunculan pertama); kolom yang tidak ada tetap kosong
+        positions = {}
+        for i, name in enumerate(header):
+            if name in wajib and name not in positions:
+                positions[name] = i
+        rows = islice(reader.iter_rows(sheet_name, [positions.get(c, -1) for c in wajib]), header_at + 1, None)
+        # Dikonversi per potongan: objek Python per sel hanya hidup untuk satu
+        # potongan, bukan seluruh sheet (puncak memori ~ ukuran frame akhir)
+        first = True
+        while True:
+            batch = list(islice(rows, chunk_rows))
+            if not batch and not first:
+                break
+            first = False
+            yield _rows_frame(batch)
+            if len(batch) < chunk_rows:
+                break
+
+
+def _rows_frame(rows):
+    columns = list(zip(*rows)) or [()] * len(wajib)
+    data = {}
+    for col, values in zip(wajib, columns):
+        if col in NUMERIC_COLS:
+            data[col] = pd.to_numeric(pd.Series([_numeric_value(v) for v in values], dtype=object),
+                                      errors="coerce")
+        else:
+            data[col] = pd.Series([_text_value(v) for v in values])
+    return pd.DataFrame(data, columns=wajib)
+
+
+def clean_sheet(df):
+    # Perbaikan data dasar: kolom wajib
+    df = df.reindex(columns=wajib)
+
+    # Bersihkan None dan NaN (kolom teks)
+    df[TEXT_COLS] = df[TEXT_COLS].replace(["None", "none", "NONE"], "").fillna("")
+
+    # Konversi angka (no-op bila read_sheet sudah memberi kolom numerik)
+    for col in NUMERIC_COLS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    for col in CATEGORY_COLS:
+        df[col] = df[col].astype("category")
+    _release_arrow_memory()
+
+    df[KELAS_COL] = classify_kode(df["KODE"])
+    return df
+
+
+def load_sheet(source, sheet_name):
+    return clean_sheet(read_sheet(source, sheet_name))
+
+
+def _release_arrow_memory():
+    # Kolom string pandas memakai pyarrow bila terpasang; pool-nya menahan
+    # memori sementara dari load (potongan, concat) sampai diminta dilepas
+    try:
+        import pyarrow
+    except ImportError:
+        return
+    pyarrow.default_memory_pool().release_unused()
+
+
+def list_units(dataframe):
+    # UNIT yang tidak kosong, urut sesuai kemunculan di sheet
+    units = dataframe["UNIT"]
+    return units[units != ""].unique().tolist()
+
+
+def filter_unit(dataframe, unit):
+    # None berarti seluruh sheet ("Semua")
+    if unit is None:
+        return dataframe
+    return dataframe[dataframe["UNIT"] == unit]
+
+
+def total_akun(dataframe):
+    # Total anggaran = jumlah JUMLAH pada baris kode akun 6 digit
+    return dataframe.loc[kelas_kode(dataframe) == "six", "JUMLAH"].sum()
+
+
+class UnitIndex:
+    """Posisi baris dan total akun 6 digit per UNIT, dihitung sekali per dataset.
+
+    Ganti unit cukup mengambil posisi barisnya (O(baris unit)) dan total
+    anggaran berupa lookup; sheet tidak dipindai ulang setiap interaksi.
+    """
+
+    def __init__(self, dataframe):
+        units = dataframe["UNIT"].astype("category")
+        codes = units.cat.codes.to_numpy()
+        categories = units.cat.categories
+        # Urutan stabil: posisi di dalam tiap UNIT tetap urut seperti di sheet
+        order = np.argsort(codes, kind="stable").astype(np.int32)
+        bounds = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+        self.positions = {unit: order[bounds[i]:bounds[i + 1]] for i, unit in enumerate(categories)}
+        self.units = list_units(dataframe)
+
+        six = (kelas_kode(dataframe) == "six").to_numpy()
+        jumlah = dataframe["JUMLAH"][six]
+        per_unit = jumlah.groupby(codes[six]).sum()
+        # Unit tanpa baris akun: nol bertipe sama dengan hasil sum (int/float)
+        self._zero = jumlah.iloc[:0].sum()
+        self.totals = {unit: per_unit.get(i, self._zero) for i, unit in enumerate(categories)}
+        self.total = jumlah.sum()
+
+    @property
+    def nbytes(self):
+        return sum(p.nbytes for p in self.positions.values())
+
+    def rows(self, dataframe, unit):
+        # Sama dengan filter_unit(dataframe, unit); None = seluruh sheet
+        if unit is None:
+            return dataframe
+        return dataframe.iloc[self.positions.get(unit, np.empty(0, dtype=np.int32))]
+
+    def total_akun(self, unit=None):
+        # Sama dengan total_akun(filter_unit(dataframe, unit))
+        if unit is None:
+            return self.total
+        return self.totals.get(unit, self._zero)
+
+
+def memory_footprint(value):
+    """Perkiraan byte yang dipakai value (DataFrame/Series, bytes, objek ber-nbytes, atau tuple/list/dict darinya)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(memory_footprint(v) for v in value.values())
+    if isinstance(value, (tuple, list)):
+        return sum(memory_footprint(v) for v in value)
+    return 0
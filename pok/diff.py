@@ -0,0 +1,110 @@
+"""Selisih dua versi sheet POK (revisi): baris tambah/hapus/ubah dan total per UNIT."""
+import numpy as np
+import pandas as pd
+
+from .consolidate import rekap_sheets
+from .data import NUMERIC_COLS
+
+DIFF_KEYS = ["UNIT", "MAK", "KODE", "URAIAN"]
+STATUS_COL = "STATUS"
+STATUS_ADDED, STATUS_REMOVED, STATUS_CHANGED = "tambah", "hapus", "ubah"
+
+
+def _keyed(dataframe):
+    # _key = hash 64-bit (UNIT, MAK, KODE, URAIAN); _full = hash kunci + nilai
+    key = pd.util.hash_pandas_object(dataframe[DIFF_KEYS], index=False).to_numpy()
+    keyed = pd.DataFrame({"_key": key, "_pos": np.arange(len(dataframe))})
+    for col in NUMERIC_COLS:
+        keyed[col] = pd.to_numeric(dataframe[col], errors="coerce").to_numpy()
+    keyed["_full"] = pd.util.hash_pandas_object(keyed[["_key"] + NUMERIC_COLS], index=False).to_numpy()
+    return keyed
+
+
+def _pair(left, right, key, **merge_args):
+    # Baris berkunci sama dipasangkan ke-n dengan ke-n (urutan kemunculan)
+    left = left.assign(_occ=left.groupby(key, sort=False).cumcount())
+    right = right.assign(_occ=right.groupby(key, sort=False).cumcount())
+    return left.merge(right, on=[key, "_occ"], suffixes=("_old", "_new"), sort=False, **merge_args)
+
+
+def diff_sheets(old, new):
+    """Baris yang berubah dari old ke new (DataFrame hasil load_sheet).
+
+    Baris dipasangkan lewat hash (UNIT, MAK, KODE, URAIAN) dengan hash join,
+    bukan perbandingan bersarang: baris identik (kunci dan nilai) dipasangkan
+    lebih dulu, sisanya per kunci sehingga kunci ganda tidak menggeser
+    pasangan. Hasil: STATUS (tambah/hapus/ubah), kolom kunci, lalu
+    "<kolom> LAMA", "<kolom> BARU" dan "SELISIH <kolom>" untuk
+    VOL/HARGA/JUMLAH. Urut seperti sheet baru; baris yang dihapus diletakkan
+    sesudah baris pasangan terakhir sebelum posisinya di sheet lama.
+    """
+    keyed_old, keyed_new = _keyed(old), _keyed(new)
+    same = _pair(keyed_old[["_full", "_pos"]], keyed_new[["_full", "_pos"]], "_full")
+    rest_old = np.ones(len(old), dtype=bool)
+    rest_old[same["_pos_old"].to_numpy()] = False
+    rest_new = np.ones(len(new), dtype=bool)
+    rest_new[same["_pos_new"].to_numpy()] = False
+    columns = ["_key", "_pos"] + NUMERIC_COLS
+    merged = _pair(keyed_old.loc[rest_old, columns], keyed_new.loc[rest_new, columns], "_key",
+                   how="outer", indicator=True)
+
+    side = merged["_merge"].to_numpy()
+    added = side == "right_only"
+    removed = side == "left_only"
+    pos_old = merged["_pos_old"].to_numpy()
+    pos_new = merged["_pos_new"].to_numpy()
+
+    # Urutan: posisi di sheet baru; baris terhapus mengikuti pasangan
+    # terakhir sebelum posisinya di sheet lama (-1 = sebelum baris pertama)
+    paired = ~(added | removed)
+    paired_old = np.concatenate([same["_pos_old"].to_numpy(), pos_old[paired]])
+    paired_new = np.concatenate([same["_pos_new"].to_numpy(), pos_new[paired]])
+    by_old = np.argsort(paired_old)
+    order = pos_new.copy()
+    before = np.searchsorted(paired_old[by_old], pos_old[removed])
+    order[removed] = np.concatenate(([-1.0], paired_new[by_old]))[before] + 0.5
+    keep = np.lexsort((np.nan_to_num(pos_old), order))
+    merged = merged.iloc[keep]
+    added, removed = added[keep], removed[keep]
+    from_new = ~removed
+
+    result = {STATUS_COL: np.select([added, removed], [STATUS_ADDED, STATUS_REMOVED], STATUS_CHANGED)}
+    # Kolom kunci dari sheet baru, atau dari sheet lama untuk baris terhapus
+    rows_new = pos_new[keep][from_new].astype(np.int64)
+    rows_old = pos_old[keep][removed].astype(np.int64)
+    for col in DIFF_KEYS:
+        values = np.empty(len(keep), dtype=object)
+        values[from_new] = new[col].iloc[rows_new].astype(str).to_numpy()
+        values[removed] = old[col].iloc[rows_old].astype(str).to_numpy()
+        result[col] = values
+    for col in NUMERIC_COLS:
+        a, b = merged[f"{col}_old"].to_numpy(), merged[f"{col}_new"].to_numpy()
+        result[f"{col} LAMA"] = a
+        result[f"{col} BARU"] = b
+        result[f"SELISIH {col}"] = np.nan_to_num(b) - np.nan_to_num(a)
+    lines = pd.DataFrame(result)
+    for col in DIFF_KEYS:
+        lines[col] = lines[col].astype(str)
+    return lines
+
+
+def diff_rekap(old, new):
+    """Total akun 6 digit per UNIT: kolom LAMA, BARU dan SELISIH (logika rekap_sheets)."""
+    table = rekap_sheets({"LAMA": old, "BARU": new})
+    return table.rename(columns={"Selisih BARU": "SELISIH"})
+
+
+def diff_export_frame(lines, deltas=NUMERIC_COLS):
+    """Baris diff dalam bentuk tabel rincian untuk generate_excel/generate_pdf.
+
+    VOL/HARGA/JUMLAH berisi nilai baru (nilai lama untuk baris terhapus),
+    diikuti kolom "SELISIH <kolom>" untuk kolom di deltas (PDF landscape
+    cukup lebar untuk SELISIH JUMLAH saja).
+    """
+    removed = (lines[STATUS_COL] == STATUS_REMOVED).to_numpy()
+    frame = lines[[STATUS_COL] + DIFF_KEYS].copy()
+    for col in NUMERIC_COLS:
+        frame[col] = np.where(removed, lines[f"{col} LAMA"], lines[f"{col} BARU"])
+    for col in deltas:
+        frame[f"SELISIH {col}"] = lines[f"SELISIH {col}"]
+    return frame
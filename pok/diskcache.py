@@ -0,0 +1,151 @@
+"""Cache sheet bersih di disk (Arrow IPC), bertahan antar restart server.
+
+File per (hash isi workbook, sheet) berisi frame hasil clean_sheet dalam
+format Arrow IPC tanpa kompresi, sehingga dibaca dengan memory-map (tanpa
+parse/decode). Ukuran folder dibatasi; file paling lama tidak dipakai
+(mtime, disentuh setiap hit) dibuang lebih dulu. Butuh pyarrow; tanpa
+pyarrow cache tidak aktif (lihat HAS_PYARROW).
+
+Isi cache adalah data anggaran, jadi foldernya privat: dibuat dengan mode
+0700, harus milik pengguna proses, dan izin group/other dicabut.
+"""
+import hashlib
+import logging
+import os
+import stat
+import threading
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+HAS_PYARROW = pa is not None
+
+# Naikkan bila keluaran clean_sheet berubah (kolom, dtype, pembersihan):
+# file versi lain diabaikan lalu dibuang saat eviction
+SCHEMA_VERSION = 2
+CACHE_SUFFIX = ".arrow"
+
+logger = logging.getLogger("pok.diskcache")
+
+
+def _private_directory(directory):
+    # Folder di lokasi bersama (mis. /tmp) bisa sudah dibuat pengguna lain:
+    # tolak bila bukan folder milik kita, dan cabut izin group/other
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"folder cache {directory} bukan folder")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise PermissionError(f"folder cache {directory} milik pengguna lain (uid {info.st_uid})")
+    if info.st_mode & 0o077:
+        os.chmod(directory, 0o700)
+
+
+class SheetDiskCache:
+    """Folder cache dibatasi max_bytes dengan eviction LRU (mtime)."""
+
+    def __init__(self, directory, max_bytes):
+        if not HAS_PYARROW:
+            raise ImportError("SheetDiskCache membutuhkan pyarrow")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        _private_directory(directory)
+
+    def path(self, file_hash, sheet_name):
+        sheet_key = hashlib.sha1(str(sheet_name).encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{file_hash}-{sheet_key}-v{SCHEMA_VERSION}{CACHE_SUFFIX}")
+
+    def load(self, file_hash, sheet_name):
+        """DataFrame dari cache (memory-map), atau None bila belum ada/rusak."""
+        path = self.path(file_hash, sheet_name)
+        try:
+            reader = pa.ipc.open_file(pa.memory_map(path))
+            table = reader.read_all()
+            if (table.schema.metadata or {}).get(b"pok_sheet") != str(sheet_name).encode():
+                raise ValueError("sheet tidak cocok")
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, pa.ArrowException) as exc:
+            logger.warning("cache %s tidak terbaca (%s), dibuang", path, exc)
+            self._remove(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return table.to_pandas()
+
+    def save(self, file_hash, sheet_name, dataframe):
+        path = self.path(file_hash, sheet_name)
+        table = pa.Table.from_pandas(dataframe, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[b"pok_sheet"] = str(sheet_name).encode()
+        metadata[b"pok_schema_version"] = str(SCHEMA_VERSION).encode()
+        table = table.replace_schema_metadata(metadata)
+        # Tulis ke file sementara lalu rename: pembaca tidak pernah melihat file setengah jadi
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with pa.OSFile(tmp, "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("gagal menulis cache %s (%s)", path, exc)
+            self._remove(tmp)
+            return
+        self.evict()
+
+    def get_or_load(self, file_hash, sheet_name, loader):
+        dataframe = self.load(file_hash, sheet_name)
+        if dataframe is None:
+            dataframe = loader()
+            self.save(file_hash, sheet_name, dataframe)
+        return dataframe
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(CACHE_SUFFIX):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        # Buang file versi skema lain, lalu yang paling lama tidak dipakai
+        # sampai total ukuran <= max_bytes
+        with self._lock:
+            current = f"-v{SCHEMA_VERSION}{CACHE_SUFFIX}"
+            entries = []
+            for entry in self._entries():
+                if entry[2].endswith(current):
+                    entries.append(entry)
+                else:
+                    self._remove(entry[2])
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if self._remove(path):
+                    total -= size
+
+    def stats(self):
+        entries = self._entries()
+        return {"files": len(entries), "nbytes": sum(size for _, size, _ in entries),
+                "hits": self.hits, "misses": self.misses}
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            # Sudah dihapus proses lain, atau masih di-memory-map (Windows)
+            return False
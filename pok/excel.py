@@ -0,0 +1,100 @@
+"""Ekspor rincian ke Excel (.xlsx)."""
+import io
+
+import numpy as np
+import pandas as pd
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill, Alignment, Font, NamedStyle
+
+from .data import KELAS_COL, kelas_kode
+
+# Baris ditulis secara streaming (openpyxl write-only) dalam potongan
+# EXCEL_CHUNK_ROWS baris, dengan gaya bersama (NamedStyle) sehingga memori
+# puncak tidak bergantung pada jumlah baris.
+EXCEL_CHUNK_ROWS = 5000
+EXCEL_ROW_HEIGHT = 13
+
+
+def _excel_styles(wb):
+    # Satu NamedStyle per kombinasi (isi biru, tebal+miring); indeks = fill + 2*bold
+    align = Alignment(wrap_text=True, vertical="top")
+    row_text_fill = PatternFill(start_color="CCE5FF", fill_type="solid")
+    bold_italic = Font(bold=True, italic=True)
+    names = []
+    for bold in (False, True):
+        for fill in (False, True):
+            style = NamedStyle(name=f"pok_rincian{'_fill' if fill else ''}{'_bold' if bold else ''}", alignment=align)
+            if fill:
+                style.fill = row_text_fill
+            if bold:
+                style.font = bold_italic
+            wb.add_named_style(style)
+            names.append(style.name)
+
+    header = NamedStyle(name="pok_header", font=Font(bold=True),
+                        alignment=Alignment(horizontal="center", vertical="center"),
+                        fill=PatternFill(start_color="E0E0E0", fill_type="solid"))
+    wb.add_named_style(header)
+    return header.name, names
+
+
+def _numeric_cells(series):
+    # Sel yang dianggap angka: kolom numerik, atau teks berupa angka
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return np.ones(len(series), dtype=bool)
+    text = series.astype("string").str.strip()
+    return text.str.fullmatch(r"-?\d+(?:\.\d+)?").fillna(False).to_numpy(dtype=bool)
+
+
+def generate_excel(dataframe):
+    buffer = io.BytesIO()
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("Rincian")
+    header_style, cell_styles = _excel_styles(wb)
+
+    # Tinggi baris data 13pt lewat format default sheet (bukan per baris);
+    # baris header tetap setinggi baris Excel biasa.
+    ws.sheet_format.defaultRowHeight = EXCEL_ROW_HEIGHT
+    ws.sheet_format.customHeight = True
+    ws.row_dimensions[1].height = 15
+
+    # Header
+    cols = [c for c in dataframe.columns if c != KELAS_COL]
+    header_cells = []
+    for col in cols:
+        c = WriteOnlyCell(ws, value=col)
+        c.style = header_style
+        header_cells.append(c)
+    ws.append(header_cells)
+
+    # Data with conditional formatting rules based ONLY on the KODE column:
+    # - If KODE contains alphabetic characters (text) -> fill entire row light blue.
+    # - If KODE is numeric (digits) -> for that row, numeric cells are bold+italic.
+    # - If KODE is 6 digits -> the KODE cell is also filled light blue.
+    # - If KODE is empty -> leave row normal.
+    # Gaya tiap sel dihitung sekaligus (vektor) sebagai indeks ke cell_styles.
+    kelas = kelas_kode(dataframe).to_numpy()
+    row_is_text = kelas == "text"
+    row_is_numeric = (kelas == "six") | (kelas == "numeric")
+    fill = np.repeat(row_is_text[:, None], len(cols), axis=1)
+    if "KODE" in cols:
+        fill[:, cols.index("KODE")] |= kelas == "six"
+    numeric = np.column_stack([_numeric_cells(dataframe[c]) for c in cols])
+    bold = row_is_numeric[:, None] & numeric
+    style_idx = fill.astype(np.int8) + 2 * bold.astype(np.int8)
+
+    data = dataframe[cols]
+    for start in range(0, len(data), EXCEL_CHUNK_ROWS):
+        chunk = data.iloc[start:start + EXCEL_CHUNK_ROWS]
+        chunk_styles = style_idx[start:start + EXCEL_CHUNK_ROWS].tolist()
+        for row, row_styles in zip(chunk.itertuples(index=False, name=None), chunk_styles):
+            cells = []
+            for val, si in zip(row, row_styles):
+                cell = WriteOnlyCell(ws, value=val)
+                cell.style = cell_styles[si]
+                cells.append(cell)
+            ws.append(cells)
+
+    wb.save(buffer)
+    return buffer.getvalue()
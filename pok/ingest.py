@@ -0,0 +1,161 @@
+"""Batas ingest sheet upload: ukuran file, jumlah baris dan memori.
+
+Sheet dibaca per potongan (pok.data.iter_sheet_chunks). Begitu potongan
+berikutnya akan melewati batas baris atau memori, baris yang masih muat
+dari potongan itu diambil lalu pembacaan berhenti (terpotong, dicatat di
+IngestReport). Bila tidak satu baris pun muat, BudgetExceeded.
+File di atas batas ukuran tidak dimuat sebagai rincian; rekap_streamed
+menghitung rekap per UNIT seluruh sheet dengan memori sebesar satu potongan.
+"""
+import os
+import time
+from collections import namedtuple
+
+import pandas as pd
+
+from .data import CATEGORY_COLS, READ_CHUNK_ROWS, clean_sheet, iter_sheet_chunks, memory_footprint, wajib
+from .rekap import rekap_chunks
+
+# Batas dalam byte/baris; None atau 0 = tanpa batas. max_memory dibandingkan
+# dengan perkiraan memori frame mentah yang sudah terbaca.
+IngestBudget = namedtuple("IngestBudget", ["max_bytes", "max_rows", "max_memory"],
+                          defaults=(None, None, None))
+
+
+class BudgetExceeded(ValueError):
+    """File melebihi batas ukuran ingest, atau tidak satu baris sheet pun muat di batas memori."""
+
+
+class IngestReport:
+    """Hasil satu ingest sheet: baris, waktu, throughput dan alasan terpotong."""
+
+    def __init__(self, sheet_name, source_bytes=0):
+        self.sheet = sheet_name
+        self.source_bytes = source_bytes
+        self.rows = 0
+        self.frame_bytes = 0
+        self.seconds = 0.0
+        self.truncated = None  # alasan bila sheet tidak terbaca sampai akhir
+        self.cached = False  # dari cache disk: bukan throughput parse, tanpa baris/dtk
+
+    @property
+    def rows_per_s(self):
+        if self.cached:
+            return None
+        return self.rows / self.seconds if self.seconds else None
+
+    def summary(self):
+        text = f"{self.rows:,} baris".replace(",", ".")
+        if self.cached:
+            text += " dari cache disk"
+        text += f" dalam {self.seconds:.2f} dtk"
+        if self.rows_per_s:
+            rate = f"{self.rows_per_s:,.0f}".replace(",", ".")
+            text += f", {rate} baris/dtk"
+        return text + (f" (terpotong: {self.truncated})" if self.truncated else "")
+
+
+def source_size(source):
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    return os.path.getsize(source)
+
+
+def check_size(source, budget):
+    """Ukuran source dalam byte; BudgetExceeded bila melebihi budget.max_bytes."""
+    size = source_size(source)
+    if budget.max_bytes and size > budget.max_bytes:
+        raise BudgetExceeded(f"File {size / 2**20:.1f} MB melebihi batas {budget.max_bytes / 2**20:g} MB")
+    return size
+
+
+def _raw_footprint(frame):
+    # Memori frame bersih bila masih berbentuk frame mentah (kolom wajib,
+    # teks sebagai str), sama dengan yang diukur dari potongan mentah
+    return memory_footprint(frame[wajib].astype({col: str for col in CATEGORY_COLS}))
+
+
+def _take_within(chunks, budget, report, measure=memory_footprint):
+    """Potongan dari chunks sampai batas baris/memori; mengisi rows, frame_bytes dan truncated di report.
+
+    Potongan yang melewati batas memori dipotong per baris (rata-rata byte
+    per baris potongan itu). BudgetExceeded bila tidak satu baris pun muat.
+    """
+    taken = []
+    for chunk in chunks:
+        if budget.max_rows and report.rows + len(chunk) > budget.max_rows:
+            chunk = chunk.iloc[:budget.max_rows - report.rows]
+            report.truncated = f"batas {budget.max_rows:,} baris".replace(",", ".")
+        nbytes = measure(chunk)
+        if budget.max_memory and report.frame_bytes + nbytes > budget.max_memory:
+            report.truncated = f"batas memori {budget.max_memory / 2**20:g} MB"
+            room = budget.max_memory - report.frame_bytes
+            fit = int(room / (nbytes / len(chunk)))
+            # Rata-rata bisa meleset sedikit: kurangi sampai benar-benar muat
+            while fit > 0 and measure(chunk.iloc[:fit]) > room:
+                fit -= max(1, fit // 20)
+            chunk = chunk.iloc[:max(fit, 0)]
+            nbytes = measure(chunk)
+        taken.append(chunk)
+        report.rows += len(chunk)
+        report.frame_bytes += nbytes
+        if report.truncated:
+            break
+    if report.truncated and not report.rows:
+        raise BudgetExceeded(f"Sheet {report.sheet}: tidak satu baris pun muat di {report.truncated}")
+    return taken
+
+
+def read_sheet_within(source, sheet_name, budget=IngestBudget()):
+    """(frame mentah, IngestReport): seperti read_sheet, berhenti di batas baris/memori."""
+    report = IngestReport(sheet_name, source_size(source))
+    start = time.perf_counter()
+    reader = iter_sheet_chunks(source, sheet_name)
+    try:
+        chunks = _take_within(reader, budget, report)
+    finally:
+        # Sisa sheet tidak diurai; tutup reader workbook sekarang
+        reader.close()
+    frame = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+    report.seconds = time.perf_counter() - start
+    return frame, report
+
+
+def load_sheet_within(source, sheet_name, budget=IngestBudget()):
+    """(DataFrame bersih, IngestReport); waktu di report termasuk clean_sheet."""
+    start = time.perf_counter()
+    raw, report = read_sheet_within(source, sheet_name, budget)
+    frame = clean_sheet(raw)
+    report.seconds = time.perf_counter() - start
+    return frame, report
+
+
+def fit_budget(frame, sheet_name, budget=IngestBudget(), source_bytes=0):
+    """(frame, IngestReport) untuk frame bersih yang tidak dibaca lewat budget (mis. cache disk).
+
+    Dipotong di baris yang sama dengan read_sheet_within: diukur per
+    READ_CHUNK_ROWS baris sebagai frame mentah (lihat _raw_footprint).
+    """
+    report = IngestReport(sheet_name, source_bytes)
+    start = time.perf_counter()
+    chunks = (frame.iloc[i:i + READ_CHUNK_ROWS] for i in range(0, len(frame), READ_CHUNK_ROWS))
+    _take_within(chunks, budget, report, _raw_footprint)
+    if report.truncated:
+        frame = frame.iloc[:report.rows]
+    report.seconds = time.perf_counter() - start
+    return frame, report
+
+
+def rekap_streamed(source, sheet_name):
+    """(rekap_per_unit seluruh sheet, IngestReport) tanpa menyimpan baris rincian."""
+    report = IngestReport(sheet_name, source_size(source))
+    start = time.perf_counter()
+
+    def cleaned_chunks():
+        for chunk in iter_sheet_chunks(source, sheet_name):
+            report.rows += len(chunk)
+            yield clean_sheet(chunk)
+
+    grp = rekap_chunks(cleaned_chunks())
+    report.seconds = time.perf_counter() - start
+    return grp, report
@@ -0,0 +1,230 @@
+"""Antrian job ekspor latar belakang (Excel/PDF) di process pool.
+
+Script Streamlit hanya mengirim job lalu lanjut; job dijalankan di proses
+terpisah (tidak berebut GIL dengan sesi lain) dengan jumlah worker dan
+panjang antrian terbatas. Job berkunci sama (mis. hash file, sheet, unit)
+hanya dibangun sekali dan hasilnya dibagi semua sesi. Job besar (mis. ZIP
+semua unit) dapat dipecah menjadi bagian yang dibangun paralel di worker
+yang kosong; progresnya = bagian selesai / total bagian.
+"""
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures.process import BrokenProcessPool
+
+from .batch import process_pool
+from .data import memory_footprint
+
+JOB_WAITING, JOB_RUNNING, JOB_DONE, JOB_FAILED = "menunggu", "berjalan", "selesai", "gagal"
+
+logger = logging.getLogger("pok.jobs")
+
+
+class ExportQueueFull(RuntimeError):
+    """Antrian job ekspor penuh; coba lagi setelah job lain selesai."""
+
+
+class ExportJob:
+    def __init__(self, job_id, key, label, kind, rows, calls, combine=None):
+        self.id = job_id
+        self.key = key
+        self.label = label
+        self.kind = kind
+        self.rows = rows
+        self.status = JOB_WAITING
+        self.submitted = time.monotonic()
+        self.started = self.finished = None
+        self.result = None
+        self.error = None
+        self.parts_total = len(calls)
+        self.parts_done = 0
+        self._calls = deque(enumerate(calls))  # (indeks, (func, args)) yang belum dikirim
+        self._results = [None] * len(calls)
+        self._combine = combine  # hasil bagian (urut) -> result; None = hasil bagian tunggal
+
+    @property
+    def seconds(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.monotonic()) - self.started
+
+    @property
+    def nbytes(self):
+        return memory_footprint(self.result)
+
+
+class ExportQueue:
+    """Antrian FIFO di depan process pool berisi max_workers proses.
+
+    Job (atau satu bagiannya) dikirim ke pool hanya bila ada worker kosong,
+    sehingga posisi antrian dan status tiap job selalu pasti. Paling banyak
+    max_pending job menunggu; max_finished hasil terakhir disimpan untuk
+    diunduh.
+    """
+
+    def __init__(self, max_workers=2, max_pending=8, max_finished=16):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._pool = None
+        self._ids = itertools.count(1)
+        self._waiting = deque()  # job yang masih punya bagian belum dikirim
+        self._running = {}
+        self._busy = 0  # bagian yang sedang di pool (<= max_workers)
+        self._jobs = OrderedDict()  # kunci -> job (menunggu, berjalan, selesai)
+        self._seconds_per_row = {}  # kind -> perkiraan detik per baris (untuk progres)
+        # RLock: callback future bisa dipanggil langsung dari dalam submit
+        self._lock = threading.RLock()
+
+    def submit(self, key, label, func, *args, kind=None, rows=0):
+        """Kirim func(*args) sebagai job; job berkunci sama yang belum gagal dipakai ulang."""
+        return self.submit_parts(key, label, [(func, args)], kind=kind, rows=rows)
+
+    def submit_parts(self, key, label, calls, combine=None, kind=None, rows=0):
+        """Kirim job berisi beberapa bagian calls = [(func, args), ...].
+
+        Bagian-bagian dibangun paralel di worker yang kosong (bagian job
+        yang lebih dulu masuk didahulukan); setelah semuanya selesai, hasil
+        job = combine([hasil bagian, urut calls]), dijalankan di proses ini.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status != JOB_FAILED:
+                self._jobs.move_to_end(key)
+                return job
+            if sum(waiting.status == JOB_WAITING for waiting in self._waiting) >= self.max_pending:
+                raise ExportQueueFull(f"Antrian ekspor penuh ({self.max_pending} job menunggu)")
+            job = ExportJob(next(self._ids), key, label, kind, rows, calls, combine)
+            self._jobs[key] = job
+            if calls:
+                self._waiting.append(job)
+                self._dispatch()
+            else:
+                job.started = time.monotonic()
+                self._complete(job)
+            self._trim()
+        return job
+
+    def _dispatch(self):
+        # Dipanggil dengan self._lock
+        while self._waiting and self._busy < self.max_workers:
+            job = self._waiting[0]
+            index, (func, args) = job._calls.popleft()
+            if not job._calls:
+                self._waiting.popleft()
+            if job.status == JOB_WAITING:
+                job.status = JOB_RUNNING
+                job.started = time.monotonic()
+                self._running[job.id] = job
+            self._busy += 1
+            try:
+                if self._pool is None:
+                    self._pool = process_pool(self.max_workers)
+                pool = self._pool
+                future = pool.submit(func, *args)
+            except (BrokenProcessPool, RuntimeError) as exc:
+                self._drop_pool(self._pool)
+                self._part_done(job, index, None, exc)
+                continue
+            future.add_done_callback(lambda f, job=job, index=index, pool=pool: self._part_done(job, index, f, pool=pool))
+
+    def _part_done(self, job, index, future, error=None, pool=None):
+        with self._lock:
+            self._busy -= 1
+            try:
+                if error is not None:
+                    raise error
+                result = future.result()
+            except Exception as exc:
+                if isinstance(exc, BrokenProcessPool):
+                    self._drop_pool(pool)
+                if job.status == JOB_RUNNING:
+                    self._fail(job, exc)
+            else:
+                # Job yang sudah gagal (bagian lain) mengabaikan hasil ini
+                if job.status == JOB_RUNNING:
+                    job._results[index] = result
+                    job.parts_done += 1
+                    if job.parts_done == job.parts_total:
+                        self._complete(job)
+            self._dispatch()
+            self._trim()
+
+    def _complete(self, job):
+        # Dipanggil dengan self._lock setelah semua bagian selesai
+        try:
+            results, job._results = job._results, None
+            job.result = job._combine(results) if job._combine is not None else results[0]
+        except Exception as exc:
+            self._fail(job, exc)
+            return
+        self._running.pop(job.id, None)
+        job.finished = time.monotonic()
+        job.status = JOB_DONE
+        if job.rows:
+            rate = job.seconds / job.rows
+            old = self._seconds_per_row.get(job.kind)
+            self._seconds_per_row[job.kind] = rate if old is None else 0.5 * old + 0.5 * rate
+
+    def _fail(self, job, exc):
+        # Dipanggil dengan self._lock. Bagian yang belum dikirim dibatalkan;
+        # bagian yang sedang berjalan dibiarkan selesai lalu diabaikan.
+        self._running.pop(job.id, None)
+        if job._calls:
+            job._calls.clear()
+            self._waiting.remove(job)
+        job._results = None
+        job.finished = time.monotonic()
+        job.status = JOB_FAILED
+        job.error = f"{type(exc).__name__}: {exc}"
+        logger.warning("job ekspor %s gagal: %s", job.label, job.error)
+
+    def _drop_pool(self, pool):
+        # Dipanggil dengan self._lock. Pool rusak (worker mati) ditutup dan
+        # diganti saat dispatch berikutnya; job lain dari pool yang sama ikut
+        # gagal, tetapi tidak menutup pool pengganti.
+        if pool is None or pool is not self._pool:
+            return
+        self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _trim(self):
+        # Dipanggil dengan self._lock; buang hasil selesai/gagal paling lama
+        finished = [key for key, job in self._jobs.items() if job.status in (JOB_DONE, JOB_FAILED)]
+        for key in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[key]
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def position(self, job):
+        """Posisi di antrian (1 = berikutnya), 0 bila tidak menunggu."""
+        with self._lock:
+            waiting = [queued for queued in self._waiting if queued.status == JOB_WAITING]
+            for i, queued in enumerate(waiting, start=1):
+                if queued is job:
+                    return i
+        return 0
+
+    def progress(self, job):
+        """Perkiraan progres 0..1 dari lama berjalan dan kecepatan job sejenis sebelumnya; None bila belum ada acuan."""
+        if job.status in (JOB_DONE, JOB_FAILED):
+            return 1.0
+        if job.status == JOB_WAITING:
+            return 0.0
+        if job.parts_total > 1:
+            return job.parts_done / job.parts_total
+        rate = self._seconds_per_row.get(job.kind)
+        if rate is None or not job.rows:
+            return None
+        return min(0.95, job.seconds / (rate * job.rows))
+
+    def stats(self):
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+            return {"waiting": statuses.count(JOB_WAITING), "running": statuses.count(JOB_RUNNING),
+                    "finished": statuses.count(JOB_DONE) + statuses.count(JOB_FAILED),
+                    "nbytes": sum(job.nbytes for job in self._jobs.values())}
@@ -0,0 +1,325 @@
+"""Uji beban dashboard: N sesi AppTest atas pok.online.py.
+
+    python -m pok.loadtest --sessions 1 4 8 -o load.json
+    python -m pok.loadtest --sessions 4 --rows 20000 --distinct --processes
+
+Tiap sesi: unggah workbook, pindah beberapa UNIT, siapkan ekspor Excel/PDF
+lalu rerun sampai tombol download muncul. Dua mode:
+
+- default (thread): semua sesi di satu proses dan berbagi cache proses
+  (DatasetStore, st.cache_resource) seperti sesi pada satu server. AppTest
+  tidak dapat menjalankan dua rerun bersamaan, jadi rerun dijalankan
+  bergiliran: hasilnya biaya per rerun saat cache dibagi dan memori
+  proses, bukan kapasitas sesi bersamaan (rerun/dtk ~ 1 / rata-rata rerun).
+  Waktu tunggu giliran dilaporkan terpisah dari latensi rerun.
+- --processes: tiap sesi di proses sendiri, rerun benar-benar bersamaan,
+  tetapi tiap proses punya cache proses sendiri (hanya cache disk dibagi);
+  mirip N server satu sesi, bukan satu server dengan N sesi.
+
+Server `streamlit run` sungguhan dengan banyak klien tidak diukur di sini.
+Per jumlah sesi dilaporkan latensi rerun p50/p95, tunggu giliran,
+rerun/dtk dan memori (RSS; worker ekspor tidak terhitung). Sebelum tiap
+jumlah sesi cache proses dan cache disk dikosongkan, kecuali dengan --warm.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+import numpy as np
+import streamlit as st
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.testing.v1 import AppTest, local_script_runner
+
+from .batch import process_pool
+from .synth import synthetic_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "pok.online.py")
+SAMPLE_XLSX = os.path.join(ROOT, "POK contoh.xlsx")
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+EXPORT_BUTTONS = {"xlsx": "Siapkan Excel", "pdf": "Siapkan PDF"}
+NON_UNIT_CHOICES = ("Rekap Per Unit", "Semua")
+# Jeda antar rerun saat menunggu job ekspor (fragment dashboard polling per detik)
+EXPORT_POLL_SECONDS = 0.5
+RSS_SAMPLE_SECONDS = 0.2
+
+
+# AppTest memasang Runtime tiruan global per rerun dan menghapusnya
+# sesudahnya, jadi dua rerun yang tumpang tindih dalam satu proses saling
+# merusak: di mode thread rerun dijalankan bergiliran. Job ekspor tetap
+# paralel di pool.
+_RUN_LOCK = threading.Lock()
+
+
+@contextmanager
+def _shared_script_cache():
+    # AppTest membuat ScriptCache baru (compile ulang script) setiap rerun,
+    # dan ast.parse dari banyak thread sekaligus tidak aman (SystemError di
+    # CPython 3.11). Server sungguhan memakai satu ScriptCache per proses;
+    # hanya selama mode thread, atribut privat AppTest diganti lalu dipulihkan.
+    original = local_script_runner.ScriptCache
+    cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: cache
+    try:
+        yield
+    finally:
+        local_script_runner.ScriptCache = original
+
+
+def _rss_bytes():
+    # RSS proses saat ini (Linux); selain itu puncak RSS dari getrusage
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _RssSampler(threading.Thread):
+    """Catat RSS puncak selama satu tingkat beban."""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = _rss_bytes()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(RSS_SAMPLE_SECONDS):
+            self.peak = max(self.peak, _rss_bytes())
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.peak = max(self.peak, _rss_bytes())
+
+
+def _percentiles(values):
+    if not values:
+        return {"n": 0, "p50_s": None, "p95_s": None, "max_s": None}
+    p50, p95 = np.percentile(values, [50, 95])
+    return {"n": len(values), "p50_s": round(float(p50), 4), "p95_s": round(float(p95), 4),
+            "max_s": round(float(max(values)), 4)}
+
+
+def _selectbox(at, label):
+    for box in at.sidebar.selectbox:
+        if box.label == label:
+            return box
+    raise LookupError(f"selectbox {label!r} tidak ada")
+
+
+def run_session(index, workbook, file_name, app=APP_PATH, units=2, exports=("xlsx", "pdf"), think=0.0,
+                timeout=300.0, lock=_RUN_LOCK):
+    """Satu sesi dashboard -> {"reruns": [(aksi, detik rerun, detik tunggu)], "export_s": detik|None, ...}.
+
+    lock: giliran rerun antar sesi satu proses; None bila sesi sendirian di prosesnya.
+    """
+    reruns = []
+    result = {"session": index, "reruns": reruns, "export_s": None, "downloads": 0, "error": None,
+              "started": time.time(), "finished": None}
+    at = AppTest.from_file(app, default_timeout=timeout)
+
+    def rerun(action):
+        queued = time.perf_counter()
+        with lock or nullcontext():
+            start = time.perf_counter()
+            at.run()
+            end = time.perf_counter()
+        reruns.append((action, end - start, start - queued))
+        if at.exception:
+            raise RuntimeError(f"{action}: {at.exception[0].value}")
+        if think:
+            time.sleep(think)
+
+    try:
+        rerun("buka")
+        at.sidebar.file_uploader[0].set_value((file_name, workbook, XLSX_MIME))
+        rerun("upload")
+        unit_box = _selectbox(at, "Pilih Unit")
+        choices = [u for u in unit_box.options if u not in NON_UNIT_CHOICES] or ["Semua"]
+        for k in range(units):
+            # Sesi berbeda memulai dari unit berbeda
+            _selectbox(at, "Pilih Unit").set_value(choices[(index + k) % len(choices)])
+            rerun("unit")
+        if exports:
+            start = time.perf_counter()
+            for kind in exports:
+                [b for b in at.sidebar.button if b.label == EXPORT_BUTTONS[kind]][0].click()
+                rerun("ekspor")
+            while at.session_state["_pok_export_jobs_active"]:
+                if time.perf_counter() - start > timeout:
+                    raise TimeoutError(f"ekspor belum selesai setelah {timeout:.0f} dtk")
+                time.sleep(EXPORT_POLL_SECONDS)
+                rerun("tunggu_ekspor")
+            result["export_s"] = time.perf_counter() - start
+            result["downloads"] = len(at.sidebar.get("download_button"))
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+    result["finished"] = time.time()
+    return result
+
+
+def _run_session_process(cache_dir, *args, **kwargs):
+    # Sesi di proses sendiri (--processes): tanpa giliran rerun; cache disk
+    # dibagi lewat direktori yang sama. RSS puncak proses ikut dilaporkan.
+    os.environ["POK_CACHE_DIR"] = cache_dir
+    result = run_session(*args, lock=None, **kwargs)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result["rss_peak"] = peak if sys.platform == "darwin" else peak * 1024
+    # Pool ekspor dashboard (st.cache_resource) tidak pernah ditutup; tanpa
+    # ini proses menunggu worker-nya selamanya saat keluar
+    for child in multiprocessing.active_children():
+        child.terminate()
+    return result
+
+
+def _reset_server(cache_root):
+    # Seperti server yang baru dijalankan: cache proses dan cache disk kosong
+    st.cache_resource.clear()
+    os.environ["POK_CACHE_DIR"] = tempfile.mkdtemp(dir=cache_root)
+
+
+def run_level(n_sessions, workbooks, cache_root, warm=False, processes=False, **session_args):
+    """Jalankan n_sessions sesi -> dict hasil satu tingkat beban (lihat docstring modul untuk mode)."""
+    if not warm:
+        _reset_server(cache_root)
+    rss_start = _rss_bytes()
+    sampler = _RssSampler()
+    sampler.start()
+    if processes:
+        # Proses baru per sesi = cache proses kosong; waktu start proses
+        # tidak dihitung (wall diambil dari awal/akhir sesi)
+        with process_pool(n_sessions, max_tasks_per_child=1) as pool:
+            futures = [pool.submit(_run_session_process, os.environ["POK_CACHE_DIR"], i,
+                                   *workbooks[i % len(workbooks)], **session_args)
+                       for i in range(n_sessions)]
+            sessions = [f.result() for f in futures]
+    else:
+        with _shared_script_cache(), ThreadPoolExecutor(max_workers=n_sessions) as pool:
+            futures = [pool.submit(run_session, i, *workbooks[i % len(workbooks)], **session_args)
+                       for i in range(n_sessions)]
+            sessions = [f.result() for f in futures]
+    wall = max(s["finished"] for s in sessions) - min(s["started"] for s in sessions)
+    sampler.stop()
+    rss_end = _rss_bytes()
+
+    latencies = [run for session in sessions for _, run, _ in session["reruns"]]
+    waits = [wait for session in sessions for _, _, wait in session["reruns"]]
+    by_action = {}
+    for session in sessions:
+        for action, run, _ in session["reruns"]:
+            by_action.setdefault(action, []).append(run)
+    result = {
+        "sessions": n_sessions,
+        "mode": "processes" if processes else "threads",
+        "concurrent_reruns": processes,
+        "wall_s": round(wall, 3),
+        "reruns": len(latencies),
+        "reruns_per_s": round(len(latencies) / wall, 2) if wall else None,
+        "sessions_per_min": round(n_sessions / wall * 60, 2) if wall else None,
+        "latency": _percentiles(latencies),
+        "wait": _percentiles(waits),
+        "by_action": {action: _percentiles(values) for action, values in by_action.items()},
+        "export": _percentiles([s["export_s"] for s in sessions if s["export_s"] is not None]),
+        "errors": [f"sesi {s['session']}: {s['error']}" for s in sessions if s["error"]],
+    }
+    if processes:
+        # Tiap sesi = satu proses; jumlah puncak = batas atas (puncak tidak serentak)
+        peaks = [s["rss_peak"] for s in sessions]
+        result.update(rss_mb_peak=round(sum(peaks) / 2**20, 1),
+                      rss_mb_per_session=round(sum(peaks) / 2**20 / n_sessions, 1))
+    else:
+        result.update(rss_mb_start=round(rss_start / 2**20, 1), rss_mb_end=round(rss_end / 2**20, 1),
+                      rss_mb_peak=round(sampler.peak / 2**20, 1),
+                      rss_mb_per_session=round((sampler.peak - rss_start) / 2**20 / n_sessions, 1))
+    return result
+
+
+def _workbooks(args, n):
+    # (bytes, nama file) per sesi; --distinct: isi berbeda per sesi (tanpa berbagi cache)
+    if not args.rows:
+        with open(args.xlsx, "rb") as f:
+            return [(f.read(), os.path.basename(args.xlsx))]
+    count = n if args.distinct else 1
+    return [(synthetic_workbook(args.rows, args.sheets, seed=args.seed + i), f"POK sintetis {args.rows} #{i}.xlsx")
+            for i in range(count)]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m pok.loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="jumlah sesi yang diuji (default: 1 2 4 8)")
+    parser.add_argument("--processes", action="store_true",
+                        help="tiap sesi di proses sendiri: rerun bersamaan, cache proses tidak dibagi")
+    parser.add_argument("--xlsx", default=SAMPLE_XLSX, help="workbook yang diunggah (default: POK contoh.xlsx)")
+    parser.add_argument("--rows", type=int, default=0,
+                        help="pakai workbook sintetis dengan n baris per sheet, bukan --xlsx")
+    parser.add_argument("--sheets", type=int, default=1, help="jumlah sheet workbook sintetis (default: 1)")
+    parser.add_argument("--distinct", action="store_true",
+                        help="workbook sintetis berbeda untuk tiap sesi (dataset tidak dibagi)")
+    parser.add_argument("--units", type=int, default=2, help="jumlah perpindahan UNIT per sesi (default: 2)")
+    parser.add_argument("--exports", nargs="*", choices=list(EXPORT_BUTTONS), default=list(EXPORT_BUTTONS),
+                        help="ekspor yang disiapkan tiap sesi (default: xlsx pdf; kosong = tanpa ekspor)")
+    parser.add_argument("--think", type=float, default=0.0, help="jeda antar aksi per sesi, detik (default: 0)")
+    parser.add_argument("--timeout", type=float, default=300.0, help="batas waktu per rerun/ekspor, detik")
+    parser.add_argument("--warm", action="store_true", help="jangan kosongkan cache di antara tingkat beban")
+    parser.add_argument("--app", default=APP_PATH, help="script dashboard (default: pok.online.py)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="tulis hasil JSON ke file (default: stdout)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    report = {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"), "cpus": os.cpu_count(),
+              "workload": {"xlsx": None if args.rows else os.path.basename(args.xlsx), "rows": args.rows,
+                           "sheets": args.sheets, "distinct": args.distinct, "units": args.units,
+                           "exports": args.exports, "think_s": args.think, "warm": args.warm,
+                           "processes": args.processes},
+              "results": []}
+    workbooks = _workbooks(args, max(args.sessions))
+    cache_root = tempfile.mkdtemp(prefix="pok-loadtest-")
+    if args.warm:
+        _reset_server(cache_root)
+    try:
+        for n_sessions in args.sessions:
+            result = run_level(n_sessions, workbooks, cache_root, warm=args.warm, processes=args.processes,
+                               app=args.app, units=args.units, exports=tuple(args.exports), think=args.think,
+                               timeout=args.timeout)
+            report["results"].append(result)
+            latency = result["latency"]
+            # Mode thread: rerun bergiliran, jadi bukan angka kapasitas sesi bersamaan
+            mode = "proses terpisah" if args.processes else f"bergiliran, tunggu p95 {result['wait']['p95_s']}s"
+            print(f"{n_sessions:>3} sesi ({mode}): rerun p50 {latency['p50_s']}s, p95 {latency['p95_s']}s, "
+                  f"{result['reruns_per_s']} rerun/dtk, ekspor p95 {result['export']['p95_s']}s, "
+                  f"RSS puncak {result['rss_mb_peak']} MB, {len(result['errors'])} error", file=sys.stderr)
+            for error in result["errors"]:
+                print(f"  {error}", file=sys.stderr)
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 1 if any(r["errors"] for r in report["results"]) else 0
+
+
+if __name__ == "__main__":
+    # Jalankan dari modul pok.loadtest, bukan __main__: fungsi sesi untuk
+    # --processes harus dapat di-pickle dengan nama modul yang bisa diimpor
+    from pok.loadtest import main
+    sys.exit(main())
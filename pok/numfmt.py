@@ -0,0 +1,87 @@
+"""Format angka Indonesia (titik pemisah ribuan) untuk tampilan dan ekspor.
+
+format_ribuan mengubah satu kolom angka sekaligus menjadi string, tanpa
+f-string per sel. NumberStrings menyimpan hasil kolom VOL/HARGA/JUMLAH
+satu dataset supaya tabel HTML dan PDF tidak memformat ulang setiap rerun.
+"""
+import numpy as np
+import pandas as pd
+
+# Kolom angka rincian -> dipotong (int(), seperti VOL) atau dibulatkan (.0f)
+NUMBER_FORMATS = {"VOL": True, "HARGA": False, "JUMLAH": False}
+
+_GROUP = np.array([str(i) for i in range(1000)], dtype=object)
+_GROUP_PADDED = np.array([f"{i:03d}" for i in range(1000)], dtype=object)
+# Di atas ini int64 tidak aman; nilai seperti itu diformat per sel
+_MAX_EXACT = 1e18
+
+
+def format_ribuan(values, truncate=False, blank_zero=True):
+    """Array object string "1.234.567" untuk values (list/array/Series).
+
+    Sama dengan f"{x:,.0f}".replace(",", ".") per sel (truncate=True:
+    f"{int(x):,}"), tetapi digit dikelompokkan per 3 lewat operasi array.
+    NaN/inf -> ""; nol -> "" bila blank_zero.
+    """
+    x = pd.Series(values).to_numpy(dtype=np.float64, na_value=np.nan)
+    # Kolom POK berisi banyak nilai berulang: format nilai unik saja. Unik
+    # menurut pola bit, bukan nilai: -0.0 == 0.0, tetapi .0f memberi "-0"
+    codes, uniques = pd.factorize(x.view(np.int64))
+    return _format_unique(uniques.view(np.float64), truncate, blank_zero)[codes]
+
+
+def _format_unique(x, truncate, blank_zero):
+    n = np.trunc(x) if truncate else np.rint(x)  # rint: half-to-even seperti format()
+    blank = ~np.isfinite(x)
+    if blank_zero:
+        blank |= x == 0
+    huge = ~blank & ~(np.abs(n) < _MAX_EXACT)
+    a = np.abs(np.where(blank | huge, 0, n)).astype(np.int64)
+
+    # Kelompok 3 digit dari kanan; kelompok yang masih punya kelompok di
+    # depannya diisi nol ("1.005", bukan "1.5")
+    rest = a // 1000
+    out = np.where(rest > 0, _GROUP_PADDED[a % 1000], _GROUP[a % 1000])
+    idx = np.flatnonzero(rest)
+    while len(idx):
+        group, rest_idx = rest[idx] % 1000, rest[idx] // 1000
+        out[idx] = np.where(rest_idx > 0, _GROUP_PADDED[group], _GROUP[group]) + "." + out[idx]
+        rest[idx] = rest_idx
+        idx = idx[rest_idx > 0]
+
+    # int(-0.4) = 0 tanpa tanda, sedangkan format(-0.4, ".0f") = "-0"
+    negative = (n < 0 if truncate else np.signbit(n)) & ~blank
+    out[negative] = "-" + out[negative]
+    out[blank] = ""
+    for i in np.flatnonzero(huge):
+        out[i] = f"{int(n[i]):,}".replace(",", ".")
+    return out
+
+
+def format_numbers(dataframe, columns=NUMBER_FORMATS):
+    """DataFrame string tampilan untuk kolom angka yang ada di dataframe (index sama)."""
+    return pd.DataFrame({col: format_ribuan(dataframe[col], truncate=truncate)
+                         for col, truncate in columns.items() if col in dataframe.columns},
+                        index=dataframe.index)
+
+
+class NumberStrings:
+    """String tampilan VOL/HARGA/JUMLAH satu dataset, dihitung sekali.
+
+    rows(frame) mengambil string untuk frame turunan dataset (filter unit,
+    hasil cari, potongan halaman) lewat index barisnya.
+    """
+
+    def __init__(self, dataframe):
+        self.frame = format_numbers(dataframe).astype("str")
+
+    @property
+    def nbytes(self):
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    def rows(self, frame):
+        # None bila frame bukan turunan dataset ini (index tidak dikenal)
+        positions = self.frame.index.get_indexer(frame.index)
+        if len(positions) and positions.min() < 0:
+            return None
+        return self.frame.iloc[positions]
@@ -0,0 +1,274 @@
+"""Ekspor rincian ke PDF (A4 landscape) dengan nomor halaman dan tanda tangan."""
+import io
+from xml.sax.saxutils import escape as xml_escape
+
+import numpy as np
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Flowable
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.enums import TA_RIGHT
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.lib import colors
+
+from .data import KELAS_COL, kelas_kode
+from .numfmt import format_numbers, format_ribuan
+from .pdfpage import PageContent, page_template
+
+# Tabel rincian PDF: sel pendek ditulis sebagai string biasa, Paragraph hanya
+# untuk sel yang perlu wrapping, dan tabel dibangun per potongan baris.
+PDF_CHUNK_ROWS = 50
+PDF_FONT = 'Helvetica'
+PDF_FONT_SIX = 'Helvetica-BoldOblique'
+PDF_FONT_SIZE = 8
+PDF_LEADING = 10
+PDF_PADDING = 4
+PDF_NUMERIC_COLS = {"VOL", "HARGA", "JUMLAH"}
+# Kolom "SELISIH <kolom>" (lihat pok.diff) diformat seperti kolom asalnya
+PDF_DELTA_PREFIX = "SELISIH "
+
+# Gaya Paragraph sel dibuat sekali: (baris kode 6 digit?, rata kanan?)
+_pdf_body_style = getSampleStyleSheet()['BodyText']
+PDF_CELL_STYLES = {
+    (six, right): ParagraphStyle(name=f"pok_cell_{'six' if six else 'base'}_{'right' if right else 'left'}",
+                                 parent=_pdf_body_style, fontName=PDF_FONT_SIX if six else PDF_FONT,
+                                 fontSize=PDF_FONT_SIZE, leading=PDF_LEADING,
+                                 alignment=TA_RIGHT if right else 0)
+    for six in (False, True) for right in (False, True)
+}
+
+
+def _column_kind(col):
+    name = str(col).upper()
+    return name[len(PDF_DELTA_PREFIX):] if name.startswith(PDF_DELTA_PREFIX) else name
+
+
+def _pdf_table_style(cols, row_kelas):
+    # Styling: header, font size, alignment per kolom, vertical middle for URAIAN
+    ts = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTSIZE', (0, 0), (-1, -1), PDF_FONT_SIZE),
+        # Sel teks biasa memakai leading yang sama dengan Paragraph sel
+        ('LEADING', (0, 1), (-1, -1), PDF_LEADING),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        # Use slightly larger padding so wrapped text has room
+        ('LEFTPADDING', (0, 0), (-1, -1), PDF_PADDING),
+        ('RIGHTPADDING', (0, 0), (-1, -1), PDF_PADDING),
+        ('TOPPADDING', (0, 0), (-1, -1), PDF_PADDING),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), PDF_PADDING),
+    ])
+
+    # Right align numeric-like columns
+    for ci, c in enumerate(cols):
+        if _column_kind(c) in PDF_NUMERIC_COLS:
+            ts.add('ALIGN', (ci, 1), (ci, -1), 'RIGHT')
+
+    # Apply per-row styling based on KODE classification
+    # data rows in the ReportLab table start at row index 1 (header is row 0)
+    for i, cls in enumerate(row_kelas):
+        table_row = i + 1
+        if cls == 'text':
+            # light blue background across the entire row
+            ts.add('BACKGROUND', (0, table_row), (-1, table_row), colors.HexColor('#CCE5FF'))
+        elif cls == 'six':
+            # entire row bold + italic
+            ts.add('FONTNAME', (0, table_row), (-1, table_row), PDF_FONT_SIX)
+
+    # URAIAN column: ensure left align and vertical middle
+    if 'URAIAN' in cols:
+        ur_idx = cols.index('URAIAN')
+        ts.add('ALIGN', (ur_idx, 1), (ur_idx, -1), 'LEFT')
+        ts.add('VALIGN', (ur_idx, 0), (ur_idx, -1), 'MIDDLE')
+    return ts
+
+
+class PdfChunkedTable(Flowable):
+    """Tabel panjang yang dibangun per halaman dari potongan baris.
+
+    ReportLab menyalin seluruh sisa baris setiap kali sebuah Table dipecah
+    antar halaman (biaya kuadratik). Di sini setiap halaman mendapat Table
+    baru berisi header + potongan baris berikutnya, sehingga header tetap
+    hanya muncul di awal halaman dan biaya layout linear.
+    """
+
+    def __init__(self, header, rows, row_kelas, col_widths, chunk_rows=PDF_CHUNK_ROWS, wrap_cells=None):
+        Flowable.__init__(self)
+        # Sama dengan Table agar potongan terakhir tidak bergeser
+        self.hAlign = 'CENTER'
+        self.header = header
+        self.rows = rows
+        self.row_kelas = row_kelas
+        self.col_widths = col_widths
+        self.chunk_rows = chunk_rows
+        if wrap_cells is None:
+            wrap_cells = [self._wrap_cells(row, cls == 'six') for row, cls in zip(rows, row_kelas)]
+        self.wrap_cells = wrap_cells
+        self._table = None
+
+    def _wrap_cells(self, row, six):
+        # Indeks kolom yang teksnya lebih lebar dari kolom (perlu Paragraph).
+        # Teks pendek (setiap glyph <= 1.1 em) dilewati tanpa mengukur lebar.
+        font = PDF_FONT_SIX if six else PDF_FONT
+        wrap = []
+        for ci, (text, width) in enumerate(zip(row, self.col_widths)):
+            inner = width - 2 * PDF_PADDING
+            if len(text) * PDF_FONT_SIZE * 1.1 <= inner:
+                continue
+            if stringWidth(text, font, PDF_FONT_SIZE) > inner:
+                wrap.append(ci)
+        return wrap
+
+    def _build(self, n):
+        data = [self.header]
+        for row, cls, wrap in zip(self.rows[:n], self.row_kelas[:n], self.wrap_cells[:n]):
+            cells = list(row)
+            for ci in wrap:
+                right = _column_kind(self.header[ci]) in PDF_NUMERIC_COLS
+                cells[ci] = Paragraph(xml_escape(cells[ci]), PDF_CELL_STYLES[(cls == 'six', right)])
+            data.append(cells)
+        # Let ReportLab compute row heights automatically so text wrapping is
+        # accommodated.
+        table = Table(data, colWidths=self.col_widths, repeatRows=1)
+        table.setStyle(_pdf_table_style(self.header, self.row_kelas[:n]))
+        return table
+
+    def wrap(self, availWidth, availHeight):
+        if len(self.rows) <= self.chunk_rows:
+            self._table = self._build(len(self.rows))
+            return self._table.wrap(availWidth, availHeight)
+        # Lebih banyak baris dari satu potongan: pasti lebih tinggi dari satu
+        # halaman, biarkan frame memanggil split().
+        self._table = None
+        return sum(self.col_widths), availHeight + 1
+
+    def split(self, availWidth, availHeight):
+        n = min(len(self.rows), self.chunk_rows)
+        while True:
+            table = self._build(n)
+            _, height = table.wrap(availWidth, availHeight)
+            if height > availHeight or n >= len(self.rows):
+                break
+            n = min(len(self.rows), n * 2)
+        if height <= availHeight:
+            return [table]
+
+        parts = table.split(availWidth, availHeight)
+        if not parts:
+            return []
+        used = len(parts[0]._cellvalues) - 1
+        if used <= 0:
+            return []
+        rest = PdfChunkedTable(self.header, self.rows[used:], self.row_kelas[used:],
+                               self.col_widths, self.chunk_rows, self.wrap_cells[used:])
+        return [parts[0], rest]
+
+    def draw(self):
+        self._table.drawOn(self.canv, 0, 0)
+
+
+def generate_pdf(dataframe, sheet_name, unit_name, total_anggaran, include_signature=True, page=PageContent(),
+                 numbers=None):
+
+    # Buat PDF landscape A4 dengan margin; tambahkan bottom margin lebih besar
+    # agar blok tanda tangan tidak tertimpa tabel.
+    buffer = io.BytesIO()
+    left_margin = right_margin = top_margin = 12 * mm
+    # Reduce bottom margin to allow more table rows per page while still
+    # leaving space for the signature block. 18 mm is a reasonable compromise.
+    bottom_margin = 18 * mm
+    page_size = landscape(A4)
+    doc = SimpleDocTemplate(buffer, pagesize=page_size,
+                            leftMargin=left_margin, rightMargin=right_margin,
+                            topMargin=top_margin, bottomMargin=bottom_margin)
+
+    styles = getSampleStyleSheet()
+    title_style = styles['Heading2']
+    title_style.alignment = 1  # center
+    title_style.fontSize = 11
+    title_style.spaceAfter = 6
+
+    info_style = styles['Normal']
+    info_style.fontSize = 9
+
+    title_text = f"RINCIAN KERTAS KERJA SATKER T.A. 2025 ({sheet_name})"
+    total_fmt = f"{total_anggaran:,.0f}".replace(",", ".")
+    unit_text = f"Unit: {unit_name}                                        Total: {total_fmt}"
+
+    elems = []
+    elems.append(Paragraph(title_text, title_style))
+    elems.append(Spacer(1, 4))
+    elems.append(Paragraph(unit_text, info_style))
+    elems.append(Spacer(1, 6))
+
+    # Siapkan data tabel dengan lebar kolom tetap (dalam mm). Jika total melebihi
+    # lebar tersedia, ukurannya akan diskalakan secara proporsional.
+    page_width, page_height = page_size
+    avail_width = page_width - left_margin - right_margin
+
+    # Default lebar tiap kolom dalam mm (sesuaikan bila perlu)
+    fixed_widths_mm = {
+        'UNIT': 33,
+        'MAK': 35,
+        'KODE': 19,
+        'URAIAN': 150,
+        'VOL': 15,
+        'SAT': 15,
+        'HARGA': 27,
+        'JUMLAH': 30,
+        'RO': 7,
+        'SD': 10,
+        'STATUS': 16,
+    }
+
+    # Bangun list lebar (dalam points)
+    fixed_points = []
+    cols = [c for c in dataframe.columns if c != KELAS_COL]
+    for col in cols:
+        mm_val = fixed_widths_mm.get(_column_kind(col), 25)
+        fixed_points.append(mm_val * mm)
+
+    total_fixed = sum(fixed_points)
+    if total_fixed > avail_width and total_fixed > 0:
+        scale = avail_width / total_fixed
+        col_widths = [w * scale for w in fixed_points]
+    else:
+        col_widths = fixed_points
+
+    # Header + data: nilai sel disimpan sebagai string tampilan; Paragraph
+    # baru dibuat per potongan tabel dan hanya untuk sel yang perlu wrapping.
+    # KODE classification comes from the load step.
+    # Kolom diformat utuh sekaligus; numbers (mis. NumberStrings.rows) berisi
+    # string VOL/HARGA/JUMLAH yang sudah jadi.
+    if numbers is None:
+        numbers = format_numbers(dataframe)
+    header = cols
+    columns = []
+    for colname in cols:
+        cname = _column_kind(colname)
+        if colname in numbers.columns:
+            values = numbers[colname].to_numpy(dtype=object)
+        elif cname in PDF_NUMERIC_COLS:
+            values = format_ribuan(dataframe[colname], truncate=cname == 'VOL')
+        else:
+            # Spasi dirapatkan seperti Paragraph ("FTIK " -> "FTIK")
+            series = dataframe[colname]
+            text = series.astype(str).str.replace(r'\s+', ' ', regex=True).str.strip()
+            values = np.where(series.isna().to_numpy(), '', text.to_numpy(dtype=object))
+        columns.append(values)
+    rows = [list(row) for row in zip(*columns)]
+
+    # Tabel dibangun per halaman dari potongan baris (lihat PdfChunkedTable)
+    # sehingga biaya layout linear terhadap jumlah baris.
+    table = PdfChunkedTable(header, rows, kelas_kode(dataframe).tolist(), col_widths)
+    elems.append(table)
+
+    # Nomor halaman dan tanda tangan (halaman terakhir) digambar oleh
+    # PageTemplate yang di-cache per konfigurasi (lihat pok.pdfpage)
+    template = page_template(page_size, (left_margin, right_margin, top_margin, bottom_margin),
+                             page._replace(signature=tuple(page.signature or ())))
+    elems.append(template.story_end())
+    doc.build(elems, canvasmaker=template.canvasmaker(include_signature))
+    return buffer.getvalue()
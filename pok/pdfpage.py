@@ -0,0 +1,157 @@
+"""Template halaman PDF: header, footer bernomor "i / N" dan blok tanda tangan.
+
+Satu pass, tanpa menyimpan salinan state canvas per halaman: hiasan halaman
+digambar saat showPage, jumlah halaman N ditulis sebagai form XObject yang
+baru diisi di save(), dan halaman terakhir ditandai flowable kosong di akhir
+story (lihat PageTemplate.story_end). Template hasil kompilasi (posisi teks,
+lebar string) di-cache per konfigurasi dan dipakai ulang antar ekspor.
+"""
+from collections import namedtuple
+from functools import lru_cache, partial
+
+from reportlab.lib.units import mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas as pdfcanvas
+from reportlab.platypus import Flowable
+
+DEFAULT_SIGNATURE = (
+    "Lhokseumawe, 03 Oktober 2025",
+    "Wakil Rektor II",
+    "Bidang Administrasi Umum, Perencanaan, dan Keuangan",
+    "",
+    "",
+    "^",
+    "",
+    "",
+    "SAID ALWI",
+)
+DEFAULT_FOOTER = "{page} / {total}"
+TOTAL_PAGES_FORM = "pok_total_pages"
+
+PAGE_FONT = 'Helvetica'
+FOOTER_FONT_SIZE = 8
+HEADER_FONT_SIZE = 8
+SIGNATURE_FONT_SIZE = 9
+SIGNATURE_LEADING = 12
+
+# Isi halaman yang dapat diatur: header/footer berupa teks dengan token
+# {page} (footer juga {total}); hanya token itu yang diganti, kurung kurawal
+# lain ditulis apa adanya (teks berasal dari pengguna). signature = baris
+# tanda tangan ("^" = paraf, digambar menjorok). Hashable, jadi dapat dipakai
+# sebagai kunci cache.
+PageContent = namedtuple("PageContent", ["header", "footer", "signature"],
+                         defaults=(None, DEFAULT_FOOTER, DEFAULT_SIGNATURE))
+
+
+def _fill_page(text, page):
+    return text.replace("{page}", str(page))
+
+
+class _LastPage(Flowable):
+    # Flowable 0x0 di akhir story: halaman tempat ia digambar = halaman terakhir
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.canv.pok_last_page = True
+
+
+class PageTemplate:
+    """Hiasan halaman untuk satu ukuran kertas, margin dan PageContent."""
+
+    def __init__(self, pagesize, margins, content=PageContent()):
+        left_margin, right_margin, top_margin, bottom_margin = margins
+        page_width, page_height = pagesize
+        self.content = content
+        self.x_center = page_width / 2.0
+        self.header_y = page_height - top_margin * 0.5
+        self.footer_y = bottom_margin * 0.3
+
+        # Footer: bagian sebelum {total} digambar per halaman, {total} = form
+        # XObject; bagian sesudahnya (jarang) ikut digambar setelah form
+        footer = content.footer or ""
+        self.footer_head, has_total, self.footer_tail = footer.partition("{total}")
+        self.has_total = bool(has_total)
+        self.digit_width = stringWidth("0", PAGE_FONT, FOOTER_FONT_SIZE)
+
+        # Blok tanda tangan: baris terakhir kira-kira 3 baris di atas margin
+        # bawah, baris pertama tidak melewati margin atas
+        lines = list(content.signature or ())
+        last_line_y = bottom_margin + SIGNATURE_LEADING * 3
+        first_line_y = min(last_line_y + SIGNATURE_LEADING * (len(lines) - 1), page_height - top_margin - 6)
+        self.signature = tuple(
+            (left_margin + (6 * mm if line.strip() == "^" else 0), first_line_y - i * SIGNATURE_LEADING, line)
+            for i, line in enumerate(lines) if line.strip())
+
+    def story_end(self):
+        """Flowable yang harus jadi elemen terakhir story (menandai halaman terakhir)."""
+        return _LastPage()
+
+    def canvasmaker(self, include_signature=True):
+        return partial(TemplateCanvas, page_template=self, include_signature=include_signature)
+
+    def draw_page(self, canv, page, last_page, include_signature):
+        canv.saveState()
+        if self.content.header:
+            canv.setFont(PAGE_FONT, HEADER_FONT_SIZE)
+            canv.drawCentredString(self.x_center, self.header_y, _fill_page(self.content.header, page))
+        if self.has_total:
+            # Lebar N belum diketahui: anggap sama dengan jumlah digit
+            # halaman ini (tepat di tengah bila i dan N sama panjang)
+            head = _fill_page(self.footer_head, page)
+            head_width = stringWidth(head, PAGE_FONT, FOOTER_FONT_SIZE)
+            total_width = self.digit_width * len(str(page))
+            x = self.x_center - (head_width + total_width) / 2.0
+            canv.setFont(PAGE_FONT, FOOTER_FONT_SIZE)
+            canv.drawString(x, self.footer_y, head)
+            canv.saveState()
+            canv.translate(x + head_width, self.footer_y)
+            canv.doForm(TOTAL_PAGES_FORM)
+            canv.restoreState()
+            if self.footer_tail:
+                canv.drawString(x + head_width + total_width, self.footer_y, _fill_page(self.footer_tail, page))
+        elif self.content.footer:
+            canv.setFont(PAGE_FONT, FOOTER_FONT_SIZE)
+            canv.drawCentredString(self.x_center, self.footer_y, _fill_page(self.content.footer, page))
+        if last_page and include_signature and self.signature:
+            canv.setFont(PAGE_FONT, SIGNATURE_FONT_SIZE)
+            for x, y, line in self.signature:
+                canv.drawString(x, y, line)
+        canv.restoreState()
+
+    def draw_total(self, canv, pages):
+        # Isi form XObject jumlah halaman; dirujuk semua halaman sebelumnya
+        if not self.has_total:
+            return
+        canv.beginForm(TOTAL_PAGES_FORM)
+        canv.setFont(PAGE_FONT, FOOTER_FONT_SIZE)
+        canv.drawString(0, 0, str(pages))
+        canv.endForm()
+
+
+class TemplateCanvas(pdfcanvas.Canvas):
+    """Canvas yang menggambar PageTemplate tiap showPage (state tidak disalin)."""
+
+    def __init__(self, *args, page_template, include_signature=True, **kwargs):
+        pdfcanvas.Canvas.__init__(self, *args, **kwargs)
+        self.page_template = page_template
+        self.include_signature = include_signature
+        self.pok_pages = 0
+        self.pok_last_page = False
+
+    def showPage(self):
+        self.pok_pages += 1
+        self.page_template.draw_page(self, self.pok_pages, self.pok_last_page, self.include_signature)
+        pdfcanvas.Canvas.showPage(self)
+
+    def save(self):
+        if len(self._code):
+            self.showPage()
+        self.page_template.draw_total(self, self.pok_pages)
+        pdfcanvas.Canvas.save(self)
+
+
+@lru_cache(maxsize=32)
+def page_template(pagesize, margins, content=PageContent()):
+    """PageTemplate untuk (pagesize, margins, content), dikompilasi sekali per proses."""
+    return PageTemplate(tuple(pagesize), tuple(margins), content)
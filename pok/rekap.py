@@ -0,0 +1,180 @@
+"""Rekap total anggaran (kode akun 6 digit) per UNIT beserta ekspornya."""
+import hashlib
+import io
+
+import pandas as pd
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.lib import colors
+
+from .data import kelas_kode
+from .numfmt import format_ribuan
+
+
+def rekap_per_unit(df):
+    return _rekap_table(*_unit_totals(df))
+
+
+def _unit_totals(df):
+    # Compute summary: count and total JUMLAH of 6-digit KODE rows per UNIT
+    # Hanya kolom yang dipakai (tanpa menyalin seluruh frame); UNIT sebagai
+    # string biasa agar groupby/merge tidak bergantung pada kategori
+    summary = pd.DataFrame({
+        "UNIT": df["UNIT"].astype(str),
+        "KODE": df["KODE"],
+        "JUMLAH": pd.to_numeric(df["JUMLAH"], errors="coerce").fillna(0),
+    })
+    # Mark rows where KODE is exactly 6 digits
+    summary["is6"] = kelas_kode(df) == "six"
+
+    # Group only rows with is6==True to compute counts and totals per UNIT
+    grp6 = summary[summary["is6"]].groupby("UNIT", dropna=False).agg(Count=("KODE", "count"), Total_JUMLAH=("JUMLAH", "sum")).reset_index()
+
+    # Ensure all units appear in the rekap (even those with zero matching KODE)
+    all_units = summary["UNIT"].fillna("").unique().tolist()
+    return grp6, all_units
+
+
+def rekap_chunks(frames):
+    """rekap_per_unit atas potongan frame bersih tanpa menggabungkannya.
+
+    Tiap potongan direkap lalu dibuang; hanya total per UNIT yang disimpan,
+    jadi memori ~ satu potongan (lihat pok.ingest.rekap_streamed).
+    """
+    partials, units = [], {}
+    for df in frames:
+        # Total mentah per UNIT (tanpa isian nol) agar dtype Total_JUMLAH
+        # sama dengan rekap_per_unit atas seluruh sheet
+        grp6, all_units = _unit_totals(df)
+        units.update(dict.fromkeys(all_units))
+        partials.append(grp6)
+    if not partials:
+        return _rekap_table(pd.DataFrame(columns=["UNIT", "Count", "Total_JUMLAH"]), [])
+    grp6 = pd.concat(partials, ignore_index=True).groupby("UNIT", sort=False).sum().reset_index()
+    return _rekap_table(grp6, list(units))
+
+
+def _rekap_table(grp6, all_units):
+    # dtype sama dengan grp6: daftar UNIT kosong (sheet kosong) tidak menjadi float64
+    units = pd.DataFrame({"UNIT": pd.Series(all_units, dtype=grp6["UNIT"].dtype)})
+    grp = units.merge(grp6, on="UNIT", how="left").fillna({"Count": 0, "Total_JUMLAH": 0})
+    grp["Count"] = grp["Count"].astype(int)
+    grp = grp.reset_index(drop=True)
+
+    grp["Total_JUMLAH_fmt"] = format_ribuan(grp["Total_JUMLAH"])
+    return grp
+
+
+# ===== CUBE REKAP (UNIT -> RO -> MAK -> KODE) =====
+# Agregat baris akun 6 digit dibangun per UNIT. Tiap potongan UNIT diberi
+# kunci hash isi barisnya, jadi saat sheet yang sedikit berubah diunggah
+# ulang hanya UNIT yang barisnya berubah yang diagregasi ulang (potongan lain
+# diambil dari cache, mis. DatasetStore).
+CUBE_LEVELS = ["UNIT", "RO", "MAK", "KODE"]
+
+
+def _akun_rows(df):
+    six = (kelas_kode(df) == "six").to_numpy()
+    rows = pd.DataFrame({col: df[col][six].astype(str) for col in CUBE_LEVELS})
+    rows["JUMLAH"] = pd.to_numeric(df["JUMLAH"][six], errors="coerce").fillna(0)
+    return rows
+
+
+def _aggregate_unit(rows):
+    return (rows.groupby(CUBE_LEVELS[1:], sort=False)
+            .agg(Count=("KODE", "count"), Total_JUMLAH=("JUMLAH", "sum"))
+            .reset_index())
+
+
+class RekapCube:
+    """Count dan Total_JUMLAH baris akun 6 digit per UNIT/RO/MAK/KODE."""
+
+    def __init__(self, parts, all_units):
+        # parts: {UNIT: frame agregat RO/MAK/KODE}; all_units: urutan UNIT di sheet
+        self.parts = parts
+        self.all_units = all_units
+        frames = [part.assign(UNIT=unit) for unit, part in parts.items()]
+        columns = CUBE_LEVELS + ["Count", "Total_JUMLAH"]
+        self.frame = pd.concat(frames, ignore_index=True)[columns] if frames else pd.DataFrame(columns=columns)
+
+    @property
+    def nbytes(self):
+        return int(self.frame.memory_usage(deep=True).sum())
+
+    def per_unit(self):
+        """Sama dengan rekap_per_unit(df)."""
+        grp6 = self.level(1).sort_values("UNIT", kind="stable").reset_index(drop=True)
+        return _rekap_table(grp6, self.all_units)
+
+    def level(self, depth, **filters):
+        """Total pada depth level pertama CUBE_LEVELS, setelah disaring filters (mis. UNIT="FTIK")."""
+        frame = self.frame
+        for col, value in filters.items():
+            frame = frame[frame[col] == value]
+        keys = CUBE_LEVELS[:depth]
+        return frame.groupby(keys, sort=False).agg(Count=("Count", "sum"), Total_JUMLAH=("Total_JUMLAH", "sum")).reset_index()
+
+    def values(self, col, **filters):
+        frame = self.frame
+        for key, value in filters.items():
+            frame = frame[frame[key] == value]
+        return frame[col].unique().tolist()
+
+
+def build_rekap_cube(df, cache=None):
+    """RekapCube untuk df; cache (objek dengan get_or_build, mis. DatasetStore)
+    menyimpan agregat per UNIT dengan kunci hash isi baris akunnya."""
+    rows = _akun_rows(df)
+    row_hash = pd.util.hash_pandas_object(rows, index=False).to_numpy()
+    parts = {}
+    for unit, positions in rows.groupby("UNIT", sort=False).indices.items():
+        digest = hashlib.blake2b(row_hash[positions].tobytes(), digest_size=16)
+        digest.update(unit.encode())
+        unit_rows = rows.iloc[positions]
+        if cache is None:
+            parts[unit] = _aggregate_unit(unit_rows)
+        else:
+            parts[unit] = cache.get_or_build(("rekap_unit", digest.hexdigest()),
+                                             lambda unit_rows=unit_rows: _aggregate_unit(unit_rows))
+    all_units = df["UNIT"].astype(str).fillna("").unique().tolist()
+    return RekapCube(parts, all_units)
+
+
+def generate_rekap_excel(grp):
+    # Rekap as Excel (UNIT and Total JUMLAH)
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        export_df = grp[["UNIT", "Total_JUMLAH"]].copy()
+        export_df.rename(columns={"Total_JUMLAH":"Total JUMLAH"}, inplace=True)
+        export_df.to_excel(writer, index=False, sheet_name="Rekap Per Unit")
+    return buf.getvalue()
+
+
+def generate_rekap_pdf(grp, sheet_name):
+    # PDF version of the rekap (landscape, centered title)
+    pdf_buf = io.BytesIO()
+    doc = SimpleDocTemplate(pdf_buf, pagesize=landscape(A4), leftMargin=12*mm, rightMargin=12*mm, topMargin=12*mm, bottomMargin=12*mm)
+    styles = getSampleStyleSheet()
+    elems = []
+    title_text = f"RINCIAN KERTAS KERJA SATKER T.A. 2025 ({sheet_name})"
+    title_style = ParagraphStyle(name='rekap_title', parent=styles['Heading2'], alignment=1)
+    elems.append(Paragraph(title_text, title_style))
+    elems.append(Spacer(1, 6))
+
+    # Build table data with UNIT and Total JUMLAH only
+    pdf_rows = [["UNIT", "Total JUMLAH"]]
+    # Total sudah diformat di rekap (Total_JUMLAH_fmt)
+    pdf_rows.extend(map(list, zip(grp['UNIT'], grp['Total_JUMLAH_fmt'])))
+
+    # Wider columns for landscape layout
+    t = Table(pdf_rows, colWidths=[160*mm, 50*mm])
+    t.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), colors.lightgrey),
+        ('GRID', (0,0), (-1,-1), 0.25, colors.grey),
+        ('ALIGN', (1,1), (1,-1), 'RIGHT'),
+    ]))
+    elems.append(t)
+    doc.build(elems)
+    return pdf_buf.getvalue()
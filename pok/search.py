@@ -0,0 +1,90 @@
+"""Pencarian teks URAIAN/KODE/MAK dengan indeks token (inverted index)."""
+import re
+
+import numpy as np
+import pandas as pd
+
+SEARCH_COLS = ["URAIAN", "KODE", "MAK"]
+TOKEN_PATTERN = r"[0-9a-z]+"
+_SPLIT_RE = re.compile(TOKEN_PATTERN + r"|\x01")
+
+
+def tokenize(text):
+    return re.findall(TOKEN_PATTERN, str(text).lower())
+
+
+class SearchIndex:
+    """Indeks token -> posisi baris, dibangun sekali per dataset.
+
+    Kosakata disimpan terurut dan posting (posisi baris, int32) tiap token
+    bersebelahan dalam satu array, jadi token query dicocokkan sebagai
+    awalan (mis. "honor" -> "honorarium") lewat satu rentang searchsorted.
+    Beberapa token query = AND.
+    """
+
+    def __init__(self, dataframe, columns=SEARCH_COLS):
+        parts = []
+        for col in columns:
+            # Tokenisasi per nilai unik (kolom categorical/berulang) dalam satu
+            # findall atas gabungan nilai; pemisah \x01 menandai batas nilai
+            codes, uniques = pd.factorize(dataframe[col])
+            found = np.array(_SPLIT_RE.findall("\x01".join(map(str, uniques)).lower()), dtype=object)
+            sep = found == "\x01"
+            value_of = np.cumsum(sep)[~sep]
+            parts.append((codes, len(uniques), value_of, found[~sep]))
+
+        all_tokens = np.concatenate([p[3] for p in parts]) if parts else np.empty(0, dtype=object)
+        token_ids, vocab = pd.factorize(all_tokens, sort=True)
+        rows_parts, id_parts = [], []
+        start = 0
+        for codes, n_values, value_of, tokens in parts:
+            # Token tiap nilai unik bersebelahan (urut findall); baris
+            # mendapat salinan token milik nilainya
+            ids = token_ids[start:start + len(tokens)]
+            start += len(tokens)
+            counts = np.bincount(value_of, minlength=n_values)
+            starts = np.cumsum(counts) - counts
+            valid = codes >= 0
+            n = counts[codes[valid]]
+            within = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n)
+            rows_parts.append(np.repeat(np.flatnonzero(valid).astype(np.int32), n))
+            id_parts.append(ids[np.repeat(starts[codes[valid]], n) + within])
+        rows = np.concatenate(rows_parts) if rows_parts else np.empty(0, dtype=np.int32)
+        ids = np.concatenate(id_parts) if id_parts else np.empty(0, dtype=np.int64)
+
+        # Urut (token, baris) tanpa duplikat: posting tiap token terurut naik
+        order = np.lexsort((rows, ids))
+        ids, rows = ids[order], rows[order]
+        keep = np.ones(len(rows), dtype=bool)
+        keep[1:] = (ids[1:] != ids[:-1]) | (rows[1:] != rows[:-1])
+        ids, rows = ids[keep], rows[keep]
+
+        self.vocab = np.asarray(vocab, dtype=object)
+        self.postings = rows.astype(np.int32)
+        self.offsets = np.searchsorted(ids, np.arange(len(self.vocab) + 1))
+        self.n_rows = len(dataframe)
+
+    @property
+    def nbytes(self):
+        return int(self.postings.nbytes + self.offsets.nbytes + sum(len(t) + 49 for t in self.vocab))
+
+    def _prefix(self, token):
+        # Posisi baris yang punya token berawalan token (terurut, unik)
+        lo = np.searchsorted(self.vocab, token, side="left")
+        hi = np.searchsorted(self.vocab, token + "{", side="left")  # "{" sesudah "z"
+        if hi - lo == 1:
+            return self.postings[self.offsets[lo]:self.offsets[hi]]
+        return np.unique(self.postings[self.offsets[lo]:self.offsets[hi]])
+
+    def search(self, query):
+        """Posisi baris (terurut) yang cocok dengan semua token query; None bila query kosong."""
+        tokens = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not tokens:
+            return None
+        result = None
+        for token in tokens:
+            matches = self._prefix(token)
+            result = matches if result is None else np.intersect1d(result, matches, assume_unique=True)
+            if not len(result):
+                break
+        return result
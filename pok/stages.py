@@ -0,0 +1,114 @@
+"""Catat waktu dan memori puncak per tahap pipeline (parse, clean, rekap, ekspor...).
+
+Setiap tahap dibungkus ``with recorder.stage("nama", rows=n):`` dan dicatat
+sebagai satu record (deque terbatas) serta satu baris log JSON di logger
+``pok.stages``. Memori puncak hanya diukur bila tracemalloc aktif (env
+POK_TRACEMALLOC=1), karena tracemalloc memperlambat alokasi di seluruh
+proses. Puncaknya milik proses, bukan tahap: alokasi tahap yang berjalan
+bersamaan (sesi/thread lain) ikut terhitung, dan reset_peak dari tahap lain
+menghapus puncak yang sedang diukur. Angka peak_kb hanya tepat bila tahap
+berjalan sendiri (CLI, benchmark).
+"""
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger("pok.stages")
+
+STAGE_MAX_RECORDS = 200
+
+
+def configure_logging():
+    # Pasang handler stderr bila aplikasi belum mengatur logging sendiri.
+    # Level dari env POK_LOG_LEVEL (default INFO); POK_TRACEMALLOC=1 langsung
+    # menyalakan pengukuran memori untuk seluruh proses.
+    pok_logger = logging.getLogger("pok")
+    if not pok_logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(name)s %(levelname)s %(message)s"))
+        pok_logger.addHandler(handler)
+    pok_logger.setLevel(os.environ.get("POK_LOG_LEVEL", "INFO").upper())
+    if os.environ.get("POK_TRACEMALLOC") == "1":
+        set_memory_tracing(True)
+
+
+def memory_tracing():
+    return tracemalloc.is_tracing()
+
+
+def set_memory_tracing(enabled):
+    if enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not enabled and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+class StageRecorder:
+    """Rekam (tahap, detik, memori puncak) per rerun; aman dipakai dari thread download."""
+
+    def __init__(self, max_records=STAGE_MAX_RECORDS):
+        self.records = deque(maxlen=max_records)
+        self.run = 0
+        self.context = {}
+        self._lock = threading.Lock()
+        # Stack tahap bertingkat per thread (untuk meneruskan puncak memori ke induk)
+        self._local = threading.local()
+
+    def new_run(self, **context):
+        """Mulai rerun baru; context (mis. hash file) ikut di setiap record/log."""
+        with self._lock:
+            self.run += 1
+            self.context = context
+
+    @contextmanager
+    def stage(self, name, **fields):
+        # Menghasilkan dict fields: isian yang baru diketahui di akhir tahap
+        # (mis. jumlah baris terbaca) bisa ditambahkan ke record
+        stack = self._local.__dict__.setdefault("stack", [])
+        tracing = tracemalloc.is_tracing()
+        frame = {"peak": 0}
+        if tracing:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        stack.append(frame)
+        error = None
+        start = time.perf_counter()
+        try:
+            yield fields
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            peak_kb = None
+            if tracing and tracemalloc.is_tracing():
+                # reset_peak di tahap anak menghapus puncak induk, jadi anak
+                # menitipkan puncaknya di frame induk
+                peak = max(tracemalloc.get_traced_memory()[1], frame["peak"])
+                peak_kb = round((peak - base) / 1024, 1)
+                if stack:
+                    stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            self._record(name, seconds, peak_kb, error, fields)
+
+    def _record(self, name, seconds, peak_kb, error, fields):
+        with self._lock:
+            record = {"run": self.run, "stage": name, "seconds": round(seconds, 4), "peak_kb": peak_kb}
+            record.update(fields)
+            if error:
+                record["error"] = error
+            self.records.append(record)
+            context = dict(self.context)
+        logger.info(json.dumps({"event": "stage", **context, **record}, default=str))
+
+    def last(self, n=None):
+        """Record terbaru lebih dulu (maks. n)."""
+        with self._lock:
+            records = list(self.records)
+        records.reverse()
+        return records[:n] if n else records
@@ -0,0 +1,96 @@
+"""Penyimpanan dataset bersama untuk satu proses (semua sesi dashboard).
+
+Kunci berupa (hash isi file, sheet); nilai dibangun sekali lalu dipakai
+bersama oleh semua sesi yang membuka file yang sama. Nilai dianggap
+read-only: pemakai tidak boleh mengubahnya di tempat (copy-on-write pandas
+membuat turunan seperti filter/kolom baru tidak menyentuh frame bersama).
+"""
+import threading
+import weakref
+from collections import OrderedDict
+
+from .data import memory_footprint
+
+
+class DatasetStore:
+    """LRU dibatasi total byte, aman dipakai banyak thread.
+
+    - Builder untuk kunci yang sama hanya berjalan sekali walau beberapa sesi
+      meminta bersamaan; kunci berbeda dibangun paralel.
+    - Entri yang keluar dari LRU tetap dapat dipakai ulang selama masih
+      dirujuk sesi lain (weakref), jadi tidak pernah ada dua salinan dari
+      dataset yang sama di memori.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # kunci -> (nilai, byte)
+        self._nbytes = 0
+        self._alive = weakref.WeakValueDictionary()
+        self._building = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, key):
+        # Dipanggil dengan self._lock
+        if key in self._data:
+            self._data.move_to_end(key)
+            return self._data[key][0]
+        value = self._alive.get(key)
+        if value is not None:
+            self._insert(key, value)
+        return value
+
+    def _insert(self, key, value):
+        # Dipanggil dengan self._lock
+        nbytes = memory_footprint(value)
+        self._data[key] = (value, nbytes)
+        self._nbytes += nbytes
+        try:
+            self._alive[key] = value
+        except TypeError:
+            # Nilai tanpa dukungan weakref (mis. list) hanya hidup di LRU
+            pass
+        # Buang entri paling lama, kecuali entri yang baru masuk
+        while self._nbytes > self.max_bytes and len(self._data) > 1:
+            _, (_, old_bytes) = self._data.popitem(last=False)
+            self._nbytes -= old_bytes
+
+    def get_or_build(self, key, builder):
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            key_lock = self._building.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                # Sesi lain mungkin sudah selesai membangun selama kita menunggu
+                value = self._lookup(key)
+                if value is not None:
+                    self.hits += 1
+                    return value
+                self.misses += 1
+            try:
+                value = builder()
+                with self._lock:
+                    self._insert(key, value)
+            finally:
+                with self._lock:
+                    self._building.pop(key, None)
+        return value
+
+    def get(self, key):
+        # Nilai yang sudah ada (atau None) tanpa membangun; tidak dihitung hit/miss
+        with self._lock:
+            return self._lookup(key)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._data), "nbytes": self._nbytes, "alive": len(self._alive),
+                    "hits": self.hits, "misses": self.misses}
+
+    def values(self):
+        with self._lock:
+            return [value for value, _ in self._data.values()]
@@ -0,0 +1,78 @@
+"""Workbook POK sintetis untuk benchmark dan uji beban.
+
+Struktur meniru sheet asli: baris kegiatan (KODE huruf), baris akun (KODE
+6 digit), kadang baris komponen (KODE angka), lalu baris rincian (KODE
+kosong) berisi VOL x HARGA = JUMLAH. JUMLAH baris induk = jumlah anaknya.
+"""
+import io
+import random
+
+from openpyxl import Workbook
+
+from .data import wajib
+
+UNITS = ["FTIK", "LPPM", "INSTITUT", "ULA", "OKPP", "HUMAS", "FASYA", "FEBI", "FUAD",
+         "PASCASARJANA", "RMB", "SENAT", "UPT BAHASA", "UPT TIPD", "UPT PUSTAKA", "CDC", "LPM", "SPI"]
+AKUN = {"521211": "Belanja Bahan", "521213": "Belanja Honor Output Kegiatan",
+        "522141": "Belanja Sewa", "524111": "Belanja Perjalanan Dinas Biasa",
+        "524113": "Belanja Perjalanan Dinas Dalam Kota", "525112": "Belanja Barang",
+        "526115": "Belanja Honor Lainnya"}
+KEGIATAN = ["Akreditasi Program Studi", "Koordinasi, Konsultasi, Undangan dan Rapat-rapat Perjalanan Dinas",
+            "Rapat Senat Terbuka Hari Jadi", "Penyusunan Laporan Kinerja", "Seminar Nasional dan Call for Paper",
+            "Pelatihan Penulisan Artikel Ilmiah Bereputasi Internasional", "Kegiatan Kemandirian Pesantren"]
+RINCIAN = ["Konsumsi Nasi Peserta dr luar kampus", "Snack Panitia", "Tiket Pesawat dari Medan Ke Jakarta",
+           "Uang Harian di Provinsi DKI Jakarta", "Penginapan di Banda Aceh", "Sewa Kain dan Dekorasi Panggung",
+           "Backdrop (6 m x 2,5 m)", "Honor Narasumber Eselon II", "Pencetakan buku Monograf"]
+SAT = ["OK", "ktk", "bh", "OH", "PP", "mtr", "lbr", "Keg", "Pack", "LS"]
+SD = ["A00", "D00"]
+
+
+def _rows(n_rows, rng):
+    mak_pool = [f"2132.B{c}.{rng.randint(1, 9):03d}.{rng.randint(1, 9):03d}" for c in ("AA", "EI", "DB", "CG")]
+    rows = []
+    while len(rows) < n_rows:
+        unit = rng.choice(UNITS)
+        mak = rng.choice(mak_pool)
+        head = [unit, mak, rng.choice("ABCDEF") + rng.choice("ABCDEFGHIJ"),
+                f"{unit} - {rng.choice(KEGIATAN)} [0000 - Pusat]", None, None, None, 0, "", ""]
+        rows.append(head)
+        for akun in rng.sample(sorted(AKUN), rng.randint(1, 3)):
+            akun_row = [unit, mak, akun, AKUN[akun], None, None, None, 0, "", rng.choice(SD)]
+            rows.append(akun_row)
+            parents = [head, akun_row]
+            if rng.random() < 0.1:
+                komp = [unit, mak, f"{rng.randint(1, 99):03d}", "Komponen pendukung kegiatan",
+                        None, None, None, 0, "", ""]
+                rows.append(komp)
+                parents.append(komp)
+            for i in range(1, rng.randint(2, 15)):
+                uraian = f"00.00. {i:02d} -{rng.choice(RINCIAN)} ({rng.randint(1, 40)} org x {rng.randint(1, 5)} kali)"
+                if rng.random() < 0.05:
+                    # URAIAN panjang (wrap di PDF)
+                    uraian += " " + " ".join(rng.choice(RINCIAN) for _ in range(rng.randint(4, 10)))
+                uraian += f" ({rng.randint(1, 9999):06d})"
+                vol = rng.randint(1, 300)
+                harga = rng.randint(1, 500) * 10000
+                rows.append([unit, mak, "", uraian, vol, rng.choice(SAT), harga, vol * harga, "", ""])
+                for parent in parents:
+                    parent[7] += vol * harga
+    return rows[:n_rows]
+
+
+def synthetic_workbook(n_rows, n_sheets=1, seed=0, extra_cols=0):
+    """Bytes .xlsx berisi n_sheets sheet ("DIPA 1", ...) masing-masing n_rows baris.
+
+    extra_cols menambah kolom di luar kolom wajib (sheet lebar, seperti
+    ekspor SAKTI dengan kolom tambahan).
+    """
+    rng = random.Random(seed)
+    wb = Workbook(write_only=True)
+    extra = [f"KET {i}" for i in range(1, extra_cols + 1)]
+    for s in range(1, n_sheets + 1):
+        ws = wb.create_sheet(f"DIPA {s}")
+        ws.append(wajib + extra)
+        for n, row in enumerate(_rows(n_rows, rng)):
+            ws.append(row + [n * 1000 + i if i % 2 else f"catatan {n}-{i}" for i in range(extra_cols)])
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
@@ -0,0 +1,66 @@
+"""HTML tabel data untuk dashboard (satu halaman baris)."""
+import pandas as pd
+
+from .data import KELAS_COL
+from .numfmt import format_numbers
+
+
+def table_html(df_page, numbers=None):
+    """CSS + tabel HTML untuk potongan baris df_page (sudah dipotong per halaman).
+
+    numbers: string tampilan VOL/HARGA/JUMLAH untuk baris df_page (mis.
+    NumberStrings.rows); bila None diformat di sini.
+    """
+    df_html = df_page.copy()
+    # Angka sebagai string tampilan (titik sebagai pemisah ribuan)
+    if numbers is None:
+        numbers = format_numbers(df_page)
+    for col in numbers.columns:
+        df_html[col] = numbers[col].to_numpy(dtype=object)
+
+    cols = [c for c in df_html.columns if c != KELAS_COL]
+    # Build CSS: sticky header, spacing, alignment for numeric columns, and our conditional classes
+    css_parts = [
+        "<style>",
+        "table.dataframe{border-collapse:collapse;width:100%;font-family:Arial,Helvetica,sans-serif}",
+        "table.dataframe td, table.dataframe th{padding:2px 6px;font-size:11px;line-height:1.1}",
+        "table.dataframe thead th{position:sticky;top:0;background:#E0E0E0;z-index:3;text-align:center}",
+        # classes for rows where KODE is text, numeric, or 6-digit
+        ".kode-text td{background:#CCE5FF}",
+        ".kode-numeric td.numeric{font-weight:700;font-style:italic}",
+        ".kode-6digit td{font-weight:700;font-style:italic}",
+    ]
+
+    # Add right alignment for VOL/HARGA/JUMLAH if present
+    for colname in ("VOL", "HARGA", "JUMLAH"):
+        if colname in cols:
+            idx = cols.index(colname) + 1
+            css_parts.append(f"table.dataframe td:nth-child({idx}){{text-align:right}}")
+
+    css_parts.append("</style>")
+    css = "".join(css_parts)
+
+    # Build HTML table manually so we can add row classes based on KODE value
+    header_cells = "".join([f"<th>{c}</th>" for c in cols])
+    rows_html = []
+    # Row class comes from the KODE classification computed at load time
+    kode_css = {"empty": "", "text": "kode-text", "six": "kode-6digit", "numeric": "kode-numeric"}
+    for row, row_kelas in zip(df_html[cols].itertuples(index=False), df_html[KELAS_COL]):
+        row_class = kode_css[row_kelas]
+
+        # Build cells; mark numeric columns with class 'numeric' so CSS can target them
+        cell_html = []
+        for c, v in zip(cols, row):
+            cell_value = "" if pd.isna(v) else str(v)
+            td_class = "numeric" if c in {"VOL", "HARGA", "JUMLAH"} else ""
+            if td_class:
+                cell_html.append(f"<td class='{td_class}'>{cell_value}</td>")
+            else:
+                cell_html.append(f"<td>{cell_value}</td>")
+
+        tr = f"<tr class='{row_class}'>" + "".join(cell_html) + "</tr>"
+        rows_html.append(tr)
+
+    table = f"<table class='dataframe'><thead><tr>{header_cells}</tr></thead><tbody>{''.join(rows_html)}</tbody></table>"
+    container_html = f'<div style="max-height:400px;overflow:auto">{table}</div>'
+    return css + container_html
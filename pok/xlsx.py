@@ -0,0 +1,266 @@
+"""Pembaca .xlsx ringan: baris sheet dialirkan langsung dari XML di dalam zip.
+
+Dipakai untuk sheet POK yang panjang: tidak ada model objek per sel seperti
+openpyxl, dan sel di luar kolom yang diminta dilewati sebelum nilainya
+diurai. Nilai sel mengikuti openpyxl (data_only): angka -> int/float, tanggal
+-> datetime, boolean -> bool, error -> string kode error (None dengan
+errors_as_none, seperti pd.read_excel).
+"""
+import posixpath
+import zipfile
+from xml.etree.ElementTree import XMLParser, fromstring, iterparse
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_ISO8601, from_excel
+
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+DIGITS = "0123456789"
+READ_CHUNK_BYTES = 1 << 16
+
+
+def _local(tag):
+    return tag.rpartition("}")[2]
+
+
+def _column_index(letters):
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+
+class XlsxReader:
+    """Buka workbook .xlsx (path atau file-like); pakai sebagai context manager."""
+
+    def __init__(self, source, errors_as_none=False):
+        self._zip = zipfile.ZipFile(source)
+        self.errors_as_none = errors_as_none
+        self._shared_strings = None
+        self._date_styles = None
+        self._load_workbook()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._zip.close()
+
+    def _rels(self, part):
+        # Relationship Id -> path part di dalam zip
+        folder, name = posixpath.split(part)
+        rels_part = posixpath.join(folder, "_rels", name + ".rels")
+        if rels_part not in self._zip.namelist():
+            return {}
+        targets = {}
+        for rel in fromstring(self._zip.read(rels_part)):
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(folder, target))
+            targets[rel.get("Id")] = (rel.get("Type", ""), target)
+        return targets
+
+    def _load_workbook(self):
+        workbook_part = "xl/workbook.xml"
+        for rel_type, target in self._rels("").values():
+            if rel_type.endswith("/officeDocument"):
+                workbook_part = target
+        root = fromstring(self._zip.read(workbook_part))
+        rels = self._rels(workbook_part)
+        self._epoch = CALENDAR_WINDOWS_1900
+        self._sheets = {}
+        self._parts = {}
+        for elem in root.iter():
+            tag = _local(elem.tag)
+            if tag == "workbookPr" and elem.get("date1904") in ("1", "true"):
+                self._epoch = CALENDAR_MAC_1904
+            elif tag == "sheet":
+                self._sheets[elem.get("name")] = rels.get(elem.get(REL_NS + "id"), ("", None))[1]
+        for rel_type, target in rels.values():
+            self._parts[rel_type.rpartition("/")[2]] = target
+
+    @property
+    def sheet_names(self):
+        return list(self._sheets)
+
+    @property
+    def shared_strings(self):
+        if self._shared_strings is None:
+            self._shared_strings = []
+            part = self._parts.get("sharedStrings")
+            if part and part in self._zip.namelist():
+                with self._zip.open(part) as f:
+                    for _, elem in iterparse(f):
+                        if _local(elem.tag) == "si":
+                            # Teks langsung (t) atau gabungan run (r/t); rPh (fonetik) diabaikan
+                            parts = []
+                            for child in elem:
+                                name = _local(child.tag)
+                                if name == "t":
+                                    parts.append(child.text or "")
+                                elif name == "r":
+                                    parts.extend(t.text or "" for t in child if _local(t.tag) == "t")
+                            self._shared_strings.append("".join(parts))
+                            elem.clear()
+        return self._shared_strings
+
+    @property
+    def date_styles(self):
+        # Indeks cellXfs yang format angkanya tanggal/waktu
+        if self._date_styles is None:
+            self._date_styles = set()
+            part = self._parts.get("styles")
+            if part and part in self._zip.namelist():
+                root = fromstring(self._zip.read(part))
+                formats = dict(BUILTIN_FORMATS)
+                for elem in root.iter():
+                    if _local(elem.tag) == "numFmt":
+                        formats[int(elem.get("numFmtId"))] = elem.get("formatCode", "")
+                for child in root:
+                    if _local(child.tag) == "cellXfs":
+                        for i, xf in enumerate(child):
+                            code = formats.get(int(xf.get("numFmtId", 0)))
+                            if code and is_date_format(code):
+                                self._date_styles.add(i)
+        return self._date_styles
+
+    def _value(self, kind, style, text):
+        if kind is None or kind == "n":
+            value = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+            if style is not None and int(style) in self.date_styles:
+                return from_excel(value, self._epoch)
+            return value
+        if kind == "s":
+            return self.shared_strings[int(text)]
+        if kind == "b":
+            return text == "1"
+        if kind == "d":
+            return from_ISO8601(text)
+        if kind == "e" and self.errors_as_none:
+            return None
+        # inlineStr, str (hasil formula) dan e (kode error)
+        return text
+
+    def iter_rows(self, sheet_name, columns=None):
+        """Baris sheet sebagai tuple nilai.
+
+        columns: daftar indeks kolom (0-based) yang diambil, dalam urutan
+        tuple; None = semua kolom sampai sel terakhir di baris itu. Baris
+        kosong di tengah tetap dihasilkan (tuple berisi None), baris kosong
+        di akhir sheet tidak.
+        """
+        if sheet_name not in self._sheets:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        part = self._sheets[sheet_name]
+        if part is None or part not in self._zip.namelist():
+            return
+        handler = _SheetHandler(self, columns)
+        parser = XMLParser(target=handler)
+        with self._zip.open(part) as f:
+            while True:
+                chunk = f.read(READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                parser.feed(chunk)
+                if handler.rows:
+                    yield from handler.rows
+                    handler.rows = []
+        parser.close()
+
+
+class _SheetHandler:
+    # Target XMLParser (callback expat langsung, tanpa Element per sel).
+    # Baris lengkap dikumpulkan di self.rows dan diambil iter_rows per chunk.
+
+    def __init__(self, reader, columns):
+        self.reader = reader
+        self.slots = None if columns is None else {col: i for i, col in enumerate(columns)}
+        self.width = 0 if columns is None else len(columns)
+        self.rows = []
+        self.letters_cache = {}
+        self.pending_empty = 0
+        self.next_row = 1
+        self.row_number = None
+        self.values = {}
+        self.filled = False
+        self.next_col = 0
+        self.slot = None
+        self.kind = self.style = None
+        self.text = None
+        self.C = None
+
+    def _names(self, tag):
+        ns = tag[:tag.index("}") + 1] if tag.startswith("{") else ""
+        self.C, self.ROW, self.V, self.T, self.IS = ns + "c", ns + "row", ns + "v", ns + "t", ns + "is"
+
+    def start(self, tag, attrib):
+        if self.C is None:
+            self._names(tag)
+        if tag == self.C:
+            ref = attrib.get("r")
+            if ref:
+                letters = ref.rstrip(DIGITS)
+                col = self.letters_cache.get(letters)
+                if col is None:
+                    col = self.letters_cache[letters] = _column_index(letters)
+            else:
+                col = self.next_col
+            self.next_col = col + 1
+            # Kolom yang tidak diminta: nilainya tidak diurai (slot None)
+            self.slot = col if self.slots is None else self.slots.get(col)
+            self.kind = attrib.get("t")
+            self.style = attrib.get("s")
+        elif tag == self.V or (tag == self.T and self.kind == "inlineStr"):
+            if self.slot is None:
+                self.filled = True
+            else:
+                self.text = []
+        elif tag == self.ROW:
+            r = attrib.get("r")
+            self.row_number = int(r) if r else self.next_row
+
+    def data(self, text):
+        if self.text is not None:
+            self.text.append(text)
+
+    def end(self, tag):
+        if tag == self.V or (tag == self.T and self.text is not None):
+            if self.text is not None:
+                text = "".join(self.text)
+                self.text = None
+                if tag == self.V and not text:
+                    # <v/> kosong (mis. formula tanpa hasil tersimpan) = sel kosong
+                    return
+                value = self.reader._value(self.kind, self.style, text)
+                if tag == self.T and self.slot in self.values:
+                    # inlineStr dengan beberapa run teks
+                    value = self.values[self.slot] + value
+                if value != "":
+                    self.filled = True
+                self.values[self.slot] = value
+        elif tag == self.C:
+            self.slot = None
+        elif tag == self.ROW:
+            row_number = self.row_number
+            if self.filled:
+                # Baris kosong (termasuk yang tidak ada di XML) sebelum baris ini
+                self.pending_empty += row_number - self.next_row
+                if self.pending_empty:
+                    self.rows.extend([(None,) * self.width] * self.pending_empty)
+                    self.pending_empty = 0
+                values = self.values
+                width = self.width if self.slots is not None else max(values) + 1
+                self.rows.append(tuple(values.get(i) for i in range(width)))
+            else:
+                self.pending_empty += row_number - self.next_row + 1
+            self.next_row = row_number + 1
+            self.values = {}
+            self.filled = False
+            self.next_col = 0
+
+    def close(self):
+        pass
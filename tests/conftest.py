@@ -0,0 +1,136 @@
+import io
+import os
+import zipfile
+from xml.sax.saxutils import escape
+
+import pytest
+
+from pok.synth import synthetic_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_XLSX = os.path.join(ROOT, "POK contoh.xlsx")
+SAMPLE_SHEET = "DIPA 8"
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '</Types>')
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>')
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="DIPA 1" sheetId="1" r:id="rId1"/></sheets></workbook>')
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" '
+    'Target="sharedStrings.xml"/></Relationships>')
+# Style 0 = umum, style 1 = tanggal (numFmtId 14)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+    '</styleSheet>')
+
+# Baris sheet (nomor baris Excel, [sel]); sel = (kolom, XML isi <c>).
+# Shared string ditulis sebagai ("s", teks).
+_HEADER = ["UNIT", "MAK", "KODE", "URAIAN", "VOL", "SAT", "HARGA", "JUMLAH", "RO", "SD", "KET"]
+EDGE_ROWS = [
+    (1, [("A", ("s", "RINCIAN POK TA 2025"))]),
+    (2, [(chr(65 + i), ("s", name)) for i, name in enumerate(_HEADER)]),
+    (3, [("A", ("s", "FTIK ")), ("B", ("s", "2132.BAA.001.051")), ("C", ("s", "AA")),
+         ("D", ("s", "FTIK - Akreditasi")), ("H", '<f>SUM(H4:H5)</f><v>1500000</v>'), ("K", ("s", "catatan"))]),
+    (4, [("A", ("s", "FTIK ")), ("B", ("s", "2132.BAA.001.051")), ("C", '<v>521211</v>'),
+         ("D", ("s", "Belanja Bahan")), ("H", '<f>SUM(H5:H5)</f>'), ("J", ("s", "A00"))]),
+    (5, [("A", ("s", "FTIK ")), ("B", ("s", "2132.BAA.001.051")),
+         ("D", ' t="inlineStr"><is><r><t>Snack </t></r><r><t xml:space="preserve">Panitia (20 org)</t></r></is>'),
+         ("E", '<v>20</v>'), ("F", ' t="inlineStr"><is><t>OK</t></is>'), ("G", '<v>75000</v>'),
+         ("H", '<f>E5*G5</f><v>1500000</v>'), ("I", ' s="1"><v>45658</v>'), ("J", ("s", "NA"))]),
+    # baris 6-7 kosong (tidak ada di XML), baris 8 hanya sel tanpa nilai
+    (8, [("A", ' s="1"'), ("D", ("s", ""))]),
+    (9, [("A", ("s", "LPPM")), ("C", ("s", "n/a")), ("D", ' t="str"><f>"Hasil "&amp;"formula"</f><v>Hasil formula</v>'),
+         ("E", '<v>2.5</v>'), ("F", ' t="e"><v>#N/A</v>'), ("G", '<v>1000.4</v>'), ("H", '<v>2501</v>'),
+         ("I", ' t="b"><v>1</v>'), ("J", ("s", "None"))]),
+    (10, [("A", ("s", "LPPM")), ("C", '<v>524111.0</v>'), ("D", ("s", "#DIV/0!")), ("E", ' t="e"><v>#DIV/0!</v>'),
+          ("G", ("s", "12.000")), ("H", ("s", "-")), ("K", '<v>99</v>')]),
+    (11, [("D", ("s", "baris tanpa UNIT")), ("H", '<v>-0</v>'), ("I", ' s="1"><v>45658.5</v>')]),
+]
+
+
+def _edge_xlsx(rows=EDGE_ROWS):
+    strings = []
+    cells_xml = []
+    for number, cells in rows:
+        parts = []
+        for col, content in cells:
+            if isinstance(content, tuple):
+                if content[1] not in strings:
+                    strings.append(content[1])
+                content = f' t="s"><v>{strings.index(content[1])}</v>'
+            elif not content.startswith(" "):
+                content = ">" + content
+            if content.startswith(" ") and ">" not in content:
+                parts.append(f'<c r="{col}{number}"{content}/>')
+            else:
+                parts.append(f'<c r="{col}{number}"{content}</c>')
+        cells_xml.append(f'<row r="{number}">{"".join(parts)}</row>')
+    sheet = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+             '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+             f'<sheetData>{"".join(cells_xml)}</sheetData></worksheet>')
+    shared = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+              '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+              f'count="{len(strings)}" uniqueCount="{len(strings)}">'
+              + "".join(f'<si><t xml:space="preserve">{escape(s)}</t></si>' for s in strings) + '</sst>')
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        zf.writestr("xl/styles.xml", _STYLES)
+        zf.writestr("xl/sharedStrings.xml", shared)
+        zf.writestr("xl/worksheets/sheet1.xml", sheet)
+    return out.getvalue()
+
+
+@pytest.fixture(scope="session")
+def sample_xlsx():
+    with open(SAMPLE_XLSX, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="session")
+def synthetic_xlsx():
+    # 2 sheet ("DIPA 1", "DIPA 2") dengan kolom tambahan di luar kolom wajib
+    return synthetic_workbook(1500, n_sheets=2, seed=7, extra_cols=3)
+
+
+@pytest.fixture(scope="session")
+def edge_xlsx():
+    # Sheet "DIPA 1": judul di atas header, tanggal, string NA, baris kosong,
+    # formula (dengan dan tanpa hasil tersimpan), inline string, error, boolean
+    return _edge_xlsx()
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_script(tmp_path, source):
+    # Interpreter baru: yang diuji adalah state global multiprocessing
+    script = tmp_path / "main_script.py"
+    script.write_text(textwrap.dedent(source))
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, str(script)], cwd=tmp_path, env=env, capture_output=True, text=True,
+                            timeout=120)
+    assert result.returncode == 0, result.stderr
+    return result.stdout.split()
+
+
+def test_other_processes_unaffected_by_pok(tmp_path):
+    # Target di __main__ hanya bisa di-unpickle bila worker menjalankan ulang
+    # __main__ seperti biasa; pok tidak boleh mengubahnya, sebelum maupun
+    # sesudah pool pok dipakai
+    out = _run_script(tmp_path, """
+        import multiprocessing
+        from multiprocessing import forkserver, spawn
+
+        original = spawn.get_preparation_data
+        import pok
+        from pok.batch import file_stem, process_pool
+
+
+        def child(queue):
+            queue.put(__name__)
+
+
+        def run_other(method):
+            ctx = multiprocessing.get_context(method)
+            queue = ctx.Queue()
+            process = ctx.Process(target=child, args=(queue,))
+            process.start()
+            name = queue.get(timeout=60)
+            process.join()
+            return f"{method}:{name}:{process.exitcode}"
+
+
+        if __name__ == "__main__":
+            methods = [m for m in multiprocessing.get_all_start_methods() if m != "fork"]
+            assert spawn.get_preparation_data is original
+            assert forkserver._forkserver._preload_modules == ["__main__"]
+            print(*(run_other(m) for m in methods))
+            with process_pool(1) as pool:
+                assert pool.submit(file_stem, " A/B ").result() == "A-B"
+            assert spawn.get_preparation_data is original
+            assert forkserver._forkserver._preload_modules == ["__main__"]
+            print(*(run_other(m) for m in methods))
+    """)
+    assert out and all(item.endswith(":__mp_main__:0") for item in out)
+
+
+def test_pool_workers_do_not_rerun_main(tmp_path):
+    # Seperti script dashboard saat rerun Streamlit: __main__ tanpa guard
+    out = _run_script(tmp_path, """
+        print("main")
+        from pok.batch import file_stem, process_pool
+
+        with process_pool(2) as pool:
+            print(*pool.map(file_stem, ["x", "y/z"]))
+    """)
+    assert out == ["main", "x", "y-z"]
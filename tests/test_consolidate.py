@@ -0,0 +1,31 @@
+import pandas as pd
+
+import pok.consolidate
+from pok.consolidate import iter_sheet_loads, load_sheets, rekap_sheets
+from pok.data import load_sheet
+
+
+def test_load_sheets_matches_load_sheet(synthetic_xlsx):
+    frames = load_sheets(synthetic_xlsx, ["DIPA 2", "DIPA 1"], max_workers=2)
+    assert list(frames) == ["DIPA 2", "DIPA 1"]
+    for sheet, frame in frames.items():
+        pd.testing.assert_frame_equal(frame, load_sheet(synthetic_xlsx, sheet))
+    table = rekap_sheets(frames)
+    assert list(table.columns) == ["UNIT", "DIPA 2", "DIPA 1", "Selisih DIPA 1"]
+
+
+def test_pool_size_is_capped(monkeypatch, synthetic_xlsx):
+    sizes = []
+    real_pool = pok.consolidate.process_pool
+
+    def recording_pool(max_workers=None):
+        sizes.append(max_workers)
+        return real_pool(max_workers)
+
+    monkeypatch.setattr(pok.consolidate, "process_pool", recording_pool)
+    monkeypatch.setattr(pok.consolidate.os, "cpu_count", lambda: 1)
+    # Default = jumlah CPU: satu CPU -> dimuat berurutan tanpa pool
+    assert len(list(iter_sheet_loads(synthetic_xlsx, ["DIPA 1", "DIPA 2"]))) == 2
+    # Tidak pernah lebih dari jumlah sheet
+    assert len(list(iter_sheet_loads(synthetic_xlsx, ["DIPA 1", "DIPA 2"], max_workers=8))) == 2
+    assert sizes == [2]
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from pok.data import (
+    KELAS_COL, KODE_KELAS, UnitIndex, classify_kode, filter_unit, kelas_kode, list_units, load_sheet, total_akun,
+)
+
+from conftest import SAMPLE_SHEET
+
+
+@pytest.fixture(scope="module", params=["sample", "synthetic", "edge"])
+def df(request, sample_xlsx, synthetic_xlsx, edge_xlsx):
+    if request.param == "sample":
+        return load_sheet(sample_xlsx, SAMPLE_SHEET)
+    return load_sheet(synthetic_xlsx if request.param == "synthetic" else edge_xlsx, "DIPA 1")
+
+
+def _units(df):
+    # Semua unit + seluruh sheet, UNIT kosong, dan unit yang tidak ada
+    return list_units(df) + [None, "", "TIDAK ADA"]
+
+
+def test_unit_index_rows_match_filter_unit(df):
+    index = UnitIndex(df)
+    assert index.units == list_units(df)
+    for unit in _units(df):
+        assert_frame_equal(index.rows(df, unit), filter_unit(df, unit))
+
+
+def test_unit_index_total_matches_total_akun(df):
+    index = UnitIndex(df)
+    for unit in _units(df):
+        expected = total_akun(filter_unit(df, unit))
+        assert index.total_akun(unit) == pytest.approx(expected, rel=1e-12)
+        assert type(index.total_akun(unit)) is type(expected)
+
+
+def test_unit_index_after_filtering_rows(df):
+    # Frame hasil saring (indeks tidak berurutan) tetap setara
+    subset = df.iloc[::3]
+    index = UnitIndex(subset)
+    for unit in _units(subset):
+        assert_frame_equal(index.rows(subset, unit), filter_unit(subset, unit))
+        assert index.total_akun(unit) == pytest.approx(total_akun(filter_unit(subset, unit)), rel=1e-12)
+
+
+# (KODE, kelas): level kode di POK -> kelas baris
+KODE_CASES = [
+    (None, "empty"), (np.nan, "empty"), ("", "empty"), ("   ", "empty"),
+    ("2132", "numeric"), ("051", "numeric"), ("001", "numeric"), ("A", "text"),  # program/kegiatan/KRO/komponen
+    ("AA", "text"), ("BAA", "text"),
+    ("521211", "six"), (" 524111 ", "six"), ("5211", "numeric"), ("5212110", "numeric"),  # akun 6 digit
+    ("52121a", "text"), ("-", "text"), ("521.211", "text"),  # bukan angka murni
+]
+
+
+def test_classify_kode_levels():
+    kode = pd.Series([k for k, _ in KODE_CASES], index=range(10, 10 + len(KODE_CASES)), dtype=object)
+    kelas = classify_kode(kode)
+    assert kelas.name == KELAS_COL
+    assert list(kelas.cat.categories) == KODE_KELAS
+    assert kelas.index.equals(kode.index)
+    assert kelas.tolist() == [k for _, k in KODE_CASES]
+
+
+@pytest.mark.parametrize("dtype", ["category", "str"])
+def test_classify_kode_dtypes_agree(dtype):
+    # Categorical (hasil load_sheet) dan string memberi kelas yang sama dengan object
+    kode = pd.Series([k for k, _ in KODE_CASES] * 3, dtype=object)
+    expected = classify_kode(kode)
+    pd.testing.assert_series_equal(classify_kode(kode.astype(dtype)), expected)
+
+
+def test_loaded_kelas_matches_classify_kode(df):
+    # Kolom kelas dari load_sheet sama dengan klasifikasi ulang KODE
+    pd.testing.assert_series_equal(kelas_kode(df), classify_kode(df["KODE"]))
@@ -0,0 +1,115 @@
+from collections import Counter, defaultdict, deque
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pok.data import NUMERIC_COLS, clean_sheet, load_sheet, total_akun, wajib
+from pok.diff import (DIFF_KEYS, STATUS_ADDED, STATUS_CHANGED, STATUS_COL, STATUS_REMOVED, diff_export_frame,
+                      diff_rekap, diff_sheets)
+
+from conftest import SAMPLE_SHEET
+
+
+def _rows(dataframe):
+    keys = dataframe[DIFF_KEYS].astype(str).itertuples(index=False, name=None)
+    values = dataframe[NUMERIC_COLS].astype(float).itertuples(index=False, name=None)
+    return [(k, tuple(None if np.isnan(v) else v for v in vals)) for k, vals in zip(keys, values)]
+
+
+def brute_force_diff(old, new):
+    """Selisih dengan pemasangan satu per satu: baris identik dulu, lalu per kunci (ke-n dengan ke-n)."""
+    old_rows, new_rows = _rows(old), _rows(new)
+
+    def pair(old_idx, new_idx, key):
+        waiting = defaultdict(deque)
+        for i in old_idx:
+            waiting[key(old_rows[i])].append(i)
+        pairs, rest_new = [], []
+        for j in new_idx:
+            queue = waiting.get(key(new_rows[j]))
+            if queue:
+                pairs.append((queue.popleft(), j))
+            else:
+                rest_new.append(j)
+        paired_old = {i for i, _ in pairs}
+        return pairs, [i for i in old_idx if i not in paired_old], rest_new
+
+    _, rest_old, rest_new = pair(range(len(old_rows)), range(len(new_rows)), lambda row: row)
+    changed, removed, added = pair(rest_old, rest_new, lambda row: row[0])
+    result = [(STATUS_CHANGED, j, new_rows[j][0], old_rows[i][1], new_rows[j][1]) for i, j in changed]
+    result += [(STATUS_ADDED, j, new_rows[j][0], (None,) * 3, new_rows[j][1]) for j in added]
+    result += [(STATUS_REMOVED, None, old_rows[i][0], old_rows[i][1], (None,) * 3) for i in removed]
+    return result
+
+
+def _lines_as_tuples(lines):
+    def values(suffix):
+        frame = lines[[f"{col} {suffix}" for col in NUMERIC_COLS]].astype(float)
+        return [tuple(None if np.isnan(v) else v for v in row) for row in frame.itertuples(index=False, name=None)]
+
+    keys = list(lines[DIFF_KEYS].itertuples(index=False, name=None))
+    return list(zip(lines[STATUS_COL], keys, values("LAMA"), values("BARU")))
+
+
+def _revise(dataframe, seed=0):
+    # Revisi acak: ubah JUMLAH/VOL, hapus, sisip (termasuk kunci ganda) dan tukar urutan
+    rng = np.random.default_rng(seed)
+    raw = dataframe[wajib].astype({col: object for col in wajib if col not in NUMERIC_COLS}).copy()
+    n = len(raw)
+    changed = rng.choice(n, size=n // 20, replace=False)
+    raw.loc[changed[: len(changed) // 2], "JUMLAH"] = raw.loc[changed[: len(changed) // 2], "JUMLAH"].fillna(0) + 1000
+    raw.loc[changed[len(changed) // 2:], "VOL"] = 7
+    raw = raw.drop(index=rng.choice(n, size=n // 25, replace=False))
+    inserted = raw.sample(n=n // 30, random_state=seed).assign(URAIAN=lambda f: f["URAIAN"] + " (baru)")
+    duplicates = raw.sample(n=10, random_state=seed + 1)
+    raw = pd.concat([raw, inserted, duplicates]).sample(frac=1, random_state=seed)
+    return clean_sheet(raw.reset_index(drop=True))
+
+
+@pytest.fixture(scope="module")
+def sample(sample_xlsx):
+    return load_sheet(sample_xlsx, SAMPLE_SHEET)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_diff_matches_brute_force(sample, seed):
+    revised = _revise(sample, seed)
+    lines = diff_sheets(sample, revised)
+    expected = brute_force_diff(sample, revised)
+    assert Counter(_lines_as_tuples(lines)) == Counter(
+        (status, keys, old, new) for status, _, keys, old, new in expected)
+    # Baris tambah/ubah mengikuti urutan sheet baru
+    in_new_order = [keys for _, j, keys, _, _ in sorted((e for e in expected if e[1] is not None), key=lambda e: e[1])]
+    not_removed = lines[lines[STATUS_COL] != STATUS_REMOVED]
+    assert list(not_removed[DIFF_KEYS].itertuples(index=False, name=None)) == in_new_order
+
+
+def test_diff_between_unrelated_sheets(synthetic_xlsx):
+    old, new = load_sheet(synthetic_xlsx, "DIPA 1"), load_sheet(synthetic_xlsx, "DIPA 2")
+    lines = diff_sheets(old, new)
+    assert Counter(_lines_as_tuples(lines)) == Counter(
+        (status, keys, a, b) for status, _, keys, a, b in brute_force_diff(old, new))
+
+
+def test_identical_sheets_have_no_diff(sample):
+    assert diff_sheets(sample, sample).empty
+    rekap = diff_rekap(sample, sample)
+    assert (rekap["SELISIH"] == 0).all()
+
+
+def test_diff_rekap_totals(sample):
+    revised = _revise(sample)
+    rekap = diff_rekap(sample, revised)
+    assert rekap["LAMA"].sum() == pytest.approx(total_akun(sample))
+    assert rekap["BARU"].sum() == pytest.approx(total_akun(revised))
+    np.testing.assert_allclose(rekap["SELISIH"], rekap["BARU"] - rekap["LAMA"])
+
+
+def test_export_frame_uses_old_values_for_removed_rows(sample):
+    lines = diff_sheets(sample, _revise(sample))
+    frame = diff_export_frame(lines, ["JUMLAH"])
+    removed = (lines[STATUS_COL] == STATUS_REMOVED).to_numpy()
+    np.testing.assert_array_equal(frame["JUMLAH"].to_numpy()[removed], lines["JUMLAH LAMA"].to_numpy()[removed])
+    np.testing.assert_array_equal(frame["JUMLAH"].to_numpy()[~removed], lines["JUMLAH BARU"].to_numpy()[~removed])
+    assert list(frame.columns) == [STATUS_COL] + DIFF_KEYS + NUMERIC_COLS + ["SELISIH JUMLAH"]
@@ -0,0 +1,51 @@
+import os
+import stat
+
+import pandas as pd
+import pytest
+
+from pok.data import load_sheet
+from pok.diskcache import HAS_PYARROW, SheetDiskCache
+
+from conftest import SAMPLE_SHEET
+
+pytestmark = pytest.mark.skipif(not HAS_PYARROW, reason="butuh pyarrow")
+posix_only = pytest.mark.skipif(not hasattr(os, "getuid"), reason="izin folder POSIX")
+
+
+def test_round_trip(tmp_path, sample_xlsx):
+    cache = SheetDiskCache(str(tmp_path / "cache"), 2**30)
+    frame = load_sheet(sample_xlsx, SAMPLE_SHEET)
+    assert cache.load("abc", SAMPLE_SHEET) is None
+    cache.save("abc", SAMPLE_SHEET, frame)
+    pd.testing.assert_frame_equal(cache.load("abc", SAMPLE_SHEET), frame)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@posix_only
+def test_directory_is_private(tmp_path):
+    SheetDiskCache(str(tmp_path / "baru"), 2**20)
+    assert stat.S_IMODE(os.stat(tmp_path / "baru").st_mode) == 0o700
+    # Folder yang sudah ada dengan izin longgar diperketat
+    loose = tmp_path / "longgar"
+    loose.mkdir(mode=0o755)
+    os.chmod(loose, 0o755)
+    SheetDiskCache(str(loose), 2**20)
+    assert stat.S_IMODE(os.stat(loose).st_mode) == 0o700
+
+
+@posix_only
+def test_foreign_directory_is_refused(tmp_path, monkeypatch):
+    directory = tmp_path / "milik-lain"
+    directory.mkdir()
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(directory).st_uid + 1)
+    with pytest.raises(PermissionError):
+        SheetDiskCache(str(directory), 2**20)
+
+
+@posix_only
+def test_symlink_is_refused(tmp_path):
+    (tmp_path / "target").mkdir()
+    os.symlink(tmp_path / "target", tmp_path / "link")
+    with pytest.raises(PermissionError):
+        SheetDiskCache(str(tmp_path / "link"), 2**20)
@@ -0,0 +1,81 @@
+import io
+import re
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from pok.data import KELAS_COL, load_sheet
+from pok.excel import generate_excel
+
+from conftest import SAMPLE_SHEET
+
+BLUE = "CCE5FF"
+
+
+def _sheet(df):
+    wb = openpyxl.load_workbook(io.BytesIO(generate_excel(df)))
+    return wb["Rincian"]
+
+
+def _is_blue(cell):
+    return cell.fill.fill_type == "solid" and cell.fill.fgColor.rgb.endswith(BLUE)
+
+
+def _is_bold_italic(cell):
+    return bool(cell.font.b and cell.font.i)
+
+
+def test_styles_per_row_type():
+    df = pd.DataFrame({
+        "UNIT": ["FTIK", "FTIK", "FTIK", "FTIK"],
+        "KODE": ["AA", "051", "521211", ""],
+        "URAIAN": ["Akreditasi", "Rapat", "Belanja Bahan", "Snack"],
+        "VOL": [1.0, 2.0, 3.0, 4.0],
+        "SAT": ["OK", "12", "OK", "7"],
+    })
+    ws = _sheet(df)
+    rows = list(ws.iter_rows())
+    header, text_row, numeric_row, six_row, empty_row = rows
+
+    assert [c.value for c in header] == list(df.columns)
+    assert all(c.font.b and c.fill.fgColor.rgb.endswith("E0E0E0") for c in header)
+    # KODE berhuruf: seluruh baris biru, tanpa tebal
+    assert all(_is_blue(c) and not _is_bold_italic(c) for c in text_row)
+    # KODE angka: sel angka (VOL, teks "12", KODE sendiri) tebal+miring, tanpa isi
+    assert [_is_bold_italic(c) for c in numeric_row] == [False, True, False, True, True]
+    assert not any(_is_blue(c) for c in numeric_row)
+    # KODE 6 digit: seperti angka, sel KODE juga biru
+    assert [_is_bold_italic(c) for c in six_row] == [False, True, False, True, False]
+    assert [_is_blue(c) for c in six_row] == [False, True, False, False, False]
+    # KODE kosong: baris biasa
+    assert not any(_is_blue(c) or _is_bold_italic(c) for c in empty_row)
+
+
+def _expected(df):
+    # Aturan gaya per sel, ditulis ulang per baris sebagai pembanding
+    cols = [c for c in df.columns if c != KELAS_COL]
+    for row in df[cols].itertuples(index=False, name=None):
+        kode = row[cols.index("KODE")]
+        kode = "" if pd.isna(kode) else str(kode).strip()
+        is_text = kode != "" and not kode.isdigit()
+        is_numeric = kode != "" and kode.isdigit()
+        styles = []
+        for col, val in zip(cols, row):
+            if pd.api.types.is_numeric_dtype(df[col]):
+                number = True
+            else:
+                number = not pd.isna(val) and re.fullmatch(r"-?\d+(?:\.\d+)?", str(val).strip()) is not None
+            blue = is_text or (col == "KODE" and is_numeric and len(kode) == 6)
+            styles.append((blue, is_numeric and number))
+        yield styles
+
+
+@pytest.mark.parametrize("source,sheet", [("sample_xlsx", SAMPLE_SHEET), ("edge_xlsx", "DIPA 1")])
+def test_styles_match_rules(request, source, sheet):
+    df = load_sheet(request.getfixturevalue(source), sheet)
+    ws = _sheet(df)
+    rows = list(ws.iter_rows(min_row=2))
+    assert len(rows) == len(df)
+    for cells, styles in zip(rows, _expected(df)):
+        assert [(_is_blue(c), _is_bold_italic(c)) for c in cells] == styles
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+from pok.data import READ_CHUNK_ROWS, load_sheet
+from pok.ingest import BudgetExceeded, IngestBudget, fit_budget, load_sheet_within
+
+from conftest import SAMPLE_SHEET
+
+
+@pytest.fixture(scope="module")
+def sample_df(sample_xlsx):
+    return load_sheet(sample_xlsx, SAMPLE_SHEET)
+
+
+def test_fit_budget_without_limits(sample_df):
+    frame, report = fit_budget(sample_df, SAMPLE_SHEET)
+    assert frame is sample_df
+    assert report.truncated is None and report.rows == len(sample_df)
+
+
+@pytest.mark.parametrize("max_rows", [1, 1000, 3000])
+def test_fit_budget_rows_matches_ingest(sample_xlsx, sample_df, max_rows):
+    # Frame utuh dari cache lalu dipotong = ingest langsung dengan batas yang sama
+    budget = IngestBudget(max_rows=max_rows)
+    expected, expected_report = load_sheet_within(sample_xlsx, SAMPLE_SHEET, budget)
+    frame, report = fit_budget(sample_df, SAMPLE_SHEET, budget, len(sample_xlsx))
+    pd.testing.assert_frame_equal(frame.reset_index(drop=True), expected, check_categorical=False)
+    assert report.rows == expected_report.rows == max_rows
+    assert report.truncated == expected_report.truncated
+
+
+@pytest.mark.parametrize("max_memory", [20_000, 100_000, 200_000])
+def test_fit_budget_memory_matches_ingest(synthetic_xlsx, max_memory):
+    # Batas memori memotong di baris yang sama, dari cache disk maupun dibaca langsung
+    sheet = "DIPA 1"
+    budget = IngestBudget(max_memory=max_memory)
+    expected, expected_report = load_sheet_within(synthetic_xlsx, sheet, budget)
+    frame, report = fit_budget(load_sheet(synthetic_xlsx, sheet), sheet, budget)
+    assert expected_report.truncated and expected_report.truncated.startswith("batas memori")
+    assert 0 < report.rows == expected_report.rows < READ_CHUNK_ROWS
+    assert report.truncated == expected_report.truncated
+    assert report.frame_bytes == expected_report.frame_bytes <= max_memory
+    pd.testing.assert_frame_equal(frame.reset_index(drop=True), expected, check_categorical=False)
+
+
+def test_fit_budget_memory_across_chunks(sample_df):
+    big = pd.concat([sample_df] * 8, ignore_index=True)
+    budget = IngestBudget(max_memory=3_000_000)
+    frame, report = fit_budget(big, SAMPLE_SHEET, budget)
+    assert report.truncated and report.truncated.startswith("batas memori")
+    assert READ_CHUNK_ROWS < len(frame) == report.rows < len(big)
+    assert report.frame_bytes <= budget.max_memory
+
+
+def test_no_row_fits(sample_xlsx, sample_df):
+    budget = IngestBudget(max_memory=100)
+    with pytest.raises(BudgetExceeded):
+        load_sheet_within(sample_xlsx, SAMPLE_SHEET, budget)
+    with pytest.raises(BudgetExceeded):
+        fit_budget(sample_df, SAMPLE_SHEET, budget)
+
+
+def test_cached_report_has_no_throughput(sample_df):
+    _, report = fit_budget(sample_df, SAMPLE_SHEET)
+    report.seconds, report.cached = 0.001, True
+    assert report.rows_per_s is None
+    assert report.summary() == "3.214 baris dari cache disk dalam 0.00 dtk"
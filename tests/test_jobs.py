@@ -0,0 +1,106 @@
+import io
+import os
+import time
+import zipfile
+
+import pytest
+
+from pok.batch import EXPORT_FORMATS, export_all_units, export_unit, unit_export_args, zip_unit_exports
+from pok.data import load_sheet
+from pok.jobs import JOB_DONE, JOB_FAILED, JOB_RUNNING, ExportQueue, ExportQueueFull
+
+from conftest import SAMPLE_SHEET
+
+
+def _wait(job, timeout=120):
+    deadline = time.monotonic() + timeout
+    while job.status not in (JOB_DONE, JOB_FAILED):
+        assert time.monotonic() < deadline, f"job {job.label} belum selesai"
+        time.sleep(0.05)
+    return job
+
+
+@pytest.fixture
+def queue():
+    queue = ExportQueue(max_workers=1, max_pending=2)
+    yield queue
+    if queue._pool is not None:
+        queue._pool.shutdown()
+
+
+def test_same_key_is_built_once(queue):
+    first = queue.submit("k", "a", sorted, [3, 1, 2])
+    assert queue.submit("k", "a", sorted, [9]) is first
+    assert _wait(first).result == [1, 2, 3]
+
+
+def test_queue_limit(queue):
+    queue.submit("lama", "lama", time.sleep, 1)
+    queue.submit("a", "a", sorted, [1])
+    queue.submit("b", "b", sorted, [1])
+    with pytest.raises(ExportQueueFull):
+        queue.submit("c", "c", sorted, [1])
+
+
+def test_broken_pool_is_shut_down_and_replaced(queue):
+    # Worker mati di tengah job -> BrokenProcessPool
+    broken = queue.submit("mati", "mati", os._exit, 1)
+    old_pool = queue._pool
+    _wait(broken)
+    assert broken.status == JOB_FAILED and "BrokenProcessPool" in broken.error
+    assert queue._pool is None and old_pool._shutdown_thread
+    job = _wait(queue.submit("hidup", "hidup", sorted, [2, 1]))
+    assert job.status == JOB_DONE and job.result == [1, 2]
+    assert queue._pool is not None and queue._pool is not old_pool
+
+
+def test_broken_pool_shutdown_called(queue, monkeypatch):
+    calls = []
+    queue.submit("siap", "siap", sorted, [1])
+    pool = queue._pool
+    real_shutdown = pool.shutdown
+    monkeypatch.setattr(pool, "shutdown", lambda *a, **kw: (calls.append(kw), real_shutdown(*a, **kw)))
+    _wait(queue.submit("mati", "mati", os._exit, 1))
+    assert calls == [{"wait": False, "cancel_futures": True}]
+
+
+def test_zip_job(sample_xlsx):
+    # ZIP semua unit = satu bagian per unit di worker yang kosong, digabung urut unit
+    df = load_sheet(sample_xlsx, SAMPLE_SHEET)
+    queue = ExportQueue(max_workers=2)
+    try:
+        calls = [(export_unit, args) for args in unit_export_args(df, SAMPLE_SHEET, True, EXPORT_FORMATS)]
+        job = _wait(queue.submit_parts("zip", "Rincian.zip", calls, zip_unit_exports, kind="zip", rows=len(df)))
+    finally:
+        queue._pool.shutdown()
+    assert job.status == JOB_DONE, job.error
+    assert job.parts_done == job.parts_total == len(calls) and queue.progress(job) == 1.0
+    data, timings = job.result
+    expected, _ = export_all_units(df, SAMPLE_SHEET, True, EXPORT_FORMATS, max_workers=1)
+    names = zipfile.ZipFile(io.BytesIO(data)).namelist()
+    assert names == zipfile.ZipFile(io.BytesIO(expected)).namelist()
+    assert len(names) == 2 * len(timings) == 2 * df["UNIT"][df["UNIT"].astype(str).str.strip() != ""].nunique()
+    assert job.nbytes >= len(data)
+
+
+def test_parts_run_in_parallel_and_in_order():
+    queue = ExportQueue(max_workers=2, max_pending=1)
+    try:
+        start = time.monotonic()
+        job = queue.submit_parts("p", "p", [(time.sleep, (1,)), (time.sleep, (1,))], lambda results: "ok")
+        later = queue.submit("b", "b", sorted, [2, 1])
+        # Job berikutnya menunggu bagian job pertama, dan hanya dia yang dihitung menunggu
+        assert job.status == JOB_RUNNING and queue.position(later) == 1
+        assert queue.stats()["waiting"] == 1
+        _wait(job)
+        assert job.result == "ok" and time.monotonic() - start < 1.9
+        assert _wait(later).result == [1, 2]
+    finally:
+        queue._pool.shutdown()
+
+
+def test_failed_part_fails_job(queue):
+    job = _wait(queue.submit_parts("p", "p", [(sorted, ([1],)), (int, ("x",)), (sorted, ([2],))], list))
+    assert job.status == JOB_FAILED and "ValueError" in job.error
+    assert queue.stats()["running"] == 0 and queue._busy == 0
+    assert _wait(queue.submit("b", "b", sorted, [2, 1])).result == [1, 2]
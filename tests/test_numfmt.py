@@ -0,0 +1,61 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pok.numfmt import format_numbers, format_ribuan
+
+EDGE_VALUES = [
+    0.0, -0.0, 0.4, -0.4, 0.5, -0.5, 1.5, 2.5, -2.5, 999.5, 1000, -1000, 1005, 1_000_000.5,
+    123_456_789, -987_654_321.49, 2.0 ** 53, 9.99e17, 1e18, -1e18, 1.5e20, 1e300, -1e300,
+    math.nan, math.inf, -math.inf,
+]
+
+
+def _expected(x, truncate, blank_zero):
+    # Format per sel yang digantikan format_ribuan
+    if not math.isfinite(x) or (blank_zero and x == 0):
+        return ""
+    if truncate:
+        return f"{int(x):,}".replace(",", ".")
+    return f"{x:,.0f}".replace(",", ".")
+
+
+def _values():
+    rng = np.random.default_rng(11)
+    random = np.concatenate([
+        rng.normal(0, 1e6, 500),
+        rng.integers(-10**12, 10**12, 500).astype(float),
+        rng.integers(-3, 3, 200) + 0.5,
+    ])
+    # Nilai berulang dan urutan -0.0/0.0 terbalik ikut diuji (format nilai unik)
+    return EDGE_VALUES + list(random) + EDGE_VALUES[::-1]
+
+
+@pytest.mark.parametrize("truncate", [False, True])
+@pytest.mark.parametrize("blank_zero", [True, False])
+def test_matches_fstring(truncate, blank_zero):
+    values = _values()
+    got = list(format_ribuan(values, truncate=truncate, blank_zero=blank_zero))
+    assert got == [_expected(x, truncate, blank_zero) for x in values]
+
+
+@pytest.mark.parametrize("first, second", [(0.0, -0.0), (-0.0, 0.0)])
+def test_signed_zero(first, second):
+    got = format_ribuan([first, second], blank_zero=False)
+    assert list(got) == [f"{first:.0f}", f"{second:.0f}"]
+    assert list(format_ribuan([first, second])) == ["", ""]
+
+
+def test_input_kinds():
+    assert list(format_ribuan([])) == []
+    assert list(format_ribuan(pd.Series([1234, None, 5], dtype="Int64"))) == ["1.234", "", "5"]
+    assert list(format_ribuan(np.array([1e6])[::-1])) == ["1.000.000"]
+
+
+def test_format_numbers_keeps_index():
+    df = pd.DataFrame({"VOL": [1.9, 2.0], "JUMLAH": [1500.5, 0.0], "URAIAN": ["a", "b"]}, index=[7, 3])
+    out = format_numbers(df)
+    assert list(out.columns) == ["VOL", "JUMLAH"] and list(out.index) == [7, 3]
+    assert out.loc[7].tolist() == ["1", "1.500"] and out.loc[3].tolist() == ["2", ""]
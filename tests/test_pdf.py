@@ -0,0 +1,77 @@
+import io
+import re
+
+import pytest
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table
+
+from pok.data import kelas_kode, load_sheet, total_akun
+from pok.pdf import PDF_CELL_STYLES, PdfChunkedTable, _pdf_table_style, generate_pdf
+from pok.pdfpage import PageContent
+
+from conftest import SAMPLE_SHEET
+
+pypdf = pytest.importorskip("pypdf")
+
+
+def _pages(pdf):
+    return [page.extract_text() for page in pypdf.PdfReader(io.BytesIO(pdf)).pages]
+
+
+def _render(flowable):
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=landscape(A4)).build([flowable])
+    return _pages(buffer.getvalue())
+
+
+def _table_rows(n):
+    header = ["KODE", "URAIAN", "JUMLAH"]
+    rows = [[str(521000 + i) if i % 3 else "AA", f"Uraian baris {i} " + "panjang " * (i % 4 * 6), f"{i}.000"]
+            for i in range(n)]
+    kelas = ["six" if i % 3 else "text" for i in range(n)]
+    return header, rows, kelas, [60, 400, 80]
+
+
+@pytest.mark.parametrize("n", [10, 120, 400])
+def test_chunked_table_matches_table_pages(n):
+    header, rows, kelas, widths = _table_rows(n)
+    chunked = _render(PdfChunkedTable(header, rows, kelas, widths, chunk_rows=50))
+    # Pembanding: satu Table utuh dengan Paragraph di setiap sel (cara lama)
+    cells = [[Paragraph(cell, PDF_CELL_STYLES[(cls == "six", ci == 2)]) for ci, cell in enumerate(row)]
+             for row, cls in zip(rows, kelas)]
+    table = Table([header] + cells, colWidths=widths, repeatRows=1)
+    table.setStyle(_pdf_table_style(header, kelas))
+    assert len(chunked) == len(_render(table))
+    # Header di awal tiap halaman, setiap baris tepat sekali dan berurutan
+    assert all(text.startswith("KODE\nURAIAN\nJUMLAH\n") for text in chunked)
+    text = "\n".join(chunked)
+    positions = [text.index(f"Uraian baris {i} ") for i in range(n)]
+    assert positions == sorted(positions)
+    assert all(text.count(f"Uraian baris {i} ") == 1 for i in range(n))
+
+
+def test_generate_pdf_pages_and_cells(sample_xlsx):
+    df = load_sheet(sample_xlsx, SAMPLE_SHEET)
+    pdf = generate_pdf(df, SAMPLE_SHEET, "Semua", total_akun(df), page=PageContent(footer="{page} dari {total}"))
+    pages = _pages(pdf)
+    assert len(pages) > 1
+    for number, page in enumerate(pages, 1):
+        # Judul hanya di halaman pertama; header tabel di setiap halaman
+        assert ("RINCIAN KERTAS KERJA SATKER T.A. 2025" in page) == (number == 1)
+        assert page.count("UNIT\nMAK\nKODE\nURAIAN\n") == 1
+        assert re.search(rf"\b{number} dari\s*{len(pages)}\b", page)
+    text = "\n".join(pages)
+    # Kode akun dan uraiannya tercetak
+    akun = df[kelas_kode(df) == "six"]
+    for kode, uraian in akun[["KODE", "URAIAN"]].head(20).itertuples(index=False):
+        assert str(kode) in text
+        assert str(uraian).split()[0] in text
+
+
+def test_cell_whitespace_collapsed_like_paragraph(edge_xlsx):
+    # Paragraph (cara lama) merapatkan spasi; sel string biasa harus sama
+    df = load_sheet(edge_xlsx, "DIPA 1")
+    df["URAIAN"] = df["URAIAN"].str.replace("Belanja Bahan", "  Belanja \n  Bahan ")
+    text = "\n".join(_pages(generate_pdf(df, "DIPA 1", "FTIK", total_akun(df))))
+    assert "\nFTIK\n" in text and "FTIK \n" not in text
+    assert "\nBelanja Bahan\n" in text
@@ -0,0 +1,41 @@
+import pytest
+from reportlab.lib.pagesizes import A4, landscape
+
+from pok.data import load_sheet, total_akun
+from pok.pdf import generate_pdf
+from pok.pdfpage import PageContent, PageTemplate
+
+from conftest import SAMPLE_SHEET
+
+
+class _RecordingCanvas:
+    # Cukup untuk draw_page: catat teks yang digambar
+    def __init__(self):
+        self.strings = []
+
+    def drawString(self, x, y, text):
+        self.strings.append(text)
+
+    drawCentredString = drawString
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+@pytest.mark.parametrize("header, footer, expected", [
+    ("Dicetak {tanggal}", "{page} / {total}", ["Dicetak {tanggal}", "3 / "]),
+    ("Kurung { tunggal", "Hal {page} dari {total} }", ["Kurung { tunggal", "Hal 3 dari ", " }"]),
+    ("Hal {page} {0}", "{page} {", ["Hal 3 {0}", "3 {"]),
+])
+def test_only_page_tokens_are_replaced(header, footer, expected):
+    template = PageTemplate(landscape(A4), (10, 10, 10, 10), PageContent(header=header, footer=footer))
+    canvas = _RecordingCanvas()
+    template.draw_page(canvas, 3, False, False)
+    assert canvas.strings == expected
+
+
+def test_pdf_with_literal_braces(sample_xlsx):
+    df = load_sheet(sample_xlsx, SAMPLE_SHEET).head(40)
+    pdf = generate_pdf(df, SAMPLE_SHEET, "Semua", total_akun(df),
+                       page=PageContent(header="Dicetak {tanggal} {", footer="{page} dari {total} }"))
+    assert pdf.startswith(b"%PDF")
@@ -0,0 +1,67 @@
+import pytest
+from pandas.testing import assert_frame_equal
+
+from pok.data import kelas_kode, load_sheet
+from pok.rekap import build_rekap_cube, rekap_chunks, rekap_per_unit
+from pok.store import DatasetStore
+
+from conftest import SAMPLE_SHEET
+
+REKAP_COLUMNS = ["UNIT", "Count", "Total_JUMLAH", "Total_JUMLAH_fmt"]
+
+
+@pytest.fixture(scope="module")
+def sample_df(sample_xlsx):
+    return load_sheet(sample_xlsx, SAMPLE_SHEET)
+
+
+@pytest.mark.parametrize("rekap", [
+    rekap_per_unit,
+    lambda df: build_rekap_cube(df).per_unit(),
+    lambda df: rekap_chunks([df]),
+])
+def test_empty_sheet(sample_df, rekap):
+    grp = rekap(sample_df.iloc[:0])
+    assert list(grp.columns) == REKAP_COLUMNS and grp.empty
+
+
+def test_no_chunks():
+    grp = rekap_chunks([])
+    assert list(grp.columns) == REKAP_COLUMNS and grp.empty
+
+
+@pytest.fixture(scope="module", params=["sample", "synthetic", "edge"])
+def any_df(request, sample_df, synthetic_xlsx, edge_xlsx):
+    if request.param == "sample":
+        return sample_df
+    return load_sheet(synthetic_xlsx if request.param == "synthetic" else edge_xlsx, "DIPA 1")
+
+
+def test_cube_per_unit_matches_rekap_per_unit(any_df):
+    assert_frame_equal(build_rekap_cube(any_df).per_unit(), rekap_per_unit(any_df))
+
+
+def test_cached_cube_matches_rekap_per_unit(any_df):
+    # Agregat per UNIT dari DatasetStore (dibangun ulang lalu hit) tetap setara
+    store = DatasetStore(max_bytes=10**8)
+    first = build_rekap_cube(any_df, cache=store).per_unit()
+    again = build_rekap_cube(any_df, cache=store).per_unit()
+    assert store.stats()["hits"] > 0
+    assert_frame_equal(first, rekap_per_unit(any_df))
+    assert_frame_equal(again, rekap_per_unit(any_df))
+
+
+def test_cube_levels_match_groupby(any_df):
+    rows = any_df[kelas_kode(any_df) == "six"]
+    cube = build_rekap_cube(any_df)
+    for unit in cube.values("UNIT"):
+        expected = (rows[rows["UNIT"] == unit].groupby("RO", sort=False)
+                    .agg(Count=("KODE", "count"), Total_JUMLAH=("JUMLAH", "sum")).reset_index())
+        got = cube.level(2, UNIT=unit).drop(columns="UNIT").astype({"RO": str})
+        expected = expected.astype({"RO": str})
+        assert_frame_equal(got.sort_values("RO", ignore_index=True), expected.sort_values("RO", ignore_index=True))
+
+
+def test_rekap_chunks_matches_rekap_per_unit(any_df):
+    chunks = [any_df.iloc[i:i + 500] for i in range(0, len(any_df), 500)]
+    assert_frame_equal(rekap_chunks(chunks), rekap_per_unit(any_df))
@@ -0,0 +1,61 @@
+import random
+
+import numpy as np
+import pytest
+
+from pok.data import load_sheet
+from pok.search import SEARCH_COLS, SearchIndex, tokenize
+
+from conftest import SAMPLE_SHEET
+
+
+def brute_force_search(dataframe, query):
+    """Posisi baris yang untuk setiap token query punya token berawalan token itu (pindai semua baris)."""
+    tokens = tokenize(query)
+    if not tokens:
+        return None
+    values = dataframe[SEARCH_COLS].astype(str).itertuples(index=False, name=None)
+    hits = []
+    for pos, row in enumerate(values):
+        row_tokens = {t for value in row for t in tokenize(value)}
+        if all(any(rt.startswith(t) for rt in row_tokens) for t in tokens):
+            hits.append(pos)
+    return np.array(hits, dtype=np.int64)
+
+
+def _queries(dataframe, n=40, seed=0):
+    rng = random.Random(seed)
+    vocab = sorted({t for col in SEARCH_COLS for value in dataframe[col].astype(str).unique() for t in tokenize(value)})
+    queries = ["honor", "Belanja  BAHAN", "521211", "2132.", "(20 org)", "tidakadaxyz", "a", "0", "FTIK - konsumsi"]
+    for _ in range(n):
+        words = rng.sample(vocab, rng.randint(1, 3))
+        queries.append(" ".join(w[:rng.randint(1, len(w))] if rng.random() < 0.4 else w.upper() for w in words))
+    return queries
+
+
+@pytest.fixture(scope="module", params=["sample", "synthetic"])
+def dataset(request, sample_xlsx, synthetic_xlsx):
+    if request.param == "sample":
+        return load_sheet(sample_xlsx, SAMPLE_SHEET)
+    return load_sheet(synthetic_xlsx, "DIPA 1")
+
+
+def test_search_matches_brute_force(dataset):
+    index = SearchIndex(dataset)
+    for query in _queries(dataset):
+        expected = brute_force_search(dataset, query)
+        np.testing.assert_array_equal(index.search(query), expected, err_msg=query)
+
+
+def test_search_on_filtered_frame(dataset):
+    # Indeks atas frame turunan (mis. satu UNIT): posisi relatif terhadap frame itu
+    part = dataset[dataset["UNIT"] == dataset["UNIT"].iloc[0]]
+    index = SearchIndex(part)
+    for query in _queries(part, n=10, seed=1):
+        np.testing.assert_array_equal(index.search(query), brute_force_search(part, query), err_msg=query)
+
+
+def test_empty_query(dataset):
+    index = SearchIndex(dataset)
+    assert index.search("") is None
+    assert index.search("  - / ") is None
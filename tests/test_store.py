@@ -0,0 +1,101 @@
+import gc
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from pok.store import DatasetStore
+
+
+def _value(nbytes):
+    return np.zeros(nbytes, dtype=np.uint8)
+
+
+def test_lru_evicts_oldest_by_size():
+    store = DatasetStore(max_bytes=300)
+    for key in "abc":
+        store.get_or_build(key, lambda: _value(100))
+    store.get_or_build("a", lambda: pytest.fail("a masih di LRU"))  # a jadi paling baru
+    store.get_or_build("d", lambda: _value(100))
+    # b paling lama dipakai -> keluar; tanpa rujukan lain juga hilang dari weakref
+    gc.collect()
+    assert store.get("b") is None
+    assert all(store.get(key) is not None for key in "acd")
+    stats = store.stats()
+    assert stats["entries"] == 3 and stats["nbytes"] == 300
+    assert stats["hits"] == 1 and stats["misses"] == 4
+
+
+def test_oversized_value_is_kept_alone():
+    store = DatasetStore(max_bytes=100)
+    store.get_or_build("a", lambda: _value(50))
+    big = store.get_or_build("big", lambda: _value(500))
+    assert store.stats()["entries"] == 1 and store.get("big") is big
+
+
+def test_evicted_value_reused_while_referenced():
+    store = DatasetStore(max_bytes=100)
+    held = store.get_or_build("a", lambda: _value(100))
+    store.get_or_build("b", lambda: _value(100))
+    assert store.stats()["entries"] == 1
+    # Masih dirujuk sesi lain: dipakai ulang, tidak dibangun ulang
+    assert store.get_or_build("a", lambda: pytest.fail("a dibangun ulang")) is held
+    del held
+    store.get_or_build("c", lambda: _value(100))
+    gc.collect()
+    assert store.get("a") is None and store.stats()["alive"] == 1
+
+
+def test_same_key_built_once_concurrently():
+    store = DatasetStore(max_bytes=10**6)
+    calls = []
+    barrier = threading.Barrier(8)
+    results = []
+
+    def build():
+        calls.append(threading.get_ident())
+        time.sleep(0.2)
+        return _value(10)
+
+    def session():
+        barrier.wait()
+        results.append(store.get_or_build("k", build))
+
+    threads = [threading.Thread(target=session) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+    assert store.stats()["misses"] == 1 and store.stats()["hits"] == 7
+
+
+def test_different_keys_built_in_parallel():
+    store = DatasetStore(max_bytes=10**6)
+
+    def build():
+        time.sleep(0.3)
+        return _value(10)
+
+    threads = [threading.Thread(target=store.get_or_build, args=(key, build)) for key in range(4)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert time.perf_counter() - start < 1.0
+    assert store.stats()["entries"] == 4
+
+
+def test_failed_build_can_be_retried():
+    store = DatasetStore(max_bytes=10**6)
+
+    def fail():
+        raise ValueError("rusak")
+
+    with pytest.raises(ValueError):
+        store.get_or_build("k", fail)
+    assert store.get("k") is None and not store._building
+    assert store.get_or_build("k", lambda: _value(1)) is store.get("k")
@@ -0,0 +1,89 @@
+import io
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from pok.data import clean_sheet, iter_sheet_chunks, load_sheet, read_sheet, sheet_names
+from pok.xlsx import XlsxReader
+
+from conftest import SAMPLE_SHEET
+
+
+def _read_excel_pipeline(source, sheet, header=0):
+    # Jalur lama dashboard: pd.read_excel(dtype=str) lalu clean_sheet
+    return clean_sheet(pd.read_excel(io.BytesIO(source), sheet_name=sheet, dtype=str, header=header))
+
+
+def _openpyxl_rows(source, sheet):
+    # Nilai sel openpyxl (data_only) tanpa sel kosong di ujung baris; baris
+    # yang hanya berisi string kosong = baris kosong (seperti pd.read_excel)
+    wb = openpyxl.load_workbook(io.BytesIO(source), read_only=True, data_only=True)
+    rows = []
+    for row in wb[sheet].iter_rows(values_only=True):
+        row = list(row)
+        while row and row[-1] in (None, ""):
+            row.pop()
+        rows.append(tuple(row))
+    wb.close()
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+def _reader_rows(source, sheet):
+    with XlsxReader(io.BytesIO(source)) as reader:
+        return [row if any(v is not None for v in row) else () for row in reader.iter_rows(sheet)]
+
+
+@pytest.mark.filterwarnings("ignore:Workbook contains no default style")
+@pytest.mark.parametrize("workbook, sheet, header", [
+    ("sample_xlsx", SAMPLE_SHEET, 0),
+    ("synthetic_xlsx", "DIPA 1", 0),
+    ("synthetic_xlsx", "DIPA 2", 0),
+    ("edge_xlsx", "DIPA 1", 1),
+])
+def test_load_sheet_matches_read_excel(request, workbook, sheet, header):
+    source = request.getfixturevalue(workbook)
+    pd.testing.assert_frame_equal(load_sheet(source, sheet), _read_excel_pipeline(source, sheet, header))
+
+
+@pytest.mark.filterwarnings("ignore:Workbook contains no default style")
+@pytest.mark.parametrize("workbook, sheet", [
+    ("sample_xlsx", SAMPLE_SHEET),
+    ("synthetic_xlsx", "DIPA 2"),
+    ("edge_xlsx", "DIPA 1"),
+])
+def test_reader_values_match_openpyxl(request, workbook, sheet):
+    source = request.getfixturevalue(workbook)
+    assert _reader_rows(source, sheet) == _openpyxl_rows(source, sheet)
+
+
+def test_edge_values(edge_xlsx):
+    df = read_sheet(edge_xlsx, "DIPA 1")
+    assert len(df) == 9
+    # Inline string dengan beberapa run, hasil formula (t="str")
+    assert df.loc[2, "URAIAN"] == "Snack Panitia (20 org)"
+    assert df.loc[6, "URAIAN"] == "Hasil formula"
+    # Formula tanpa hasil tersimpan dan sel error -> kosong/NaN
+    assert pd.isna(df.loc[1, "JUMLAH"]) and df.loc[6, "SAT"] == ""
+    # Teks berbunyi kode error tetap teks; string NA -> kosong
+    assert df.loc[7, "URAIAN"] == "#DIV/0!"
+    assert df.loc[2, "SD"] == "" and df.loc[6, "KODE"] == ""
+    # Tanggal dan boolean seperti str() nilai openpyxl; baris kosong di tengah tetap ada
+    assert df.loc[2, "RO"] == "2025-01-01 00:00:00" and df.loc[6, "RO"] == "True"
+    assert (df.loc[3:5, "URAIAN"] == "").all()
+
+
+def test_chunks_concatenate_to_whole_sheet(synthetic_xlsx):
+    chunks = list(iter_sheet_chunks(synthetic_xlsx, "DIPA 1", chunk_rows=400))
+    assert [len(c) for c in chunks] == [400, 400, 400, 300]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), read_sheet(synthetic_xlsx, "DIPA 1"))
+
+
+def test_sheet_names(sample_xlsx, synthetic_xlsx, edge_xlsx):
+    assert sheet_names(sample_xlsx) == [SAMPLE_SHEET]
+    assert sheet_names(synthetic_xlsx) == ["DIPA 1", "DIPA 2"]
+    assert sheet_names(edge_xlsx) == ["DIPA 1"]
+    with pytest.raises(ValueError):
+        read_sheet(edge_xlsx, "DIPA 9")